@@ -0,0 +1,159 @@
+"""Initial schema
+
+Matches the tables that ``Base.metadata.create_all`` produced before
+migrations were introduced. Databases created that way should be stamped
+with ``alembic stamp 0001`` once and then upgraded normally.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "admins",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_admins_id", "admins", ["id"])
+    op.create_index("ix_admins_username", "admins", ["username"], unique=True)
+    op.create_index("ix_admins_email", "admins", ["email"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+    op.create_index("ix_categories_name", "categories", ["name"], unique=True)
+
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("image_url", sa.String(500)),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+
+    op.create_table(
+        "sub_products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("sku", sa.String(100)),
+        sa.Column("brand", sa.String(100)),
+        sa.Column("model", sa.String(100)),
+        sa.Column("specifications", sa.Text()),
+        sa.Column("features", sa.Text()),
+        sa.Column("images", sa.Text()),
+        sa.Column("price_range", sa.String(100)),
+        sa.Column("currency", sa.String(10)),
+        sa.Column("availability_status", sa.String(50)),
+        sa.Column("warranty_info", sa.Text()),
+        sa.Column("support_info", sa.Text()),
+        sa.Column("documentation_url", sa.String(500)),
+        sa.Column("datasheet_url", sa.String(500)),
+        sa.Column("tags", sa.Text()),
+        sa.Column("meta_title", sa.String(200)),
+        sa.Column("meta_description", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("is_featured", sa.Boolean()),
+        sa.Column("sort_order", sa.Integer()),
+        *_timestamps(),
+    )
+    op.create_index("ix_sub_products_id", "sub_products", ["id"])
+    op.create_index("ix_sub_products_sku", "sub_products", ["sku"], unique=True)
+
+    op.create_table(
+        "services",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("features", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_services_id", "services", ["id"])
+
+    op.create_table(
+        "solutions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("features", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_solutions_id", "solutions", ["id"])
+
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("logo_url", sa.String(500)),
+        sa.Column("description", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_customers_id", "customers", ["id"])
+
+    op.create_table(
+        "company_info",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_name", sa.String(200), nullable=False),
+        sa.Column("address", sa.Text()),
+        sa.Column("phone", sa.String(50)),
+        sa.Column("email", sa.String(100)),
+        sa.Column("website", sa.String(200)),
+        sa.Column("mission", sa.Text()),
+        sa.Column("vision", sa.Text()),
+        sa.Column("about_us", sa.Text()),
+        sa.Column("founded_year", sa.Integer()),
+        sa.Column("total_clients", sa.Integer()),
+        sa.Column("total_brands", sa.Integer()),
+        sa.Column("service_days_per_year", sa.Integer()),
+        *_timestamps(),
+    )
+    op.create_index("ix_company_info_id", "company_info", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("company_info")
+    op.drop_table("customers")
+    op.drop_table("solutions")
+    op.drop_table("services")
+    op.drop_table("sub_products")
+    op.drop_table("products")
+    op.drop_table("categories")
+    op.drop_table("admins")
@@ -0,0 +1,31 @@
+"""Index is_active for the public listings
+
+The public list endpoints filter on ``is_active`` and page in ``id``
+order, so a composite ``(is_active, id)`` index serves both the filter and
+the ORDER BY without a sort step.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TABLES = ["categories", "products", "sub_products", "services", "solutions", "customers"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.create_index(f"ix_{table}_active_id", table, ["is_active", "id"])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_active_id", table_name=table)
@@ -0,0 +1,75 @@
+"""Full-text search vector for sub products
+
+Adds ``sub_products.search_vector`` (tsvector on PostgreSQL), the trigger
+that keeps it in sync with name/brand/model/tags, a GIN index over it, and
+backfills existing rows in batches. On SQLite only the placeholder column
+is added; search there uses the in-process fallback.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION sub_products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.brand, '') || ' ' || coalesce(NEW.model, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.tags, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER sub_products_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, brand, model, tags ON sub_products
+FOR EACH ROW EXECUTE PROCEDURE sub_products_search_vector_update()
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sub_products",
+        sa.Column("search_vector", TSVECTOR().with_variant(sa.Text(), "sqlite")),
+    )
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(SEARCH_VECTOR_TRIGGER)
+
+    # Touching the indexed columns fires the trigger for each existing row
+    max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM sub_products")).scalar()
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            sa.text("UPDATE sub_products SET name = name WHERE id > :start AND id <= :end"),
+            {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+        )
+
+    op.create_index(
+        "ix_sub_products_search_vector", "sub_products", ["search_vector"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_sub_products_search_vector")
+        op.execute("DROP TRIGGER IF EXISTS sub_products_search_vector_trigger ON sub_products")
+        op.execute("DROP FUNCTION IF EXISTS sub_products_search_vector_update()")
+    op.drop_column("sub_products", "search_vector")
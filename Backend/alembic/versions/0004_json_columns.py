@@ -0,0 +1,148 @@
+"""Native JSON columns for specifications, features, images and tags
+
+Converts the JSON-encoded ``Text`` columns of sub_products (specifications,
+features, images, tags), services (features) and solutions (features) to
+JSONB on PostgreSQL and JSON on SQLite. Each column is copied into a new
+JSON column in id batches, then swapped in. Empty text and JSON ``null``
+become NULL. Values that are not valid JSON are kept: free text (or a bare
+JSON string, number or boolean) in an array column becomes a list split on
+commas and newlines, in ``specifications`` it is stored as
+``{"details": text}``.
+
+On PostgreSQL the search trigger is rebuilt to read ``tags::text`` and tags
+gets a GIN (jsonb_path_ops) index for ``tags @> '["tag"]'`` containment.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 2000
+
+JSON_TYPE = sa.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+# table -> {column: "object" | "array"}
+COLUMNS = {
+    "sub_products": {"specifications": "object", "features": "array", "images": "array", "tags": "array"},
+    "services": {"features": "array"},
+    "solutions": {"features": "array"},
+}
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION sub_products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.brand, '') || ' ' || coalesce(NEW.model, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.{tags}, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER sub_products_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, brand, model, tags ON sub_products
+FOR EACH ROW EXECUTE PROCEDURE sub_products_search_vector_update()
+"""
+
+
+def _parse(raw, kind):
+    """New JSON value for the text ``raw``; None for empty text and JSON ``null``"""
+    if raw is None or not raw.strip():
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    if value is None:
+        return None
+    if not isinstance(value, (dict, list, str)):
+        # A bare number or boolean is free text that happens to parse as JSON
+        value = raw.strip()
+    if kind == "object":
+        return value if isinstance(value, dict) else {"details": value if isinstance(value, str) else raw}
+    if isinstance(value, list):
+        return [item if isinstance(item, str) else json.dumps(item) for item in value if item is not None]
+    if isinstance(value, str):
+        return [part.strip() for part in re.split(r"[,\n]", value) if part.strip()]
+    return [raw.strip()]
+
+
+def _dump(value, kind):
+    return None if value is None else json.dumps(value)
+
+
+def _swap_columns(table, columns, new_type, old_type, convert):
+    """Copy each column into a ``<column>_new`` of ``new_type`` in id batches, then swap"""
+    bind = op.get_bind()
+    for column in columns:
+        op.add_column(table, sa.Column(f"{column}_new", new_type))
+
+    source = sa.table(table, sa.column("id", sa.Integer), *(sa.column(column, old_type) for column in columns))
+    target = sa.table(table, sa.column("id", sa.Integer), *(sa.column(f"{column}_new", new_type) for column in columns))
+    update = target.update().where(target.c.id == sa.bindparam("row_id")).values(
+        {f"{column}_new": sa.bindparam(f"{column}_value") for column in columns}
+    )
+
+    max_id = bind.execute(sa.text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar()
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        rows = bind.execute(
+            sa.select(source).where(source.c.id > start, source.c.id <= start + BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        params = [
+            dict(row_id=row.id, **{
+                f"{column}_value": convert(getattr(row, column), kind) for column, kind in columns.items()
+            })
+            for row in rows
+        ]
+        if params:
+            bind.execute(update, params)
+
+    with op.batch_alter_table(table) as batch_op:
+        for column in columns:
+            batch_op.drop_column(column)
+            batch_op.alter_column(f"{column}_new", new_column_name=column)
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    if is_postgresql:
+        # The trigger depends on the tags column being replaced
+        op.execute("DROP TRIGGER IF EXISTS sub_products_search_vector_trigger ON sub_products")
+
+    for table, columns in COLUMNS.items():
+        _swap_columns(table, columns, JSON_TYPE, sa.Text(), _parse)
+
+    if is_postgresql:
+        op.execute(SEARCH_VECTOR_FUNCTION.format(tags="tags::text"))
+        op.execute(SEARCH_VECTOR_TRIGGER)
+        op.execute("CREATE INDEX ix_sub_products_tags ON sub_products USING gin (tags jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    if is_postgresql:
+        op.execute("DROP INDEX IF EXISTS ix_sub_products_tags")
+        op.execute("DROP TRIGGER IF EXISTS sub_products_search_vector_trigger ON sub_products")
+
+    for table, columns in COLUMNS.items():
+        _swap_columns(table, columns, sa.Text(), JSON_TYPE, _dump)
+
+    if is_postgresql:
+        op.execute(SEARCH_VECTOR_FUNCTION.format(tags="tags"))
+        op.execute(SEARCH_VECTOR_TRIGGER)
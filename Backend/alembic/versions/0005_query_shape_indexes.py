@@ -0,0 +1,47 @@
+"""Composite and partial indexes for the sub product and foreign key lookups
+
+* ``(is_active, sort_order, id)`` serves the public sub product listing,
+  which filters on is_active and pages in (sort_order, id) order.
+* ``(product_id, is_active, sort_order, name)`` serves
+  ``get_sub_products_by_product`` without a sort and doubles as the index
+  for the ``sub_products.product_id`` foreign key.
+* A partial ``(sort_order, name)`` index over featured, active rows serves
+  ``get_featured_sub_products``.
+* ``products.category_id`` and ``services.category_id`` get plain indexes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sub_products_active_order", "sub_products", ["is_active", "sort_order", "id"])
+    op.create_index(
+        "ix_sub_products_product_active_order", "sub_products", ["product_id", "is_active", "sort_order", "name"]
+    )
+    op.create_index(
+        "ix_sub_products_featured", "sub_products", ["sort_order", "name"],
+        postgresql_where=sa.text("is_featured AND is_active"),
+        sqlite_where=sa.text("is_featured = 1 AND is_active = 1"),
+    )
+    op.create_index("ix_products_category_id", "products", ["category_id"])
+    op.create_index("ix_services_category_id", "services", ["category_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_services_category_id", table_name="services")
+    op.drop_index("ix_products_category_id", table_name="products")
+    op.drop_index("ix_sub_products_featured", table_name="sub_products")
+    op.drop_index("ix_sub_products_product_active_order", table_name="sub_products")
+    op.drop_index("ix_sub_products_active_order", table_name="sub_products")
@@ -0,0 +1,157 @@
+"""Numeric price bounds for sub products
+
+Adds ``price_min`` and ``price_max`` (NUMERIC(12, 2)) to sub_products and
+fills them in id batches by parsing the free-text ``price_range``. A number
+only counts next to a currency marker ("$1,000 - $2,000", "৳1,00,000",
+"from $500") or in an explicit range; ambiguous text, and amounts too large
+for the columns, keep NULL bounds. From here on the API derives both
+columns from price_range on every write (``app.pricing``); the parser is
+copied below as it stood at this revision, so the backfill replays the
+same way whatever happens to the application code later.
+
+* ``(is_active, price_min, id)`` serves ``min_price`` and ``sort=price``
+  on the public sub product listing.
+* ``(is_active, price_max)`` serves ``max_price``.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 2000
+
+CURRENCY = r"(?:[$৳€£₹]|(?<![A-Za-z])(?:usd|bdt|tk|taka|eur|gbp|inr|rs)(?![A-Za-z])\.?)"
+CURRENCY_BEFORE = re.compile(CURRENCY + r"\s*$", re.IGNORECASE)
+CURRENCY_AFTER = re.compile(r"^\s*" + CURRENCY, re.IGNORECASE)
+CURRENCY_ANYWHERE = re.compile(CURRENCY, re.IGNORECASE)
+
+# 1,000,000 | 1,00,000 (lakh grouping) | 1 000 000 | 1000, with decimals
+# and an optional k/m multiplier glued to it
+AMOUNT = re.compile(
+    r"(?<![\d.,])"
+    r"(?P<number>(?:\d{1,3}(?:,\d{3})+(?!\d)|\d{1,3}(?:,\d{2})+,\d{3}(?!\d)|\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?!\d)|\d+)"
+    r"(?:\.\d+)?)"
+    r"(?P<suffix>[km](?![a-z]))?",
+    re.IGNORECASE,
+)
+MULTIPLIERS = {"k": 1000, "m": 1000000}
+RANGE_SEPARATOR = re.compile(r"^\s*(?:-|–|—|to)\s*$", re.IGNORECASE)
+OPEN_UPPER_PREFIXES = ("from", "starting", "over", "above", "min")
+OPEN_LOWER_PREFIXES = ("up to", "under", "below", "less than", "max")
+# price_min/price_max are NUMERIC(12, 2)
+MAX_AMOUNT = 10 ** 10
+
+
+class _Amount(NamedTuple):
+    value: float
+    start: int
+    end: int
+    marked: bool
+
+
+def _amounts(text: str) -> List[_Amount]:
+    amounts = []
+    for match in AMOUNT.finditer(text):
+        before, after = text[:match.start()], text[match.end():]
+        if before[-1:].isalpha() and not CURRENCY_BEFORE.search(before):
+            continue  # part of a model code such as "X200"
+        if after.lstrip().startswith("%"):
+            continue
+        number = re.sub(r"[, \u00a0\u202f]", "", match.group("number"))
+        suffix = (match.group("suffix") or "").lower()
+        value = round(float(number) * MULTIPLIERS.get(suffix, 1), 2)
+        marked = bool(CURRENCY_BEFORE.search(before) or CURRENCY_AFTER.match(after))
+        amounts.append(_Amount(value, match.start(), match.end(), marked))
+    return amounts
+
+
+def _parse_price_range(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    low, high = _parse_amounts(text)
+    if any(value is not None and value >= MAX_AMOUNT for value in (low, high)):
+        return None, None
+    return low, high
+
+
+def _parse_amounts(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    if not text:
+        return None, None
+    amounts = _amounts(text)
+    ranges = [
+        (first, second) for first, second in zip(amounts, amounts[1:])
+        if RANGE_SEPARATOR.match(CURRENCY_ANYWHERE.sub("", text[first.end:second.start]))
+    ]
+    marked = [amount for amount in amounts if amount.marked]
+
+    if len(ranges) == 1:
+        first, second = ranges[0]
+        if all(amount in (first, second) for amount in marked):
+            return min(first.value, second.value), max(first.value, second.value)
+        return None, None
+    if ranges or len({amount.value for amount in marked}) != 1:
+        return None, None
+
+    amount = marked[0]
+    phrase = text.strip().lower()
+    if text[amount.end:].startswith("+") or phrase.endswith("+") or phrase.startswith(OPEN_UPPER_PREFIXES):
+        return amount.value, None
+    if phrase.startswith(OPEN_LOWER_PREFIXES):
+        return None, amount.value
+    return amount.value, amount.value
+
+
+def upgrade() -> None:
+    op.add_column("sub_products", sa.Column("price_min", sa.Numeric(12, 2)))
+    op.add_column("sub_products", sa.Column("price_max", sa.Numeric(12, 2)))
+
+    bind = op.get_bind()
+    sub_products = sa.table(
+        "sub_products",
+        sa.column("id", sa.Integer),
+        sa.column("price_range", sa.String),
+        sa.column("price_min", sa.Numeric(12, 2, asdecimal=False)),
+        sa.column("price_max", sa.Numeric(12, 2, asdecimal=False)),
+    )
+    update = sub_products.update().where(sub_products.c.id == sa.bindparam("row_id")).values(
+        price_min=sa.bindparam("min_value"), price_max=sa.bindparam("max_value")
+    )
+
+    max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM sub_products")).scalar()
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        rows = bind.execute(
+            sa.select(sub_products.c.id, sub_products.c.price_range).where(
+                sub_products.c.id > start,
+                sub_products.c.id <= start + BACKFILL_BATCH_SIZE,
+                sub_products.c.price_range.isnot(None),
+            )
+        ).fetchall()
+        params = []
+        for row in rows:
+            low, high = _parse_price_range(row.price_range)
+            if low is not None or high is not None:
+                params.append({"row_id": row.id, "min_value": low, "max_value": high})
+        if params:
+            bind.execute(update, params)
+
+    op.create_index("ix_sub_products_active_price", "sub_products", ["is_active", "price_min", "id"])
+    op.create_index("ix_sub_products_active_price_max", "sub_products", ["is_active", "price_max"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sub_products_active_price_max", table_name="sub_products")
+    op.drop_index("ix_sub_products_active_price", table_name="sub_products")
+    with op.batch_alter_table("sub_products") as batch_op:
+        batch_op.drop_column("price_max")
+        batch_op.drop_column("price_min")
@@ -0,0 +1,38 @@
+"""Indexes for the sub product facet filters and counts
+
+* ``(is_active, brand, sort_order, id)`` and
+  ``(is_active, availability_status, sort_order, id)`` serve ``brand=`` and
+  ``availability_status=`` on the public listing without a sort, and let
+  the facet counts group those columns straight from the index.
+* ``(is_active, currency)`` and ``(is_active, is_featured)`` do the same
+  for the currency and featured facet counts.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sub_products_active_brand", "sub_products", ["is_active", "brand", "sort_order", "id"])
+    op.create_index(
+        "ix_sub_products_active_availability", "sub_products", ["is_active", "availability_status", "sort_order", "id"]
+    )
+    op.create_index("ix_sub_products_active_currency", "sub_products", ["is_active", "currency"])
+    op.create_index("ix_sub_products_active_featured", "sub_products", ["is_active", "is_featured"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sub_products_active_featured", table_name="sub_products")
+    op.drop_index("ix_sub_products_active_currency", table_name="sub_products")
+    op.drop_index("ix_sub_products_active_availability", table_name="sub_products")
+    op.drop_index("ix_sub_products_active_brand", table_name="sub_products")
@@ -0,0 +1,32 @@
+"""Make sub_products.sort_order NOT NULL
+
+``(sort_order, id)`` is the keyset order of the public sub product listing.
+A NULL sort_order made the row's cursor unusable and the row-value seek
+skipped every NULL row, so existing NULLs become 0 (the column default)
+and the column is made NOT NULL.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE sub_products SET sort_order = 0 WHERE sort_order IS NULL")
+    with op.batch_alter_table("sub_products") as batch_op:
+        batch_op.alter_column("sort_order", existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sub_products") as batch_op:
+        batch_op.alter_column("sort_order", existing_type=sa.Integer(), nullable=True)
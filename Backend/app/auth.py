@@ -1,24 +1,91 @@
+import asyncio
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.cache import TTLCache, catalog_cache, shared_across_workers
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, run_db
 from app import models, schemas
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
+# passlib and jose (with its RSA/ECDSA backends) are imported on first use:
+# most requests never touch them, and a cold start should not pay for them
+@functools.lru_cache(maxsize=None)
+def password_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+
+@functools.lru_cache(maxsize=None)
+def jwt_module():
+    from jose import jwt
+    return jwt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password checks are already queued"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited thread pool.
+
+    Keeping bcrypt off the shared anyio threadpool means a burst of logins
+    cannot starve catalog requests, and capping the pending work sheds load
+    instead of building an unbounded backlog.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        # Only touched from the event loop thread, so no lock is needed
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_queue)
+
+# Verified tokens -> (exp, username, generation, admin snapshot). A write to an
+# admin bumps its generation, so cached entries for it stop matching at once.
+# The generations live in the catalog cache backend: with a shared one (disk,
+# redis) a write in one worker reaches every worker. A memory backend only
+# reaches the worker that made the write, so the cache is then limited to
+# single-worker deployments.
+admin_auth_cache = TTLCache(
+    max_entries=settings.admin_auth_cache_max_entries,
+    ttl=settings.admin_auth_cache_ttl_seconds,
+)
+admin_auth_cache_enabled = settings.admin_auth_cache_enabled and shared_across_workers(catalog_cache.backend)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -28,23 +95,47 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt_module().encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
-def verify_token(token: str, credentials_exception):
+def decode_token(token: str, credentials_exception) -> dict:
+    from jose import JWTError
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(username=username)
+        payload = jwt_module().decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         raise credentials_exception
-    return token_data
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
 
 
-def get_current_admin(
+def verify_token(token: str, credentials_exception):
+    payload = decode_token(token, credentials_exception)
+    return schemas.TokenData(username=payload.get("sub"))
+
+
+def _admin_entity(username: str) -> str:
+    return f"admin:{username}"
+
+
+async def _admin_generation(username: str) -> Optional[int]:
+    # A shared backend is a socket or SQLite round trip: keep it off the event loop
+    if catalog_cache.backend.shared:
+        return await run_in_threadpool(catalog_cache.generation, _admin_entity(username))
+    return catalog_cache.generation(_admin_entity(username))
+
+
+def invalidate_admin(username: str) -> None:
+    """Drop cached authentications for ``username`` after it was changed"""
+    catalog_cache.invalidate(_admin_entity(username))
+
+
+def get_admin_by_username(db: Session, username: str):
+    return db.query(models.Admin).filter(models.Admin.username == username).first()
+
+
+async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -54,17 +145,47 @@ def get_current_admin(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = verify_token(credentials.credentials, credentials_exception)
-    admin = db.query(models.Admin).filter(models.Admin.username == token_data.username).first()
-    if admin is None:
+    token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()
+    if admin_auth_cache_enabled:
+        cached = admin_auth_cache.get(cache_key)
+        if cached is not None:
+            expires_at, username, generation, admin = cached
+            if expires_at > time.time() and generation == await _admin_generation(username):
+                return admin
+            admin_auth_cache.pop(cache_key)
+
+    payload = decode_token(token, credentials_exception)
+    username = payload["sub"]
+    # Read before the admin row, so a write landing in between is never cached as current
+    generation = await _admin_generation(username) if admin_auth_cache_enabled else None
+    db_admin = await run_db(db, get_admin_by_username, username)
+    if db_admin is None or not db_admin.is_active:
         raise credentials_exception
+
+    admin = schemas.Admin.from_orm(db_admin)
+    if generation is not None:
+        admin_auth_cache.set(cache_key, (payload.get("exp", 0), username, generation, admin))
     return admin
 
 
-def authenticate_admin(db: Session, username: str, password: str):
-    admin = db.query(models.Admin).filter(models.Admin.username == username).first()
+def _store_password_hash(db: Session, admin_id: int, hashed_password: str):
+    db.query(models.Admin).filter(models.Admin.id == admin_id).update(
+        {models.Admin.hashed_password: hashed_password}, synchronize_session=False
+    )
+    db.commit()
+
+
+async def authenticate_admin(db: Session, username: str, password: str):
+    admin = await run_db(db, get_admin_by_username, username)
     if not admin:
         return False
-    if not verify_password(password, admin.hashed_password):
+    verified, new_hash = await password_hasher.run(
+        password_context().verify_and_update, password, admin.hashed_password
+    )
+    if not verified:
         return False
+    if new_hash:
+        # Hash was made with an outdated scheme or cost: upgrade it transparently
+        await run_db(db, _store_password_hash, admin.id, new_hash)
     return admin
\ No newline at end of file
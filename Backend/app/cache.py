@@ -0,0 +1,411 @@
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger("app.cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+        }
+
+
+class CacheBackendError(Exception):
+    """The shared cache store could not be reached or answered garbage"""
+
+
+def _unpickle(data: bytes) -> Any:
+    try:
+        return pickle.loads(data)
+    except Exception as exc:
+        raise CacheBackendError(f"unreadable entry: {exc}")
+
+
+class MemoryBackend:
+    """Generations kept in this process; entries live only in the local LRU"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generations(self, entities: Tuple[str, ...]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(entity, 0) for entity in entities)
+
+    def bump(self, entities: Tuple[str, ...]) -> None:
+        with self._lock:
+            for entity in entities:
+                self._generations[entity] = self._generations.get(entity, 0) + 1
+
+    def get(self, key: str) -> Any:
+        return _MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+class DiskBackend:
+    """Entries and generations in a SQLite file shared by the workers of one host
+
+    Values are pickled; the file survives restarts. Expired rows are pruned,
+    and the oldest ones beyond ``max_entries`` dropped, every
+    ``PRUNE_INTERVAL`` writes.
+    """
+
+    name = "disk"
+    shared = True
+    PRUNE_INTERVAL = 64
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS catalog_entries "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS catalog_generations "
+                "(entity TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def generations(self, entities: Tuple[str, ...]) -> Tuple[int, ...]:
+        try:
+            rows = dict(self._connection().execute(
+                f"SELECT entity, generation FROM catalog_generations WHERE entity IN ({','.join('?' * len(entities))})",
+                entities,
+            ).fetchall())
+        except sqlite3.Error as exc:
+            raise CacheBackendError(exc)
+        return tuple(rows.get(entity, 0) for entity in entities)
+
+    def bump(self, entities: Tuple[str, ...]) -> None:
+        try:
+            with self._connection() as connection:
+                connection.executemany(
+                    "INSERT INTO catalog_generations (entity, generation) VALUES (?, 1) "
+                    "ON CONFLICT (entity) DO UPDATE SET generation = generation + 1",
+                    [(entity,) for entity in entities],
+                )
+        except sqlite3.Error as exc:
+            raise CacheBackendError(exc)
+
+    def get(self, key: str) -> Any:
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM catalog_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as exc:
+            raise CacheBackendError(exc)
+        return _MISSING if row is None else _unpickle(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO catalog_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + self.ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                with connection:
+                    connection.execute("DELETE FROM catalog_entries WHERE expires_at <= ?", (time.time(),))
+                    connection.execute(
+                        "DELETE FROM catalog_entries WHERE key IN ("
+                        "SELECT key FROM catalog_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+        except sqlite3.Error as exc:
+            raise CacheBackendError(exc)
+
+
+class RedisBackend:
+    """Entries and generations in Redis, shared by every worker on every host
+
+    Generations are ``INCR`` counters that never expire; entries are pickled
+    under ``SET ... PX ttl`` and otherwise left to Redis' eviction policy.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str, ttl: float, prefix: str, timeout: float = 1.0):
+        from app.resp import RedisClient
+
+        self.client = RedisClient(url, timeout=timeout)
+        self.ttl_ms = int(ttl * 1000)
+        self.prefix = prefix
+
+    def _call(self, commands):
+        from app.resp import RespError
+
+        try:
+            return self.client.pipeline(commands)
+        except (OSError, RespError) as exc:
+            raise CacheBackendError(exc)
+
+    def generations(self, entities: Tuple[str, ...]) -> Tuple[int, ...]:
+        values, = self._call([("MGET", *(f"{self.prefix}generation:{entity}" for entity in entities))])
+        return tuple(int(value) if value is not None else 0 for value in values)
+
+    def bump(self, entities: Tuple[str, ...]) -> None:
+        self._call([("INCR", f"{self.prefix}generation:{entity}") for entity in entities])
+
+    def get(self, key: str) -> Any:
+        value, = self._call([("GET", f"{self.prefix}entry:{key}")])
+        return _MISSING if value is None else _unpickle(value)
+
+    def set(self, key: str, value: Any) -> None:
+        self._call([(
+            "SET", f"{self.prefix}entry:{key}", pickle.dumps(value, pickle.HIGHEST_PROTOCOL), "PX", self.ttl_ms
+        )])
+
+
+def schema_fingerprint() -> str:
+    """Short hash of the response schemas' fields
+
+    Part of every shared entry key, so a release that changes a schema never
+    unpickles entries written by the previous one.
+    """
+    from pydantic import BaseModel
+    from app import schemas
+
+    fields = sorted(
+        (name, tuple(model.__fields__)) for name, model in vars(schemas).items()
+        if isinstance(model, type) and issubclass(model, BaseModel)
+    )
+    return hashlib.sha1(repr(fields).encode()).hexdigest()[:12]
+
+
+class CatalogCache:
+    """Versioned read-through cache for the public catalog queries.
+
+    Every entry is stored under the current generation of each entity it was
+    built from. Writes bump the generation of the entity they touched, which
+    makes all entries derived from it unreachable at once; the LRU and TTL
+    then reclaim the stale entries. Generations are read before loading, so
+    a load racing with a write can never be stored as fresh.
+
+    The generations live in the backend. With a shared one (disk, redis)
+    every worker reads the same counters, so a write in one worker
+    invalidates the others too, and entries one worker built are served by
+    the rest. A local LRU still sits in front of the shared entries, so a
+    hit costs one generations lookup and no unpickling. If the backend is
+    unreachable, requests load straight from the database.
+    """
+
+    # Generation bumped by clear(), part of every key
+    EPOCH = "*"
+
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True, backend=None):
+        self.enabled = enabled
+        self.backend = backend or MemoryBackend()
+        self._entries = TTLCache(max_entries, ttl)
+        self._entities = set()
+        self._namespace = schema_fingerprint() if self.backend.shared else ""
+        self.shared_hits = 0
+        self.errors = 0
+
+    def _backend_error(self, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning("%s catalog cache unavailable: %s", self.backend.name, exc)
+
+    def get_or_load(self, entities: Iterable[str], key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+        entities = (self.EPOCH, *entities)
+        self._entities.update(entities)
+        try:
+            generations = self.backend.generations(entities)
+        except CacheBackendError as exc:
+            self._backend_error(exc)
+            return loader()
+        versioned_key = key, generations
+        value = self._entries.get(versioned_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        shared_key = None
+        if self.backend.shared:
+            shared_key = hashlib.sha1(f"{self._namespace}{versioned_key!r}".encode()).hexdigest()
+            try:
+                value = self.backend.get(shared_key)
+            except CacheBackendError as exc:
+                self._backend_error(exc)
+        if value is _MISSING:
+            value = loader()
+            if shared_key is not None:
+                try:
+                    self.backend.set(shared_key, value)
+                except CacheBackendError as exc:
+                    self._backend_error(exc)
+        else:
+            self.shared_hits += 1
+        self._entries.set(versioned_key, value)
+        return value
+
+    def generation(self, entity: str) -> Optional[int]:
+        """Current generation of ``entity`` in the backend, None while it is unreachable"""
+        try:
+            return self.backend.generations((entity,))[0]
+        except CacheBackendError as exc:
+            self._backend_error(exc)
+            return None
+
+    def versions(self, entities: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """Generations of ``entities`` (after the epoch), None while the backend is unreachable"""
+        try:
+            return self.backend.generations((self.EPOCH, *entities))
+        except CacheBackendError as exc:
+            self._backend_error(exc)
+            return None
+
+    def invalidate(self, *entities: str) -> None:
+        try:
+            self.backend.bump(entities)
+        except CacheBackendError as exc:
+            # Other workers keep serving these entities until the TTL
+            self._backend_error(exc)
+            logger.error("could not invalidate %s in the shared catalog cache", ", ".join(entities))
+
+    def clear(self) -> None:
+        """Drop every entry, in all workers when the backend is shared"""
+        self.invalidate(self.EPOCH)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        # Local misses answered by the shared backend count as hits
+        stats["hits"] += self.shared_hits
+        stats["misses"] -= self.shared_hits
+        stats["enabled"] = self.enabled
+        stats["backend"] = self.backend.name
+        stats["shared_hits"] = self.shared_hits
+        stats["errors"] = self.errors
+        entities = tuple(sorted(self._entities))
+        try:
+            stats["versions"] = dict(zip(entities, self.backend.generations(entities))) if entities else {}
+        except CacheBackendError:
+            stats["versions"] = None
+        return stats
+
+
+def shared_across_workers(backend) -> bool:
+    """Whether every worker sees ``backend``'s generations: a shared backend, or a single worker
+
+    Workers started by run.py get the count in WEB_WORKERS; otherwise it is
+    one per CPU, so a plain ``uvicorn main:app`` should set WEB_WORKERS=1.
+    """
+    return backend.shared or settings.web_worker_count <= 1
+
+
+def create_backend(name: str):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "disk":
+        path = settings.catalog_cache_path or os.path.join(tempfile.gettempdir(), "sns-catalog-cache.sqlite3")
+        return DiskBackend(path, settings.catalog_cache_ttl_seconds, settings.catalog_cache_disk_max_entries)
+    if name == "redis":
+        return RedisBackend(
+            settings.catalog_cache_redis_url,
+            settings.catalog_cache_ttl_seconds,
+            settings.catalog_cache_key_prefix,
+            timeout=settings.catalog_cache_redis_timeout,
+        )
+    raise ValueError(f"unknown CATALOG_CACHE_BACKEND {name!r} (memory, disk or redis)")
+
+
+_backend = create_backend(settings.catalog_cache_backend)
+# A memory backend in one of several workers would only hear of that
+# worker's writes and serve the others' changes stale until the TTL
+catalog_cache = CatalogCache(
+    max_entries=settings.catalog_cache_max_entries,
+    ttl=settings.catalog_cache_ttl_seconds,
+    enabled=settings.catalog_cache_enabled and shared_across_workers(_backend),
+    backend=_backend,
+)
+if settings.catalog_cache_enabled and not catalog_cache.enabled:
+    logger.warning(
+        "catalog cache bypassed: the %s backend is per worker and %d workers run; "
+        "use CATALOG_CACHE_BACKEND=disk or redis", _backend.name, settings.web_worker_count
+    )
@@ -0,0 +1,80 @@
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from app import schemas
+
+# Section name -> catalog cache entities its payload is built from
+CATALOG_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "categories": ("categories", "products", "sub_products"),
+    "services": ("services", "categories"),
+    "solutions": ("solutions",),
+    "customers": ("customers",),
+    "company_info": ("company_info",),
+}
+
+# Entity name accepted in ``fields`` -> (schema, nested child key)
+CATALOG_ENTITIES = {
+    "categories": (schemas.CatalogCategory, "products"),
+    "products": (schemas.CatalogProduct, "sub_products"),
+    "sub_products": (schemas.SubProduct, None),
+    "services": (schemas.Service, None),
+    "solutions": (schemas.Solution, None),
+    "customers": (schemas.Customer, None),
+    "company_info": (schemas.CompanyInfo, None),
+}
+
+CatalogFields = Tuple[Tuple[str, FrozenSet[str]], ...]
+
+
+def parse_sections(value: Optional[str]) -> Tuple[str, ...]:
+    """``categories,services`` -> sections in canonical order (all when empty)"""
+    if not value:
+        return tuple(CATALOG_SECTIONS)
+    requested = {section.strip() for section in value.split(",") if section.strip()}
+    unknown = requested - set(CATALOG_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown catalog sections: {', '.join(sorted(unknown))}")
+    return tuple(section for section in CATALOG_SECTIONS if section in requested)
+
+
+def parse_fields(value: Optional[str]) -> CatalogFields:
+    """``sub_products.name,products.image_url`` -> per-entity field selection.
+
+    Entities that are not mentioned keep all of their fields; ``id`` and the
+    nested child lists are always returned so the tree stays navigable.
+    """
+    selected: Dict[str, set] = {}
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        entity, _, field = item.partition(".")
+        if entity not in CATALOG_ENTITIES or not field:
+            raise ValueError(f"Invalid catalog field '{item}', expected <entity>.<field>")
+        schema, child = CATALOG_ENTITIES[entity]
+        if field not in schema.__fields__ or field == child:
+            raise ValueError(f"Unknown field '{field}' for {entity}")
+        selected.setdefault(entity, {"id"}).add(field)
+    return tuple(sorted((entity, frozenset(fields)) for entity, fields in selected.items()))
+
+
+def _entity_include(entity: str, fields: Dict[str, FrozenSet[str]]) -> dict:
+    schema, child = CATALOG_ENTITIES[entity]
+    names = fields.get(entity) or set(schema.__fields__) - {child}
+    include = {name: ... for name in schema.__fields__ if name in names}
+    if child:
+        include[child] = {"__all__": _entity_include(child, fields)}
+    return include
+
+
+def include_spec(sections: Tuple[str, ...], fields: CatalogFields) -> dict:
+    """Pydantic ``include`` argument rendering only the requested sections/fields"""
+    selected = dict(fields)
+    include = {}
+    for section in sections:
+        if section == "company_info":
+            include[section] = _entity_include(section, selected)
+        else:
+            include[section] = {"__all__": _entity_include(section, selected)}
+    if "categories" in sections:
+        include["uncategorized_products"] = {"__all__": _entity_include("products", selected)}
+    return include
@@ -0,0 +1,243 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.conditional import encoded_etag
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies keyed by (ETag, encoding), capped in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+compressed_body_cache = CompressedBodyCache(max_bytes=settings.compression_cache_max_bytes)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """``br`` or ``gzip`` (in that order of preference) if the client accepts it"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI gzip/brotli compression for text and JSON responses.
+
+    Bodies under ``minimum_size`` bytes go out as is. A response with an
+    ETag (the cacheable public routes) has its compressed bytes stored in
+    ``cache`` under (ETag, encoding), so repeated hits skip the compressor;
+    the ETag sent is suffixed with the encoding (``"<digest>-gzip"``), which
+    the validators accept back in If-None-Match. Streaming responses are
+    compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache: Optional[CompressedBodyCache] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSender(self, encoding, Headers(scope=scope).get("if-none-match", ""), send)
+        await self.app(scope, receive, responder)
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = self.compressor(encoding)
+        return compressor.compress(body) + compressor.flush()
+
+
+class _CompressingSender:
+    """``send`` wrapper holding back the response start until the body is known"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, if_none_match: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self.send = send
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = MutableHeaders(raw=message.setdefault("headers", []))
+            if message["status"] == 304:
+                self._rewrite_not_modified_etag(headers)
+            self.passthrough = message["status"] in (204, 304) or not _is_compressible(headers)
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            await self._send_stream_chunk(body, more_body)
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body:
+            if len(body) < self.middleware.minimum_size:
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            body = self._compressed_body(headers, body)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            self._suffix_etag(headers)
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        # Streaming: the total size is unknown, compress as chunks arrive
+        self.compressor = self.middleware.compressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["content-length"]
+        self._suffix_etag(headers)
+        await self.send(self.start_message)
+        await self._send_stream_chunk(body, more_body)
+
+    def _compressed_body(self, headers: MutableHeaders, body: bytes) -> bytes:
+        cache = self.middleware.cache
+        etag = headers.get("etag")
+        cache_control = headers.get("cache-control", "")
+        if cache is None or etag is None or "no-store" in cache_control or "private" in cache_control:
+            return self.middleware.compress(self.encoding, body)
+        key = (etag, self.encoding)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = self.middleware.compress(self.encoding, body)
+            cache.set(key, compressed)
+        return compressed
+
+    async def _send_stream_chunk(self, body: bytes, more_body: bool):
+        if self.encoding == "br":
+            chunk = self.compressor.process(body) + (self.compressor.flush() if more_body else self.compressor.finish())
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _suffix_etag(self, headers: MutableHeaders) -> None:
+        etag = headers.get("etag")
+        if etag is not None:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+
+    def _rewrite_not_modified_etag(self, headers: MutableHeaders) -> None:
+        # A 304 has no body to compress; echo the variant the client holds
+        etag = headers.get("etag")
+        if etag is not None and encoded_etag(etag, self.encoding) in self.if_none_match:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
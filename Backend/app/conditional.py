@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.cache import catalog_cache, shared_across_workers
+from app.config import settings
+from app.database import get_db, run_db
+
+
+class NotModified(Exception):
+    """Raised by a validator dependency when the client copy is still fresh"""
+
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+# Compressed variants of a response carry "<digest>-<encoding>" ETags
+ETAG_ENCODINGS = ("gzip", "br")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding``-compressed variant of a representation"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so W/ prefixes added by proxies match too
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    candidates = {candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates}
+    variants = {etag, *(encoded_etag(etag, encoding) for encoding in ETAG_ENCODINGS)}
+    return "*" in candidates or bool(candidates & variants)
+
+
+# Per-process generations differ between workers, which would give every
+# worker its own ETag for the same data
+VERSIONED_ETAGS = shared_across_workers(catalog_cache.backend)
+
+
+def _validator_state(db: Session, tables):
+    signature = crud.get_table_signature(db, tables)
+    if not VERSIONED_ETAGS:
+        return signature, None
+    # Read after the signature, so a write racing with it moves the version
+    return signature, catalog_cache.versions(model.__tablename__ for model in tables)
+
+
+def validators(*tables):
+    """Dependency factory adding ETag/Last-Modified/Cache-Control to a route.
+
+    The strong ETag hashes the request path and query together with the row
+    count and latest created_at/updated_at of every table the response is
+    built from, and their catalog cache generations: timestamps may only
+    have one-second resolution, so two writes within a second that keep the
+    row count would otherwise keep the ETag. Any insert, update or delete
+    changes it. A matching If-None-Match short-circuits the request with 304
+    before the route runs. If-Modified-Since alone is not honoured because a
+    delete does not move the latest timestamp; clients that send both are
+    covered by the ETag.
+    """
+
+    async def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        signature, versions = await run_db(db, _validator_state, tables)
+        digest = hashlib.sha256(
+            f"{request.url.path}?{request.url.query}|{signature}|{versions}".encode()
+        ).hexdigest()[:32]
+        etag = f'"{digest}"'
+
+        headers = {"ETag": etag}
+        if settings.public_cache_control:
+            headers["Cache-Control"] = settings.public_cache_control
+        last_modified = max((changed for _, changed in signature if changed is not None), default=None)
+        if last_modified is not None:
+            headers["Last-Modified"] = _http_date(last_modified)
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModified(headers)
+        response.headers.update(headers)
+
+    return dependency
+
+
+def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers=exc.headers)
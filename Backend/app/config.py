@@ -15,11 +15,32 @@ class Settings(BaseSettings):
     db_name: str = "sns_db"
     db_user: str = "postgres"
     db_password: str = "password"
+    async_database: bool = False
+    
+    # Connection Pool Configuration
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_null_pool: bool = False  # PgBouncer mode: no app-side pooling
+    db_statement_cache_size: int = 0  # asyncpg prepared statement cache in PgBouncer mode
     
     # Security Configuration
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    admin_auth_cache_enabled: bool = True
+    admin_auth_cache_ttl_seconds: int = 30
+    admin_auth_cache_max_entries: int = 256
+    
+    # Login Protection Configuration
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 16
+    login_attempts_per_ip: int = 20
+    login_attempts_per_username: int = 5
+    login_attempt_window_seconds: int = 60
     
     # Admin Configuration
     admin_username: str = "admin"
@@ -41,6 +62,55 @@ class Settings(BaseSettings):
     # CORS Configuration
     cors_origins: str = '["http://localhost:3000","http://localhost:3001","http://127.0.0.1:3000","http://127.0.0.1:3001"]'
     
+    # Catalog Cache Configuration
+    catalog_cache_enabled: bool = True
+    catalog_cache_ttl_seconds: int = 300
+    catalog_cache_max_entries: int = 1024
+    # memory (per worker), disk (SQLite file shared by the workers of a host)
+    # or redis (shared by every worker and host)
+    catalog_cache_backend: str = "memory"
+    catalog_cache_path: str = ""  # disk backend; empty = sns-catalog-cache.sqlite3 in the temp dir
+    catalog_cache_disk_max_entries: int = 10000
+    catalog_cache_redis_url: str = "redis://localhost:6379/0"
+    catalog_cache_redis_timeout: float = 1.0
+    catalog_cache_key_prefix: str = "sns:catalog:"
+    
+    # HTTP Caching Configuration (Cache-Control sent with public responses)
+    public_cache_control: str = "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+    
+    # Serialize public list pages straight from column rows (orjson when installed)
+    fast_json_responses: bool = False
+    
+    # Response Compression Configuration (brotli when installed, else gzip)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_cache_max_bytes: int = 32 * 1024 * 1024
+    
+    # Observability Configuration (/metrics, Server-Timing, slow query log)
+    metrics_enabled: bool = True
+    metrics_token: str = ""
+    server_timing_header: bool = True
+    slow_query_threshold_ms: int = 200
+    
+    # Server Configuration (run.py; PORT is set by Render)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    web_server: str = "gunicorn"  # gunicorn with uvicorn workers, or uvicorn --workers
+    web_workers: int = 0  # 0: one per CPU available to the process
+    web_reload: bool = False  # single auto-reloading process for development
+    web_graceful_timeout: int = 30
+    web_keepalive: int = 5
+    web_max_requests: int = 0  # recycle a worker after this many requests (0: never)
+    # Proxies whose X-Forwarded-For/-Proto are trusted (comma-separated, * for
+    # any); the login throttle keys on the client IP they report
+    forwarded_allow_ips: str = "127.0.0.1"
+    warmup_on_startup: bool = True
+    warmup_in_background: bool = False  # accept connections at once; /ready says 503 until warm
+    warmup_pool_connections: int = 0  # 0: DB_POOL_SIZE
+    migrate_on_startup: bool = False  # run.py applies Alembic migrations before starting workers
+    
     # Default Images Configuration
     default_product_image: str = "https://picsum.photos/400/300?random=1"
     default_logo_image: str = "https://picsum.photos/200/100?random=2"
@@ -50,6 +120,28 @@ class Settings(BaseSettings):
         """Check if running in production environment"""
         return self.environment.lower() == "production"
     
+    @property
+    def web_worker_count(self) -> int:
+        """WEB_WORKERS, or the number of CPUs this process may run on"""
+        if self.web_workers > 0:
+            return self.web_workers
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:  # not available on macOS/Windows
+            return os.cpu_count() or 1
+    
+    @property
+    def async_database_url(self) -> str:
+        """database_url rewritten for the asyncpg / aiosqlite drivers"""
+        drivers = {
+            "postgresql+psycopg2": "postgresql+asyncpg",
+            "postgresql": "postgresql+asyncpg",
+            "postgres": "postgresql+asyncpg",
+            "sqlite": "sqlite+aiosqlite",
+        }
+        scheme, _, rest = self.database_url.partition("://")
+        return f"{drivers.get(scheme, scheme)}://{rest}"
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from string to list"""
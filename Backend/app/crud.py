@@ -1,8 +1,41 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
+import re
+from sqlalchemy.orm import Session, defaultload, joinedload, raiseload, selectinload, with_loader_criteria
+from pydantic import ValidationError
+from sqlalchemy import Text, and_, bindparam, cast, delete, exists, func, insert, literal, null, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, List, Optional
 from app import models, schemas
+from app import auth
+from app.catalog import CATALOG_SECTIONS, include_spec
 from app.auth import get_password_hash
+from app.cache import catalog_cache, shared_across_workers
+from app.fastjson import row_page
+from app.pagination import NullsLast, Page, paginate
+from app.pricing import parse_price_range
+
+
+# Relationships each response schema serializes. Queries whose rows become
+# that schema eager-load exactly these and forbid every other lazy load, so
+# serializing a page never turns into one extra SELECT per row
+RESPONSE_LOADS = {
+    schemas.Product: (joinedload(models.Product.category),),
+    schemas.Service: (joinedload(models.Service.category),),
+}
+
+
+def response_loads(schema):
+    """Loader options for a query serialized as ``schema``"""
+    return RESPONSE_LOADS.get(schema, ()) + (raiseload("*"),)
+
+
+def refresh_for(db: Session, instance, schema) -> None:
+    """``db.refresh`` that also loads the relationships ``schema`` serializes.
+
+    The instance is returned to a route after a commit; under an AsyncSession
+    a lazy load during serialization is not even possible.
+    """
+    model = type(instance)
+    db.query(model).filter(model.id == instance.id).options(*response_loads(schema)).populate_existing().one()
 
 
 # Admin CRUD
@@ -11,7 +44,7 @@ def get_admin(db: Session, admin_id: int):
 
 
 def get_admin_by_username(db: Session, username: str):
-    return db.query(models.Admin).filter(models.Admin.username == username).first()
+    return auth.get_admin_by_username(db, username)
 
 
 def create_admin(db: Session, admin: schemas.AdminCreate):
@@ -30,6 +63,7 @@ def create_admin(db: Session, admin: schemas.AdminCreate):
 def update_admin(db: Session, admin_id: int, admin_update: schemas.AdminUpdate):
     db_admin = db.query(models.Admin).filter(models.Admin.id == admin_id).first()
     if db_admin:
+        previous_username = db_admin.username
         update_data = admin_update.dict(exclude_unset=True)
         if "password" in update_data:
             update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
@@ -39,16 +73,24 @@ def update_admin(db: Session, admin_id: int, admin_update: schemas.AdminUpdate):
         
         db.commit()
         db.refresh(db_admin)
+        auth.invalidate_admin(previous_username)
+        auth.invalidate_admin(db_admin.username)
     return db_admin
 
 
 # Category CRUD
-def get_categories(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Category).offset(skip).limit(limit).all()
+def get_categories(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Category).options(*response_loads(schemas.Category))
+    return paginate(query, (models.Category.id,), skip, limit, cursor)
+
+
+def get_active_categories(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Category).filter(models.Category.is_active == True).options(*response_loads(schemas.Category))
+    return paginate(query, (models.Category.id,), skip, limit, cursor)
 
 
 def get_category(db: Session, category_id: int):
-    return db.query(models.Category).filter(models.Category.id == category_id).first()
+    return db.query(models.Category).filter(models.Category.id == category_id).options(*response_loads(schemas.Category)).first()
 
 
 def create_category(db: Session, category: schemas.CategoryCreate):
@@ -56,6 +98,7 @@ def create_category(db: Session, category: schemas.CategoryCreate):
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    catalog_cache.invalidate("categories")
     return db_category
 
 
@@ -67,6 +110,7 @@ def update_category(db: Session, category_id: int, category_update: schemas.Cate
             setattr(db_category, field, value)
         db.commit()
         db.refresh(db_category)
+        catalog_cache.invalidate("categories")
     return db_category
 
 
@@ -75,23 +119,32 @@ def delete_category(db: Session, category_id: int):
     if db_category:
         db.delete(db_category)
         db.commit()
+        # The ORM sets category_id to NULL on the category's products and services
+        catalog_cache.invalidate("categories", "products", "services")
     return db_category
 
 
 # Product CRUD
-def get_products(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Product).offset(skip).limit(limit).all()
+def get_products(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Product).options(*response_loads(schemas.Product))
+    return paginate(query, (models.Product.id,), skip, limit, cursor)
+
+
+def get_active_products(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Product).filter(models.Product.is_active == True).options(*response_loads(schemas.Product))
+    return paginate(query, (models.Product.id,), skip, limit, cursor)
 
 
 def get_product(db: Session, product_id: int):
-    return db.query(models.Product).filter(models.Product.id == product_id).first()
+    return db.query(models.Product).filter(models.Product.id == product_id).options(*response_loads(schemas.Product)).first()
 
 
 def create_product(db: Session, product: schemas.ProductCreate):
     db_product = models.Product(**product.dict())
     db.add(db_product)
     db.commit()
-    db.refresh(db_product)
+    refresh_for(db, db_product, schemas.Product)
+    catalog_cache.invalidate("products")
     return db_product
 
 
@@ -102,7 +155,8 @@ def update_product(db: Session, product_id: int, product_update: schemas.Product
         for field, value in update_data.items():
             setattr(db_product, field, value)
         db.commit()
-        db.refresh(db_product)
+        refresh_for(db, db_product, schemas.Product)
+        catalog_cache.invalidate("products")
     return db_product
 
 
@@ -111,38 +165,198 @@ def delete_product(db: Session, product_id: int):
     if db_product:
         db.delete(db_product)
         db.commit()
+        catalog_cache.invalidate("products", "sub_products")
     return db_product
 
 
 # SubProduct CRUD
-def get_sub_products(db: Session, skip: int = 0, limit: int = 100, product_id: Optional[int] = None):
-    query = db.query(models.SubProduct)
+SUB_PRODUCT_ORDER = (models.SubProduct.sort_order, models.SubProduct.id)
+
+
+def price_bounds(price_range: Optional[str]) -> Dict[str, Optional[float]]:
+    price_min, price_max = parse_price_range(price_range)
+    return {"price_min": price_min, "price_max": price_max}
+
+
+# model -> (source column, function of its value returning the columns
+# derived from it). Every write path sets these; no schema accepts them.
+DERIVED_COLUMNS = {
+    models.SubProduct: ("price_range", price_bounds),
+}
+
+
+def with_derived_columns(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """``values`` (a full row, as a create schema dumps it) plus its derived columns"""
+    if model not in DERIVED_COLUMNS:
+        return values
+    source, derive = DERIVED_COLUMNS[model]
+    return {**values, **derive(values.get(source))}
+
+
+def refresh_derived_columns(db: Session, model, ids) -> None:
+    """Recompute the derived columns of rows ``ids`` from what they now store"""
+    if model not in DERIVED_COLUMNS:
+        return
+    source, derive = DERIVED_COLUMNS[model]
+    table = model.__table__
+    for chunk in _chunks(list(ids)):
+        params = [
+            {"row_id": row_id, **{f"new_{column}": value for column, value in derive(source_value).items()}}
+            for row_id, source_value in db.execute(select(table.c.id, table.c[source]).where(table.c.id.in_(chunk)))
+        ]
+        if params:
+            db.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(
+                    {column: bindparam(f"new_{column}") for column in derive(None)}
+                ),
+                params,
+            )
+
+# sort parameter of the public sub product list -> page order
+SUB_PRODUCT_SORTS = {
+    None: SUB_PRODUCT_ORDER,
+    # Sub products without a parseable price come last
+    schemas.SubProductSort.price: (NullsLast(models.SubProduct.price_min), models.SubProduct.id),
+}
+
+
+def get_sub_products(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    product_id: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    query = db.query(models.SubProduct).options(*response_loads(schemas.SubProduct))
+    if product_id:
+        query = query.filter(models.SubProduct.product_id == product_id)
+    return paginate(query, SUB_PRODUCT_ORDER, skip, limit, cursor)
+
+
+def sub_product_has_tag(db: Session, tag: str):
+    """Filter clause for sub products whose tags array contains ``tag``"""
+    if db.get_bind().dialect.name == "postgresql":
+        # jsonb containment, answered from the GIN index on tags
+        return models.SubProduct.tags.contains([tag])
+    tags = func.json_each(models.SubProduct.tags).table_valued("value")
+    return exists(select(literal(1)).select_from(tags).where(tags.c.value == tag))
+
+
+# Facet filters of the public sub product list -> the column they match and
+# group on (category_id through the parent product)
+SUB_PRODUCT_FACETS = {
+    "brand": models.SubProduct.brand,
+    "availability_status": models.SubProduct.availability_status,
+    "currency": models.SubProduct.currency,
+    "is_featured": models.SubProduct.is_featured,
+    "category_id": models.Product.category_id,
+}
+
+
+def filter_sub_products(
+    db: Session,
+    query,
+    product_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: Optional[schemas.SubProductSort] = None,
+    **facets
+):
+    """Apply the public list filters to a sub product query, returning it with its page order
+
+    The price bounds match sub products whose whole price range lies between
+    them, so an open-ended "from $500" never passes ``max_price``. ``facets``
+    are equality filters on the SUB_PRODUCT_FACETS columns; None skips one.
+    """
     if product_id:
         query = query.filter(models.SubProduct.product_id == product_id)
-    return query.offset(skip).limit(limit).all()
+    if tag:
+        query = query.filter(sub_product_has_tag(db, tag))
+    if min_price is not None:
+        query = query.filter(models.SubProduct.price_min >= min_price)
+    if max_price is not None:
+        query = query.filter(models.SubProduct.price_max <= max_price)
+    for name, value in facets.items():
+        if value is None:
+            continue
+        if name == "category_id":
+            query = query.filter(models.SubProduct.product.has(models.Product.category_id == value))
+        else:
+            query = query.filter(SUB_PRODUCT_FACETS[name] == value)
+    return query, SUB_PRODUCT_SORTS[sort]
+
+
+def get_active_sub_products(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    **filters
+):
+    query = db.query(models.SubProduct).filter(
+        models.SubProduct.is_active == True
+    ).options(*response_loads(schemas.SubProduct))
+    query, order_by = filter_sub_products(db, query, **filters)
+    return paginate(query, order_by, skip, limit, cursor)
+
+
+def get_sub_product_facets(db: Session, **filters) -> schemas.SubProductFacets:
+    """Active sub product count and per-facet value counts under ``filters``
+
+    One grouped query per facet. Each facet is counted with every filter but
+    its own, so the sidebar still lists the brands a shopper can switch to
+    after picking one. NULL values are left out.
+    """
+    def base(*columns):
+        return db.query(*columns).select_from(models.SubProduct).filter(models.SubProduct.is_active == True)
+
+    total = filter_sub_products(db, base(func.count(models.SubProduct.id)), **filters)[0].scalar()
+    facets = {}
+    for name, column in SUB_PRODUCT_FACETS.items():
+        count = func.count(models.SubProduct.id)
+        if name == "category_id":
+            query = base(column, models.Category.name, count).join(
+                models.Product, models.SubProduct.product_id == models.Product.id
+            ).outerjoin(models.Category, models.Product.category_id == models.Category.id).group_by(
+                column, models.Category.name
+            )
+        else:
+            query = base(column, null(), count).group_by(column)
+        query, _ = filter_sub_products(db, query, **{**filters, name: None})
+        rows = query.filter(column.isnot(None)).order_by(count.desc(), column).all()
+        facets[name] = [schemas.FacetCount(value=value, label=label, count=n) for value, label, n in rows]
+    return schemas.SubProductFacets(total=total, facets=facets)
 
 
 def get_sub_product(db: Session, sub_product_id: int):
-    return db.query(models.SubProduct).filter(models.SubProduct.id == sub_product_id).first()
+    return db.query(models.SubProduct).filter(
+        models.SubProduct.id == sub_product_id
+    ).options(*response_loads(schemas.SubProduct)).first()
 
 
 def get_sub_products_by_product(db: Session, product_id: int):
     return db.query(models.SubProduct).filter(
         and_(models.SubProduct.product_id == product_id, models.SubProduct.is_active == True)
+    ).options(
+        *response_loads(schemas.SubProduct)
     ).order_by(models.SubProduct.sort_order, models.SubProduct.name).all()
 
 
 def get_featured_sub_products(db: Session, limit: int = 10):
     return db.query(models.SubProduct).filter(
         and_(models.SubProduct.is_featured == True, models.SubProduct.is_active == True)
+    ).options(
+        *response_loads(schemas.SubProduct)
     ).order_by(models.SubProduct.sort_order, models.SubProduct.name).limit(limit).all()
 
 
 def create_sub_product(db: Session, sub_product: schemas.SubProductCreate):
-    db_sub_product = models.SubProduct(**sub_product.dict())
+    db_sub_product = models.SubProduct(**with_derived_columns(models.SubProduct, sub_product.dict()))
     db.add(db_sub_product)
     db.commit()
     db.refresh(db_sub_product)
+    catalog_cache.invalidate("sub_products")
     return db_sub_product
 
 
@@ -152,8 +366,12 @@ def update_sub_product(db: Session, sub_product_id: int, sub_product_update: sch
         update_data = sub_product_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_sub_product, field, value)
+        # From the row's final price_range, whichever fields were sent
+        for field, value in price_bounds(db_sub_product.price_range).items():
+            setattr(db_sub_product, field, value)
         db.commit()
         db.refresh(db_sub_product)
+        catalog_cache.invalidate("sub_products")
     return db_sub_product
 
 
@@ -162,39 +380,104 @@ def delete_sub_product(db: Session, sub_product_id: int):
     if db_sub_product:
         db.delete(db_sub_product)
         db.commit()
+        catalog_cache.invalidate("sub_products")
     return db_sub_product
 
 
+SEARCH_FIELD_WEIGHTS = (("name", 4), ("brand", 2), ("model", 2), ("tags", 1))
+
+
+def _search_terms(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
 def search_sub_products(db: Session, query: str, skip: int = 0, limit: int = 100):
-    """Search sub products by name, brand, model, or tags"""
-    search_filter = f"%{query}%"
+    """Search active sub products by name, brand, model, or tags
+
+    Every word of the query has to match the start of a word in one of those
+    fields, so "cat swi" finds "Catalyst 9300 Switch". On PostgreSQL this is
+    answered from the GIN-indexed search_vector and ranked with ts_rank;
+    other databases (SQLite in tests) use the in-process fallback.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return []
+    if db.get_bind().dialect.name != "postgresql":
+        return _search_sub_products_in_process(db, terms, skip, limit)
+
+    ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    rank = func.ts_rank(models.SubProduct.search_vector, ts_query)
     return db.query(models.SubProduct).filter(
         and_(
             models.SubProduct.is_active == True,
-            (
-                models.SubProduct.name.ilike(search_filter) |
-                models.SubProduct.brand.ilike(search_filter) |
-                models.SubProduct.model.ilike(search_filter) |
-                models.SubProduct.tags.ilike(search_filter)
-            )
+            models.SubProduct.search_vector.op("@@")(ts_query)
         )
-    ).offset(skip).limit(limit).all()
+    ).options(*response_loads(schemas.SubProduct)).order_by(rank.desc(), models.SubProduct.id).offset(skip).limit(limit).all()
+
+
+def _search_score(sub_product, terms: List[str]) -> int:
+    """Sum of the best field weight per term, or 0 if any term has no prefix match"""
+    score = 0
+    for term in terms:
+        best = 0
+        for field, weight in SEARCH_FIELD_WEIGHTS:
+            words = _search_terms(getattr(sub_product, field) or "")
+            if weight > best and any(word.startswith(term) for word in words):
+                best = weight
+        if not best:
+            return 0
+        score += best
+    return score
+
+
+def _search_sub_products_in_process(db: Session, terms: List[str], skip: int, limit: int):
+    # tags is a JSON array; its text form is enough for matching and ranking
+    fields = [cast(getattr(models.SubProduct, field), Text).label(field) for field, _ in SEARCH_FIELD_WEIGHTS]
+    query = db.query(models.SubProduct.id, *fields).filter(models.SubProduct.is_active == True)
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.filter(or_(*(field.ilike(pattern) for field in fields)))
+
+    # Rank on the searchable columns only, then hydrate just the requested page
+    ranked = []
+    for row in query.all():
+        score = _search_score(row, terms)
+        if score:
+            ranked.append((-score, row.id))
+    ranked.sort()
+    page_ids = [sub_product_id for _, sub_product_id in ranked[skip:skip + limit]]
+    if not page_ids:
+        return []
+    by_id = {
+        sub_product.id: sub_product
+        for sub_product in db.query(models.SubProduct).filter(
+            models.SubProduct.id.in_(page_ids)
+        ).options(*response_loads(schemas.SubProduct))
+    }
+    return [by_id[sub_product_id] for sub_product_id in page_ids]
 
 
 # Service CRUD
-def get_services(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Service).offset(skip).limit(limit).all()
+def get_services(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Service).options(*response_loads(schemas.Service))
+    return paginate(query, (models.Service.id,), skip, limit, cursor)
+
+
+def get_active_services(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Service).filter(models.Service.is_active == True).options(*response_loads(schemas.Service))
+    return paginate(query, (models.Service.id,), skip, limit, cursor)
 
 
 def get_service(db: Session, service_id: int):
-    return db.query(models.Service).filter(models.Service.id == service_id).first()
+    return db.query(models.Service).filter(models.Service.id == service_id).options(*response_loads(schemas.Service)).first()
 
 
 def create_service(db: Session, service: schemas.ServiceCreate):
     db_service = models.Service(**service.dict())
     db.add(db_service)
     db.commit()
-    db.refresh(db_service)
+    refresh_for(db, db_service, schemas.Service)
+    catalog_cache.invalidate("services")
     return db_service
 
 
@@ -205,7 +488,8 @@ def update_service(db: Session, service_id: int, service_update: schemas.Service
         for field, value in update_data.items():
             setattr(db_service, field, value)
         db.commit()
-        db.refresh(db_service)
+        refresh_for(db, db_service, schemas.Service)
+        catalog_cache.invalidate("services")
     return db_service
 
 
@@ -214,16 +498,23 @@ def delete_service(db: Session, service_id: int):
     if db_service:
         db.delete(db_service)
         db.commit()
+        catalog_cache.invalidate("services")
     return db_service
 
 
 # Solution CRUD
-def get_solutions(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Solution).offset(skip).limit(limit).all()
+def get_solutions(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Solution).options(*response_loads(schemas.Solution))
+    return paginate(query, (models.Solution.id,), skip, limit, cursor)
+
+
+def get_active_solutions(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Solution).filter(models.Solution.is_active == True).options(*response_loads(schemas.Solution))
+    return paginate(query, (models.Solution.id,), skip, limit, cursor)
 
 
 def get_solution(db: Session, solution_id: int):
-    return db.query(models.Solution).filter(models.Solution.id == solution_id).first()
+    return db.query(models.Solution).filter(models.Solution.id == solution_id).options(*response_loads(schemas.Solution)).first()
 
 
 def create_solution(db: Session, solution: schemas.SolutionCreate):
@@ -231,6 +522,7 @@ def create_solution(db: Session, solution: schemas.SolutionCreate):
     db.add(db_solution)
     db.commit()
     db.refresh(db_solution)
+    catalog_cache.invalidate("solutions")
     return db_solution
 
 
@@ -242,6 +534,7 @@ def update_solution(db: Session, solution_id: int, solution_update: schemas.Solu
             setattr(db_solution, field, value)
         db.commit()
         db.refresh(db_solution)
+        catalog_cache.invalidate("solutions")
     return db_solution
 
 
@@ -250,16 +543,23 @@ def delete_solution(db: Session, solution_id: int):
     if db_solution:
         db.delete(db_solution)
         db.commit()
+        catalog_cache.invalidate("solutions")
     return db_solution
 
 
 # Customer CRUD
-def get_customers(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Customer).offset(skip).limit(limit).all()
+def get_customers(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Customer).options(*response_loads(schemas.Customer))
+    return paginate(query, (models.Customer.id,), skip, limit, cursor)
+
+
+def get_active_customers(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Customer).filter(models.Customer.is_active == True).options(*response_loads(schemas.Customer))
+    return paginate(query, (models.Customer.id,), skip, limit, cursor)
 
 
 def get_customer(db: Session, customer_id: int):
-    return db.query(models.Customer).filter(models.Customer.id == customer_id).first()
+    return db.query(models.Customer).filter(models.Customer.id == customer_id).options(*response_loads(schemas.Customer)).first()
 
 
 def create_customer(db: Session, customer: schemas.CustomerCreate):
@@ -267,6 +567,7 @@ def create_customer(db: Session, customer: schemas.CustomerCreate):
     db.add(db_customer)
     db.commit()
     db.refresh(db_customer)
+    catalog_cache.invalidate("customers")
     return db_customer
 
 
@@ -278,6 +579,7 @@ def update_customer(db: Session, customer_id: int, customer_update: schemas.Cust
             setattr(db_customer, field, value)
         db.commit()
         db.refresh(db_customer)
+        catalog_cache.invalidate("customers")
     return db_customer
 
 
@@ -286,12 +588,13 @@ def delete_customer(db: Session, customer_id: int):
     if db_customer:
         db.delete(db_customer)
         db.commit()
+        catalog_cache.invalidate("customers")
     return db_customer
 
 
 # Company Info CRUD
 def get_company_info(db: Session):
-    return db.query(models.CompanyInfo).first()
+    return db.query(models.CompanyInfo).options(*response_loads(schemas.CompanyInfo)).first()
 
 
 def create_company_info(db: Session, company_info: schemas.CompanyInfoCreate):
@@ -299,6 +602,7 @@ def create_company_info(db: Session, company_info: schemas.CompanyInfoCreate):
     db.add(db_company_info)
     db.commit()
     db.refresh(db_company_info)
+    catalog_cache.invalidate("company_info")
     return db_company_info
 
 
@@ -310,4 +614,574 @@ def update_company_info(db: Session, company_info_update: schemas.CompanyInfoUpd
             setattr(db_company_info, field, value)
         db.commit()
         db.refresh(db_company_info)
-    return db_company_info
\ No newline at end of file
+        catalog_cache.invalidate("company_info")
+    return db_company_info
+
+
+# Bulk CRUD
+BULK_CHUNK_SIZE = 500
+
+# table -> model, create/update schemas and {foreign key column: referenced model}
+BULK_ENTITIES = {
+    "categories": (models.Category, schemas.CategoryCreate, schemas.CategoryUpdate, {}),
+    "products": (models.Product, schemas.ProductCreate, schemas.ProductUpdate, {"category_id": models.Category}),
+    "sub_products": (
+        models.SubProduct, schemas.SubProductCreate, schemas.SubProductUpdate, {"product_id": models.Product}
+    ),
+    "services": (models.Service, schemas.ServiceCreate, schemas.ServiceUpdate, {"category_id": models.Category}),
+    "solutions": (models.Solution, schemas.SolutionCreate, schemas.SolutionUpdate, {}),
+    "customers": (models.Customer, schemas.CustomerCreate, schemas.CustomerUpdate, {}),
+}
+
+# Cache entities touched by a bulk write, including rows changed by delete
+# cascades (sub products of products, category references)
+BULK_INVALIDATES = {
+    "categories": ("categories", "products", "services"),
+    "products": ("products", "sub_products"),
+}
+
+
+def _chunks(values: List[Any]):
+    for start in range(0, len(values), BULK_CHUNK_SIZE):
+        yield values[start:start + BULK_CHUNK_SIZE]
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _existing_values(db: Session, column, values) -> Dict[Any, int]:
+    """{value: id} for rows whose ``column`` is one of ``values``, one query per chunk"""
+    model = column.class_
+    found = {}
+    for chunk in _chunks(list(values)):
+        found.update(db.query(column, model.id).filter(column.in_(chunk)))
+    return found
+
+
+def _bulk_row_errors(db: Session, model, foreign_keys, rows) -> Dict[int, str]:
+    """Foreign key and unique violations of ``rows`` ((index, id, values)) by index"""
+    errors = {}
+    for column, target in foreign_keys.items():
+        referenced = {values[column] for _, _, values in rows if values.get(column) is not None}
+        known = _existing_values(db, target.id, referenced) if referenced else {}
+        for index, _, values in rows:
+            value = values.get(column)
+            if value is not None and value not in known and index not in errors:
+                errors[index] = f"{column}: {target.__tablename__} {value} does not exist"
+
+    for column in model.__table__.columns:
+        if not column.unique:
+            continue
+        attribute = getattr(model, column.key)
+        wanted = {values[column.key] for _, _, values in rows if values.get(column.key) is not None}
+        taken = _existing_values(db, attribute, wanted) if wanted else {}
+        seen = set()
+        for index, row_id, values in rows:
+            value = values.get(column.key)
+            if value is None or index in errors:
+                continue
+            if value in seen or taken.get(value, row_id) != row_id:
+                errors[index] = f"{column.key}: '{value}' is already used"
+            seen.add(value)
+    return errors
+
+
+def _bulk_result(processed: int, ids, errors: Dict[int, Any]) -> schemas.BulkResult:
+    return schemas.BulkResult(
+        processed=processed,
+        ids=ids,
+        errors=[
+            schemas.BulkError(index=index, id=row_id, error=message)
+            for index, (row_id, message) in sorted(errors.items())
+        ],
+    )
+
+
+def bulk_create(db: Session, table: str, items: List[Dict[str, Any]], atomic: bool = False):
+    """Validate every item, then insert the valid ones in one transaction
+
+    Foreign keys and unique columns are checked with one set-based query per
+    column, and rows are written with multi-row INSERTs. ``ids`` lists the
+    new ids in request order on databases with INSERT ... RETURNING.
+    With ``atomic`` nothing is written if any row fails.
+    """
+    model, create_schema, _, foreign_keys = BULK_ENTITIES[table]
+    errors = {}
+    rows = []
+    for index, item in enumerate(items):
+        try:
+            rows.append((index, None, with_derived_columns(model, create_schema.parse_obj(item).dict())))
+        except ValidationError as exc:
+            errors[index] = (None, _validation_message(exc))
+    row_errors = _bulk_row_errors(db, model, foreign_keys, rows)
+    errors.update((index, (None, message)) for index, message in row_errors.items())
+    rows = [row for row in rows if row[0] not in errors]
+    if not rows or (atomic and errors):
+        return _bulk_result(0, [], errors)
+
+    values = [row_values for _, _, row_values in rows]
+    returning = getattr(db.get_bind().dialect, "full_returning", False)
+    ids = [] if returning else None
+    for chunk in _chunks(values):
+        if returning:
+            ids.extend(db.execute(insert(model.__table__).values(chunk).returning(model.__table__.c.id)).scalars())
+        else:
+            db.execute(insert(model.__table__), chunk)
+    db.commit()
+    catalog_cache.invalidate(*BULK_INVALIDATES.get(table, (table,)))
+    return _bulk_result(len(values), ids, errors)
+
+
+def bulk_update(db: Session, table: str, items: List[Dict[str, Any]], atomic: bool = False):
+    """Apply partial updates (each item carries its ``id``) in one transaction"""
+    model, _, update_schema, foreign_keys = BULK_ENTITIES[table]
+    errors = {}
+    rows = []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        item = dict(item)
+        row_id = item.pop("id", None)
+        if not isinstance(row_id, int):
+            errors[index] = (None, "id: field required")
+            continue
+        if row_id in seen_ids:
+            errors[index] = (row_id, "id: repeated in this request")
+            continue
+        seen_ids.add(row_id)
+        try:
+            values = update_schema.parse_obj(item).dict(exclude_unset=True)
+        except ValidationError as exc:
+            errors[index] = (row_id, _validation_message(exc))
+            continue
+        rows.append((index, row_id, values))
+
+    existing = _existing_values(db, model.id, seen_ids) if seen_ids else {}
+    for index, row_id, _ in rows:
+        if row_id not in existing:
+            errors[index] = (row_id, f"{table} {row_id} does not exist")
+    rows = [row for row in rows if row[0] not in errors]
+    row_errors = _bulk_row_errors(db, model, foreign_keys, rows)
+    errors.update((index, (row_id, row_errors[index])) for index, row_id, _ in rows if index in row_errors)
+    rows = [row for row in rows if row[0] not in errors]
+    if not rows or (atomic and errors):
+        return _bulk_result(0, [], errors)
+
+    # One executemany per distinct set of updated columns
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for _, row_id, values in rows:
+        params = {f"new_{key}": value for key, value in values.items()}
+        params["row_id"] = row_id
+        groups.setdefault(tuple(sorted(values)), []).append(params)
+    for columns, params in groups.items():
+        if not columns:
+            continue
+        statement = update(model.__table__).where(model.__table__.c.id == bindparam("row_id")).values(
+            {column: bindparam(f"new_{column}") for column in columns}
+        )
+        for chunk in _chunks(params):
+            db.execute(statement, chunk)
+    refresh_derived_columns(db, model, [row_id for _, row_id, _ in rows])
+    db.commit()
+    catalog_cache.invalidate(*BULK_INVALIDATES.get(table, (table,)))
+    return _bulk_result(len(rows), [row_id for _, row_id, _ in rows], errors)
+
+
+def bulk_delete(db: Session, table: str, ids: List[int], atomic: bool = False):
+    """Delete rows by id in one transaction, applying the ORM delete cascades"""
+    model = BULK_ENTITIES[table][0]
+    existing = _existing_values(db, model.id, set(ids)) if ids else {}
+    errors = {}
+    targets = []
+    seen_ids = set()
+    for index, row_id in enumerate(ids):
+        if row_id not in existing:
+            errors[index] = (row_id, f"{table} {row_id} does not exist")
+        elif row_id in seen_ids:
+            errors[index] = (row_id, "id: repeated in this request")
+        else:
+            seen_ids.add(row_id)
+            targets.append(row_id)
+    if not targets or (atomic and errors):
+        return _bulk_result(0, [], errors)
+
+    for chunk in _chunks(targets):
+        # Same effect as the relationship cascades db.delete() applies
+        if table == "products":
+            db.execute(delete(models.SubProduct.__table__).where(models.SubProduct.product_id.in_(chunk)))
+        elif table == "categories":
+            for dependent in (models.Product, models.Service):
+                db.execute(
+                    update(dependent.__table__).where(dependent.category_id.in_(chunk)).values(category_id=None)
+                )
+        db.execute(delete(model.__table__).where(model.id.in_(chunk)))
+    db.commit()
+    catalog_cache.invalidate(*BULK_INVALIDATES.get(table, (table,)))
+    return _bulk_result(len(targets), targets, errors)
+
+
+def _is_unique_key(table, keys) -> bool:
+    keys = set(keys)
+    if keys == {column.key for column in table.primary_key}:
+        return True
+    if len(keys) == 1 and table.c[next(iter(keys))].unique:
+        return True
+    return any(index.unique and keys == {column.key for column in index.columns} for index in table.indexes)
+
+
+def upsert_rows(db: Session, model, rows: List[Dict[str, Any]], keys) -> None:
+    """INSERT rows, updating the existing row when ``keys`` already match
+
+    Uses ``INSERT ... ON CONFLICT (keys) DO UPDATE`` on PostgreSQL and
+    SQLite when ``keys`` is the primary key or has a unique index, leaving
+    rows whose values are unchanged untouched. Otherwise the keys are looked
+    up first and the rows split into inserts and updates. All rows must
+    carry the same columns. Does not commit.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    columns = list(rows[0])
+    updated = [column for column in columns if column not in keys]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite") and _is_unique_key(table, keys):
+        # One compiled statement executed for every row (psycopg2 batches it
+        # into multi-row VALUES); a literal multi-row VALUES clause would be
+        # recompiled for every chunk.
+        statement = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(table)
+        if updated:
+            set_ = {column: statement.excluded[column] for column in updated}
+            if "updated_at" in table.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            changed = or_(*(table.c[column].is_distinct_from(statement.excluded[column]) for column in updated))
+            statement = statement.on_conflict_do_update(index_elements=list(keys), set_=set_, where=changed)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(keys))
+        db.execute(statement, rows)
+        return
+
+    key_columns = [table.c[key] for key in keys]
+    existing = set()
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_CHUNK_SIZE]
+        wanted = [tuple(row[key] for key in keys) for row in chunk]
+        condition = key_columns[0].in_([key[0] for key in wanted]) if len(keys) == 1 else or_(
+            *(and_(*(column == value for column, value in zip(key_columns, key))) for key in wanted)
+        )
+        existing.update(tuple(row) for row in db.execute(select(*key_columns).where(condition)))
+    inserts = [row for row in rows if tuple(row[key] for key in keys) not in existing]
+    updates = [row for row in rows if tuple(row[key] for key in keys) in existing]
+    if inserts:
+        db.execute(insert(table), inserts)
+    if updated and updates:
+        statement = update(table).where(
+            and_(*(table.c[key] == bindparam(f"key_{key}") for key in keys))
+        ).values({column: bindparam(f"new_{column}") for column in updated})
+        db.execute(statement, [
+            {**{f"key_{key}": row[key] for key in keys}, **{f"new_{column}": row[column] for column in updated}}
+            for row in updates
+        ])
+
+
+def sync_id_sequence(db: Session, model) -> None:
+    """Move a PostgreSQL id sequence past rows inserted with explicit ids"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    table = model.__tablename__
+    db.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce((SELECT max(id) FROM {table}), 1))"
+    ))
+
+
+# Import / export
+EXPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 100
+
+
+def export_columns(table: str):
+    """Table columns exported for an entity: the fields of its response schema"""
+    model, create_schema, _, _ = BULK_ENTITIES[table]
+    schema = getattr(schemas, create_schema.__name__.replace("Create", ""))
+    return [model.__table__.c[name] for name in schema.__fields__ if name in model.__table__.c]
+
+
+def iter_export_rows(db: Session, table: str):
+    """Yield lists of row dicts in id order through a server-side cursor"""
+    model = BULK_ENTITIES[table][0]
+    result = db.execute(
+        select(*export_columns(table)).order_by(model.id).execution_options(stream_results=True)
+    )
+    for partition in result.mappings().partitions(EXPORT_BATCH_SIZE):
+        yield [dict(row) for row in partition]
+
+
+def _import_values(create_schema, update_schema, record: Optional[Dict[str, Any]]):
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+    row_id = record.get("id")
+    if row_id is not None:
+        try:
+            row_id = int(row_id)
+        except (TypeError, ValueError):
+            raise ValueError("id: value is not a valid integer")
+    values = create_schema.parse_obj(record).dict()
+    # Rows without is_active are imported as active
+    is_active = record.get("is_active")
+    values["is_active"] = True if is_active is None else update_schema(is_active=is_active).is_active
+    return row_id, values
+
+
+def _import_chunk(db: Session, table: str, chunk):
+    """Write the valid rows of one chunk and commit; returns (written, errors)"""
+    model, _, _, foreign_keys = BULK_ENTITIES[table]
+    row_errors = _bulk_row_errors(db, model, foreign_keys, chunk)
+    valid = [
+        (row_id, with_derived_columns(model, values)) for index, row_id, values in chunk if index not in row_errors
+    ]
+    with_ids = [dict(values, id=row_id) for row_id, values in valid if row_id is not None]
+    without_ids = [values for row_id, values in valid if row_id is None]
+    upsert_rows(db, model, with_ids, ("id",))
+    if without_ids:
+        db.execute(insert(model.__table__), without_ids)
+    db.commit()
+    errors = [(index, row_id, row_errors[index]) for index, row_id, _ in chunk if index in row_errors]
+    return len(valid), errors
+
+
+def import_records(db: Session, table: str, records) -> schemas.ImportResult:
+    """Validate and upsert ``(record number, dict)`` pairs chunk by chunk
+
+    Records with an ``id`` replace the row with that id (so an export can be
+    re-imported as is), records without one are inserted. Each chunk is
+    committed on its own, so memory stays flat for any file size; only the
+    first ``IMPORT_MAX_ERRORS`` errors are kept.
+    """
+    model, create_schema, update_schema, _ = BULK_ENTITIES[table]
+    processed = failed = 0
+    errors = []
+
+    def record_errors(found):
+        nonlocal failed
+        failed += len(found)
+        errors.extend(found[:IMPORT_MAX_ERRORS - len(errors)])
+
+    chunk = []
+    for index, record in records:
+        try:
+            row_id, values = _import_values(create_schema, update_schema, record)
+        except ValidationError as exc:
+            record_errors([(index, None, _validation_message(exc))])
+            continue
+        except (ValueError, TypeError) as exc:
+            record_errors([(index, None, str(exc))])
+            continue
+        chunk.append((index, row_id, values))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            written, found = _import_chunk(db, table, chunk)
+            processed += written
+            record_errors(found)
+            chunk = []
+    if chunk:
+        written, found = _import_chunk(db, table, chunk)
+        processed += written
+        record_errors(found)
+    sync_id_sequence(db, model)
+    db.commit()
+    catalog_cache.invalidate(*BULK_INVALIDATES.get(table, (table,)))
+    return schemas.ImportResult(
+        processed=processed,
+        failed=failed,
+        errors=[
+            schemas.BulkError(index=index, id=row_id, error=message) for index, row_id, message in sorted(errors)
+        ],
+    )
+
+
+# Cached public catalog reads
+def _snapshot(rows, schema):
+    """Detach query results from the session as response-schema objects"""
+    page = Page(schema.from_orm(row) for row in rows)
+    page.next_cursor = getattr(rows, "next_cursor", None)
+    return page
+
+
+def get_public_categories(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return catalog_cache.get_or_load(
+        ("categories",),
+        ("categories", skip, limit, cursor),
+        lambda: _snapshot(get_active_categories(db, skip=skip, limit=limit, cursor=cursor), schemas.Category)
+    )
+
+
+def get_public_products(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    # Products embed their category, so category writes invalidate them too
+    return catalog_cache.get_or_load(
+        ("products", "categories"),
+        ("products", skip, limit, cursor),
+        lambda: _snapshot(get_active_products(db, skip=skip, limit=limit, cursor=cursor), schemas.Product)
+    )
+
+
+def get_public_featured_sub_products(db: Session, limit: int = 10):
+    return catalog_cache.get_or_load(
+        ("sub_products",),
+        ("featured_sub_products", limit),
+        lambda: _snapshot(get_featured_sub_products(db, limit=limit), schemas.SubProduct)
+    )
+
+
+def get_public_sub_product_facets(db: Session, **filters):
+    # Category facets read product.category_id and the category names
+    filters = {name: value for name, value in filters.items() if value is not None}
+    return catalog_cache.get_or_load(
+        ("sub_products", "products", "categories"),
+        ("sub_product_facets", tuple(sorted(filters.items()))),
+        lambda: get_sub_product_facets(db, **filters)
+    )
+
+
+def get_public_company_info(db: Session):
+    def load():
+        company_info = get_company_info(db)
+        return schemas.CompanyInfo.from_orm(company_info) if company_info else None
+
+    return catalog_cache.get_or_load(("company_info",), ("company_info",), load)
+
+
+def _catalog_products(products):
+    snapshots = sorted((schemas.CatalogProduct.from_orm(product) for product in products), key=lambda p: p.id)
+    for product in snapshots:
+        product.sub_products.sort(key=lambda sub_product: (sub_product.sort_order or 0, sub_product.id))
+    return snapshots
+
+
+def get_catalog(db: Session, sections=tuple(CATALOG_SECTIONS)):
+    """Active storefront tree, loaded with one query per level"""
+    catalog = schemas.Catalog()
+    if "categories" in sections:
+        # Inactive products/sub-products are filtered inside the eager loads too
+        active_only = (
+            with_loader_criteria(models.Product, models.Product.is_active == True),
+            with_loader_criteria(models.SubProduct, models.SubProduct.is_active == True),
+        )
+        categories = db.query(models.Category).filter(
+            models.Category.is_active == True
+        ).order_by(models.Category.id).options(
+            selectinload(models.Category.products).selectinload(models.Product.sub_products),
+            defaultload(models.Category.products).noload(models.Product.category),
+            *active_only
+        ).all()
+        catalog.categories = []
+        for category in categories:
+            snapshot = schemas.CatalogCategory.from_orm(category)
+            snapshot.products = _catalog_products(category.products)
+            catalog.categories.append(snapshot)
+
+        # Products without a category, or whose category is hidden
+        uncategorized = db.query(models.Product).filter(
+            models.Product.is_active == True,
+            ~models.Product.category.has(models.Category.is_active == True)
+        ).options(
+            selectinload(models.Product.sub_products),
+            *active_only
+        ).all()
+        catalog.uncategorized_products = _catalog_products(uncategorized)
+
+    for section, model, schema in (
+        ("services", models.Service, schemas.Service),
+        ("solutions", models.Solution, schemas.Solution),
+        ("customers", models.Customer, schemas.Customer),
+    ):
+        if section in sections:
+            rows = db.query(model).filter(model.is_active == True).options(
+                *response_loads(schema)
+            ).order_by(model.id).all()
+            setattr(catalog, section, [schema.from_orm(row) for row in rows])
+
+    if "company_info" in sections:
+        company_info = get_company_info(db)
+        catalog.company_info = schemas.CompanyInfo.from_orm(company_info) if company_info else None
+    return catalog
+
+
+def get_public_catalog(db: Session, sections=tuple(CATALOG_SECTIONS), fields=()):
+    """Serialized JSON for /public/catalog, rendered once per cache version"""
+    entities = sorted({entity for section in sections for entity in CATALOG_SECTIONS[section]})
+    return catalog_cache.get_or_load(
+        entities,
+        ("catalog", sections, fields),
+        lambda: get_catalog(db, sections).json(include=include_spec(sections, fields)).encode()
+    )
+
+
+# Public list routes served from plain column rows when FAST_JSON_RESPONSES
+# is on: model, response schema, page order and the cache entities involved
+PUBLIC_ROW_SOURCES = {
+    "categories": (models.Category, schemas.Category, (models.Category.id,), ("categories",)),
+    "products": (models.Product, schemas.Product, (models.Product.id,), ("products", "categories")),
+    # category_id filters through the parent product and its category
+    "sub_products": (
+        models.SubProduct, schemas.SubProduct, SUB_PRODUCT_ORDER, ("sub_products", "products", "categories")
+    ),
+    "services": (models.Service, schemas.Service, (models.Service.id,), ("services", "categories")),
+    "solutions": (models.Solution, schemas.Solution, (models.Solution.id,), ("solutions",)),
+    "customers": (models.Customer, schemas.Customer, (models.Customer.id,), ("customers",)),
+}
+
+
+# Filters of get_public_rows applied by filter_sub_products rather than as
+# plain column equality
+SUB_PRODUCT_LIST_FILTERS = ("product_id", "tag", "min_price", "max_price", "sort", *SUB_PRODUCT_FACETS)
+
+
+def get_public_rows(db: Session, source: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters):
+    """Active rows of a public list as dicts, without ORM or Pydantic objects"""
+    model, schema, order_by, entities = PUBLIC_ROW_SOURCES[source]
+    # Falsy values still filter (a price bound of 0, is_featured=false)
+    filters = {name: value for name, value in filters.items() if value is not None}
+
+    def load():
+        column_filters = dict(filters)
+        list_filters = {name: column_filters.pop(name, None) for name in SUB_PRODUCT_LIST_FILTERS}
+        query = db.query(model).filter(model.is_active == True).filter_by(**column_filters)
+        page_order = order_by
+        if any(value is not None for value in list_filters.values()):
+            query, page_order = filter_sub_products(db, query, **list_filters)
+        return row_page(query, model, schema, page_order, skip, limit, cursor)
+
+    return catalog_cache.get_or_load(
+        entities,
+        ("rows", source, skip, limit, cursor, tuple(sorted(filters.items()))),
+        load
+    )
+
+
+# A per-worker memory backend never hears of the other workers' writes, so a
+# cached signature there would keep answering 304 for changed content
+CACHE_SIGNATURES = shared_across_workers(catalog_cache.backend)
+
+
+def get_table_signature(db: Session, tables):
+    """(row count, latest created_at/updated_at) for each model in tables
+
+    Only changes when rows are inserted, updated or deleted, which makes it a
+    cheap validator for HTTP caching. Cached until a write to any of the
+    tables bumps its catalog cache version, when every worker sees those
+    versions; otherwise read on every request.
+    """
+    def load():
+        return tuple(
+            tuple(db.query(
+                func.count(model.id),
+                func.max(func.coalesce(model.updated_at, model.created_at))
+            ).one())
+            for model in tables
+        )
+
+    if not CACHE_SIGNATURES:
+        return load()
+    names = tuple(model.__tablename__ for model in tables)
+    return catalog_cache.get_or_load(names, ("signature",) + names, load)
@@ -1,17 +1,96 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.metrics import instrument_queries, route_metrics
+from app.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument, pool_stats
 
-engine = create_engine(settings.database_url)
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the configured pool mode"""
+    connect_args = {}
+    if url.startswith("sqlite"):
+        # A request may touch its session from more than one threadpool
+        # worker (dependencies and the route body run separately), which
+        # SQLite rejects unless the same-thread check is relaxed. Sessions
+        # are never shared between concurrent requests, so this is safe.
+        connect_args["check_same_thread"] = False
+        if ":memory:" in url or url.rstrip("/").endswith(":"):
+            return {"connect_args": connect_args}
+
+    options = {"pool_pre_ping": settings.db_pool_pre_ping, "connect_args": connect_args}
+    if settings.db_null_pool:
+        # PgBouncer (transaction pooling) owns the pooling; prepared
+        # statements must not outlive a transaction there.
+        options["poolclass"] = NullPool
+        if is_async and url.startswith("postgresql"):
+            connect_args["statement_cache_size"] = settings.db_statement_cache_size
+            connect_args["prepared_statement_cache_size"] = settings.db_statement_cache_size
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+instrument(engine)
+if settings.metrics_enabled:
+    instrument_queries(engine, route_metrics)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async mode (ASYNC_DATABASE=True): requests get an AsyncSession on asyncpg or
+# aiosqlite instead of holding a threadpool worker for the whole round-trip.
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_database:
+    async_engine = create_async_engine(
+        settings.async_database_url, **engine_options(settings.async_database_url, is_async=True)
+    )
+    instrument(async_engine.sync_engine)
+    if settings.metrics_enabled:
+        instrument_queries(async_engine.sync_engine, route_metrics)
+    AsyncSessionLocal = sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+if settings.async_database:
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+else:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Await a sync crud function against whichever session get_db provided.
+
+    An AsyncSession runs it with ``run_sync`` on the event loop (the driver
+    awaits I/O underneath), a regular Session runs it in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def get_pool_stats() -> dict:
+    stats = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        stats["async"] = pool_stats(async_engine.sync_engine)
+    return stats
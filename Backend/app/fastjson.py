@@ -0,0 +1,101 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query
+
+from app.pagination import Page, paginate, set_next_cursor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_NESTED_SEPARATOR = "__"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON for plain dict/list content; orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_columns(model, schema) -> List[Any]:
+    """Columns of ``model`` needed to render ``schema``.
+
+    Fields that are themselves schemas (e.g. ``Product.category``) are read
+    from the related table as ``<field>__<column>`` labels; the caller is
+    expected to outer-join the relationship.
+    """
+    table_columns = model.__table__.columns
+    columns = []
+    for name, field in schema.__fields__.items():
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+            target = getattr(model, name).property.mapper.class_
+            columns.extend(
+                column.label(f"{name}{_NESTED_SEPARATOR}{column.key}")
+                for column in row_columns(target, field.type_)
+            )
+        elif name in table_columns:
+            columns.append(getattr(model, name))
+    return columns
+
+
+def _nested_fields(schema) -> List[str]:
+    return [
+        name for name, field in schema.__fields__.items()
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+    ]
+
+
+def _row_to_dict(row, nested: Sequence[str]) -> Dict[str, Any]:
+    data = dict(row._mapping)
+    for name in nested:
+        prefix = name + _NESTED_SEPARATOR
+        child = {key[len(prefix):]: data.pop(key) for key in list(data) if key.startswith(prefix)}
+        data[name] = child if child.get("id") is not None else None
+    return data
+
+
+def row_page(
+    query: Query,
+    model,
+    schema,
+    order_by: Sequence,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """Paginate ``query`` selecting only ``schema``'s columns, as plain dicts.
+
+    Skips ORM identity-map hydration and Pydantic validation entirely; the
+    dicts have the same shape ``schema`` would serialize to.
+    """
+    nested = _nested_fields(schema)
+    for name in nested:
+        query = query.outerjoin(getattr(model, name))
+    rows = paginate(query.with_entities(*row_columns(model, schema)), order_by, skip, limit, cursor)
+    page = Page(_row_to_dict(row, nested) for row in rows)
+    page.next_cursor = rows.next_cursor
+    return page
+
+
+def rows_response(response: Response, page: List[Dict[str, Any]]) -> FastJSONResponse:
+    """Render a row page, keeping headers set by dependencies (ETag, cursor)"""
+    set_next_cursor(response, page)
+    return FastJSONResponse(list(page), headers=dict(response.headers))
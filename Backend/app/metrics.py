@@ -0,0 +1,277 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """SQL work done while serving one request"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the middleware for the duration of a request. The threadpool and
+# AsyncSession greenlets run in a copy of the request's context, so the
+# cursor hooks see the same RequestStats object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            yield ("+Inf" if bound == "+Inf" else f"{bound:g}"), total
+
+
+class RouteMetrics:
+    """Per-route latency and queries-per-request histograms, slow statements"""
+
+    def __init__(self, slow_query_seconds: float = 0.2, keep_slow: int = 50):
+        self._lock = threading.Lock()
+        self.slow_query_seconds = slow_query_seconds
+        self.latency: Dict[str, Histogram] = {}
+        self.queries: Dict[str, Histogram] = {}
+        self.db_seconds: Dict[str, float] = defaultdict(float)
+        self.responses: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.slow_queries = 0
+        self.recent_slow: deque = deque(maxlen=keep_slow)
+
+    def observe_request(self, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            if route not in self.latency:
+                self.latency[route] = Histogram(LATENCY_BUCKETS)
+                self.queries[route] = Histogram(QUERY_COUNT_BUCKETS)
+            self.latency[route].observe(seconds)
+            self.queries[route].observe(stats.queries)
+            self.db_seconds[route] += stats.db_seconds
+            self.responses[(route, status)] += 1
+
+    def observe_query(self, statement: str, seconds: float) -> None:
+        if seconds < self.slow_query_seconds:
+            return
+        statement = " ".join(statement.split())
+        with self._lock:
+            self.slow_queries += 1
+            self.recent_slow.append({"seconds": round(seconds, 4), "statement": statement[:500]})
+        logger.warning("slow query (%.1f ms): %s", seconds * 1000, statement[:1000])
+
+    def slow_query_log(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.recent_slow)
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines"""
+        with self._lock:
+            lines = [
+                "# HELP sns_http_requests_total Responses by route and status code",
+                "# TYPE sns_http_requests_total counter",
+            ]
+            lines += [
+                f'sns_http_requests_total{{route="{_escape(route)}",status="{status}"}} {count}'
+                for (route, status), count in sorted(self.responses.items())
+            ]
+            lines += _histogram_lines(
+                "sns_http_request_duration_seconds", "Request latency by route", self.latency
+            )
+            lines += _histogram_lines(
+                "sns_db_queries_per_request", "SQL statements executed per request by route", self.queries
+            )
+            lines += [
+                "# HELP sns_db_query_seconds_total Time spent in SQL statements by route",
+                "# TYPE sns_db_query_seconds_total counter",
+            ]
+            lines += [
+                f'sns_db_query_seconds_total{{route="{_escape(route)}"}} {seconds:.6f}'
+                for route, seconds in sorted(self.db_seconds.items())
+            ]
+            lines += [
+                f"# HELP sns_db_slow_queries_total Statements slower than {self.slow_query_seconds:g}s",
+                "# TYPE sns_db_slow_queries_total counter",
+                f"sns_db_slow_queries_total {self.slow_queries}",
+            ]
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, help_text: str, histograms: Dict[str, Histogram]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for route, histogram in sorted(histograms.items()):
+        label = f'route="{_escape(route)}"'
+        lines += [f'{name}_bucket{{{label},le="{bound}"}} {count}' for bound, count in histogram.cumulative()]
+        lines.append(f"{name}_sum{{{label}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{label}}} {histogram.count}")
+    return lines
+
+
+def _family(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Any]]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in samples]
+    return lines
+
+
+# pool_stats() key -> (metric name, type, help)
+POOL_METRICS = {
+    "in_use": ("sns_db_pool_in_use", "gauge", "Connections checked out"),
+    "checked_in": ("sns_db_pool_idle", "gauge", "Idle connections in the pool"),
+    "overflow": ("sns_db_pool_overflow", "gauge", "Connections open beyond pool_size"),
+    "checkouts": ("sns_db_pool_checkouts_total", "counter", "Connection checkouts"),
+    "checkout_wait_seconds_total": (
+        "sns_db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection"
+    ),
+    "connects": ("sns_db_pool_connects_total", "counter", "New database connections"),
+    "invalidations": ("sns_db_pool_invalidations_total", "counter", "Connections invalidated"),
+}
+
+# catalog cache stats() key -> (metric name, type, help)
+CACHE_METRICS = {
+    "hits": ("sns_catalog_cache_hits_total", "counter", "Catalog cache hits"),
+    "misses": ("sns_catalog_cache_misses_total", "counter", "Catalog cache misses"),
+    "evictions": ("sns_catalog_cache_evictions_total", "counter", "Entries evicted by the LRU"),
+    "expirations": ("sns_catalog_cache_expirations_total", "counter", "Entries dropped by the TTL"),
+    "size": ("sns_catalog_cache_entries", "gauge", "Entries held"),
+    "errors": ("sns_catalog_cache_backend_errors_total", "counter", "Shared cache backend failures"),
+}
+
+
+# compressed body cache stats() key -> (metric name, type, help)
+COMPRESSION_METRICS = {
+    "hits": ("sns_compression_cache_hits_total", "counter", "Compressed bodies served from the cache"),
+    "misses": ("sns_compression_cache_misses_total", "counter", "Bodies compressed and stored"),
+    "size_bytes": ("sns_compression_cache_bytes", "gauge", "Compressed bytes held"),
+}
+
+
+def render_prometheus(
+    metrics: RouteMetrics,
+    pools: Dict[str, Dict[str, Any]],
+    cache: Dict[str, Any],
+    compression: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Route metrics plus pool, catalog cache and compression cache counters as Prometheus text"""
+    lines = metrics.render()
+    for key, (name, kind, help_text) in POOL_METRICS.items():
+        samples = [(f'engine="{engine}"', stats[key]) for engine, stats in sorted(pools.items()) if key in stats]
+        if samples:
+            lines += _family(name, kind, help_text, samples)
+    for key, (name, kind, help_text) in CACHE_METRICS.items():
+        lines += _family(name, kind, help_text, [("", cache[key])])
+    if compression is not None:
+        for key, (name, kind, help_text) in COMPRESSION_METRICS.items():
+            lines += _family(name, kind, help_text, [("", compression[key])])
+    return "\n".join(lines) + "\n"
+
+
+def instrument_queries(engine, metrics: RouteMetrics) -> None:
+    """Time every statement; attribute it to the current request and log slow ones"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        seconds = time.perf_counter() - started
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+        metrics.observe_query(statement, seconds)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route timing and SQL counts.
+
+    Routes are labelled with their path template (``GET /public/products/{product_id}``)
+    so the label set stays bounded; requests that match no route share one
+    label. With ``server_timing`` the response gets a ``Server-Timing``
+    header with the total and SQL time.
+    """
+
+    def __init__(self, app, metrics: RouteMetrics, server_timing: bool = True):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+        self._route_paths: Dict[Any, str] = {}
+
+    def route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            router = scope["app"].router
+            self._route_paths = {
+                getattr(route, "endpoint", None): route.path for route in router.routes if hasattr(route, "path")
+            }
+            path = self._route_paths.get(endpoint, "unmatched")
+        return f"{scope['method']} {path}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    value = (
+                        f'app;dur={elapsed:.1f}, '
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            self.metrics.observe_request(self.route_label(scope), status, time.perf_counter() - started, stats)
+
+
+route_metrics = RouteMetrics(slow_query_seconds=settings.slow_query_threshold_ms / 1000)
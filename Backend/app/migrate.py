@@ -0,0 +1,65 @@
+"""
+Bring the database schema up to date with the Alembic migrations
+
+    python -m app.migrate
+
+Run once per deploy (or let ``run.py --migrate`` do it before the workers
+start); the API itself never creates or alters tables. A database created
+by ``Base.metadata.create_all`` has no ``alembic_version`` table yet: if it
+already matches the models it is stamped at head, otherwise it is taken to
+be the pre-migration schema, stamped ``0001`` and upgraded from there.
+"""
+
+import os
+import sys
+
+from sqlalchemy import inspect
+
+from app.database import Base, engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+BASELINE_REVISION = "0001"
+
+
+def _unversioned_matches_models(connection) -> bool:
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from app import models  # noqa: F401  (registers the tables on Base.metadata)
+
+    return not compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+
+def migrate() -> None:
+    """Stamp a pre-Alembic database if needed, then upgrade to head"""
+    # Alembic is only needed here, so the API process never imports it
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+
+    try:
+        with engine.connect() as connection:
+            tables = set(inspect(connection).get_table_names())
+            if tables and "alembic_version" not in tables:
+                revision = "head" if _unversioned_matches_models(connection) else BASELINE_REVISION
+                print(f"Unversioned schema found, stamping it at {revision}")
+                command.stamp(config, revision)
+
+        command.upgrade(config, "head")
+        # Entries built from the old schema or data must not outlive it in a
+        # shared catalog cache
+        from app.cache import catalog_cache
+        catalog_cache.clear()
+    finally:
+        # run.py calls this before forking workers, which must not inherit
+        # pooled connections
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as exc:
+        print(f"Migration failed: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Numeric, Index, DDL, JSON, event, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
+# JSONB on PostgreSQL (indexable, supports containment), JSON text elsewhere
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -18,6 +22,9 @@ class Admin(Base):
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_active_id", "is_active", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True, nullable=False)
@@ -33,11 +40,14 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_active_id", "is_active", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text)
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    category_id = Column(Integer, ForeignKey("categories.id"), index=True)
     image_url = Column(String(500))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -50,6 +60,27 @@ class Product(Base):
 
 class SubProduct(Base):
     __tablename__ = "sub_products"
+    __table_args__ = (
+        Index("ix_sub_products_active_id", "is_active", "id"),
+        # Public listing: WHERE is_active ORDER BY sort_order, id
+        Index("ix_sub_products_active_order", "is_active", "sort_order", "id"),
+        # Per-product listing (and the product_id foreign key)
+        Index("ix_sub_products_product_active_order", "product_id", "is_active", "sort_order", "name"),
+        # Featured listing, only the handful of featured rows are indexed
+        Index(
+            "ix_sub_products_featured", "sort_order", "name",
+            postgresql_where=text("is_featured AND is_active"),
+            sqlite_where=text("is_featured = 1 AND is_active = 1"),
+        ),
+        # Price listing (min_price bound, sort=price) and the max_price bound
+        Index("ix_sub_products_active_price", "is_active", "price_min", "id"),
+        Index("ix_sub_products_active_price_max", "is_active", "price_max"),
+        # Facet filters on the listing (then sort_order, id) and their grouped counts
+        Index("ix_sub_products_active_brand", "is_active", "brand", "sort_order", "id"),
+        Index("ix_sub_products_active_availability", "is_active", "availability_status", "sort_order", "id"),
+        Index("ix_sub_products_active_currency", "is_active", "currency"),
+        Index("ix_sub_products_active_featured", "is_active", "is_featured"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -60,12 +91,15 @@ class SubProduct(Base):
     sku = Column(String(100), unique=True, index=True)  # Stock Keeping Unit
     brand = Column(String(100))
     model = Column(String(100))
-    specifications = Column(Text)  # JSON string of technical specs
-    features = Column(Text)  # JSON string of features
-    images = Column(Text)  # JSON array of image URLs
+    specifications = Column(JSONType)  # Object of technical specs
+    features = Column(JSONType)  # Array of features
+    images = Column(JSONType)  # Array of image URLs
     
     # Informational pricing (for display only, no actual selling)
     price_range = Column(String(100))  # e.g., "$1000 - $2000"
+    # Derived from price_range on every write (crud.DERIVED_COLUMNS, app.pricing)
+    price_min = Column(Numeric(12, 2, asdecimal=False))
+    price_max = Column(Numeric(12, 2, asdecimal=False))
     currency = Column(String(10), default="USD")
     
     # Additional ecommerce-style info
@@ -76,13 +110,16 @@ class SubProduct(Base):
     datasheet_url = Column(String(500))
     
     # SEO and categorization
-    tags = Column(Text)  # JSON array of tags
+    tags = Column(JSONType)  # Array of tags
     meta_title = Column(String(200))
     meta_description = Column(Text)
     
+    # Full-text search document, maintained by a trigger on PostgreSQL
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+    
     is_active = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
-    sort_order = Column(Integer, default=0)
+    sort_order = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -90,14 +127,54 @@ class SubProduct(Base):
     product = relationship("Product", back_populates="sub_products")
 
 
+# Weighted search document: name ranks above brand/model, which rank above tags
+SUB_PRODUCT_SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION sub_products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.brand, '') || ' ' || coalesce(NEW.model, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.tags::text, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SUB_PRODUCT_SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER sub_products_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, brand, model, tags ON sub_products
+FOR EACH ROW EXECUTE PROCEDURE sub_products_search_vector_update()
+"""
+
+SUB_PRODUCT_SEARCH_VECTOR_INDEX = """
+CREATE INDEX ix_sub_products_search_vector ON sub_products USING gin (search_vector)
+"""
+
+# Serves the ?tag= containment filter (tags @> '["tag"]')
+SUB_PRODUCT_TAGS_INDEX = """
+CREATE INDEX ix_sub_products_tags ON sub_products USING gin (tags jsonb_path_ops)
+"""
+
+for _statement in (
+    SUB_PRODUCT_SEARCH_VECTOR_FUNCTION,
+    SUB_PRODUCT_SEARCH_VECTOR_TRIGGER,
+    SUB_PRODUCT_SEARCH_VECTOR_INDEX,
+    SUB_PRODUCT_TAGS_INDEX,
+):
+    event.listen(SubProduct.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class Service(Base):
     __tablename__ = "services"
+    __table_args__ = (
+        Index("ix_services_active_id", "is_active", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text)
-    category_id = Column(Integer, ForeignKey("categories.id"))
-    features = Column(Text)  # JSON string of features
+    category_id = Column(Integer, ForeignKey("categories.id"), index=True)
+    features = Column(JSONType)  # Array of features
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -108,11 +185,14 @@ class Service(Base):
 
 class Solution(Base):
     __tablename__ = "solutions"
+    __table_args__ = (
+        Index("ix_solutions_active_id", "is_active", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text)
-    features = Column(Text)  # JSON string of features
+    features = Column(JSONType)  # Array of features
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -120,6 +200,9 @@ class Solution(Base):
 
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        Index("ix_customers_active_id", "is_active", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -0,0 +1,130 @@
+import base64
+import json
+import math
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import Date, DateTime, Float, Integer, Numeric, String, and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+class Page(list):
+    """A list of rows that also carries the cursor for the following page"""
+
+    next_cursor: Optional[str] = None
+
+
+class NullsLast:
+    """Sort key for a nullable column: ascending, with NULL after every value"""
+
+    def __init__(self, column):
+        self.column = column
+        self.key = column.key
+
+
+def _order_clause(column):
+    return column.column.asc().nulls_last() if isinstance(column, NullsLast) else column
+
+
+def _seek(order_by: Sequence, values: Sequence[Any]):
+    """Filter for the rows that sort after ``values`` in ``order_by``"""
+    first = order_by[0]
+    if isinstance(first, NullsLast):
+        column = first.column
+        after_ties = _seek(order_by[1:], values[1:])
+        if values[0] is None:
+            return and_(column.is_(None), after_ties)
+        return or_(column > values[0], and_(column == values[0], after_ties), column.is_(None))
+    if len(order_by) == 1:
+        return first > values[0]
+    return tuple_(*order_by) > tuple_(*values)
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """``value`` as a bind parameter for ``column``; raises ValueError on a type mismatch"""
+    if value is None:
+        if isinstance(column, NullsLast):
+            return None
+        raise ValueError("null value for a non-null sort column")
+    column_type = getattr(column, "column", column).type
+    if isinstance(column_type, Integer):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif isinstance(column_type, (Numeric, Float)):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            return value
+    elif isinstance(column_type, DateTime):
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+    elif isinstance(column_type, Date):
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+    elif isinstance(column_type, String):
+        if isinstance(value, str):
+            return value
+    else:
+        return value
+    raise ValueError(f"{value!r} does not match {column_type}")
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_json_value(value) for value in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence) -> List[Any]:
+    """The sort key values of ``cursor``, checked against the ``order_by`` column types"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise InvalidCursor(cursor)
+        return [_cursor_value(column, value) for column, value in zip(order_by, values)]
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def paginate(query: Query, order_by: Sequence, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
+    """Fetch one page of ``query`` ordered by ``order_by``.
+
+    ``order_by`` is the ``(sort_key, ..., id)`` column tuple and must end in a
+    unique, non-null column (wrap a nullable leading key in ``NullsLast``).
+    Without a cursor the classic offset/limit window is used; with a cursor
+    (an empty string means "first page") the query seeks past
+    the last row of the previous page instead, so deep pages cost the same as
+    the first one and concurrent inserts/deletes cannot shift rows between
+    pages.
+    """
+    query = query.order_by(*(_order_clause(column) for column in order_by))
+    if cursor is None:
+        return Page(query.offset(skip).limit(limit).all())
+
+    if cursor:
+        query = query.filter(_seek(order_by, decode_cursor(cursor, order_by)))
+
+    # One extra row tells whether a next page exists, so a page that happens
+    # to end exactly at the last row does not hand out a cursor to nothing
+    rows = query.limit(limit + 1).all()
+    page = Page(rows[:limit])
+    if len(rows) > limit and page:
+        last = page[-1]
+        page.next_cursor = encode_cursor([getattr(last, column.key) for column in order_by])
+    return page
+
+
+def set_next_cursor(response: Response, page: List[Any]) -> None:
+    """Expose the next-page cursor of a keyset page as a response header"""
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
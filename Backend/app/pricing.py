@@ -0,0 +1,100 @@
+"""
+Numeric bounds of the free-text ``price_range`` shown on sub products
+
+``parse_price_range`` is the single parser behind the indexed
+``price_min``/``price_max`` columns: crud derives them from it on every
+write (migration 0006 keeps a frozen copy for its backfill, so changes
+here need a new revision to reach existing rows). A number only counts when it
+sits next to a currency marker ("$300", "1,000 USD", "৳1,00,000") or forms
+an explicit range ("1 000 - 2 000"); quantities, percentages and model
+numbers around it are ignored. Text it cannot read unambiguously gets no
+bounds rather than a guess.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+CURRENCY = r"(?:[$৳€£₹]|(?<![A-Za-z])(?:usd|bdt|tk|taka|eur|gbp|inr|rs)(?![A-Za-z])\.?)"
+CURRENCY_BEFORE = re.compile(CURRENCY + r"\s*$", re.IGNORECASE)
+CURRENCY_AFTER = re.compile(r"^\s*" + CURRENCY, re.IGNORECASE)
+CURRENCY_ANYWHERE = re.compile(CURRENCY, re.IGNORECASE)
+
+# 1,000,000 | 1,00,000 (lakh grouping) | 1 000 000 | 1000, with decimals
+# and an optional k/m multiplier glued to it
+AMOUNT = re.compile(
+    r"(?<![\d.,])"
+    r"(?P<number>(?:\d{1,3}(?:,\d{3})+(?!\d)|\d{1,3}(?:,\d{2})+,\d{3}(?!\d)|\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?!\d)|\d+)"
+    r"(?:\.\d+)?)"
+    r"(?P<suffix>[km](?![a-z]))?",
+    re.IGNORECASE,
+)
+MULTIPLIERS = {"k": 1000, "m": 1000000}
+RANGE_SEPARATOR = re.compile(r"^\s*(?:-|–|—|to)\s*$", re.IGNORECASE)
+OPEN_UPPER_PREFIXES = ("from", "starting", "over", "above", "min")
+OPEN_LOWER_PREFIXES = ("up to", "under", "below", "less than", "max")
+# price_min/price_max are NUMERIC(12, 2)
+MAX_AMOUNT = 10 ** 10
+
+
+class _Amount(NamedTuple):
+    value: float
+    start: int
+    end: int
+    marked: bool
+
+
+def _amounts(text: str) -> List[_Amount]:
+    amounts = []
+    for match in AMOUNT.finditer(text):
+        before, after = text[:match.start()], text[match.end():]
+        if before[-1:].isalpha() and not CURRENCY_BEFORE.search(before):
+            continue  # part of a model code such as "X200"
+        if after.lstrip().startswith("%"):
+            continue
+        number = re.sub(r"[, \u00a0\u202f]", "", match.group("number"))
+        suffix = (match.group("suffix") or "").lower()
+        value = round(float(number) * MULTIPLIERS.get(suffix, 1), 2)
+        marked = bool(CURRENCY_BEFORE.search(before) or CURRENCY_AFTER.match(after))
+        amounts.append(_Amount(value, match.start(), match.end(), marked))
+    return amounts
+
+
+def parse_price_range(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """(lowest, highest) amount of a display price such as "$1,000 - $2,000"
+
+    A single priced amount is both bounds, except "from $500" or "$500+" (no
+    upper bound) and "up to $500" (no lower bound). Several amounts that do
+    not form one range, no amount at all ("Contact us"), or an amount too
+    large for the price columns give (None, None).
+    """
+    low, high = _parse(text)
+    if any(value is not None and value >= MAX_AMOUNT for value in (low, high)):
+        return None, None
+    return low, high
+
+
+def _parse(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    if not text:
+        return None, None
+    amounts = _amounts(text)
+    ranges = [
+        (first, second) for first, second in zip(amounts, amounts[1:])
+        if RANGE_SEPARATOR.match(CURRENCY_ANYWHERE.sub("", text[first.end:second.start]))
+    ]
+    marked = [amount for amount in amounts if amount.marked]
+
+    if len(ranges) == 1:
+        first, second = ranges[0]
+        if all(amount in (first, second) for amount in marked):
+            return min(first.value, second.value), max(first.value, second.value)
+        return None, None
+    if ranges or len({amount.value for amount in marked}) != 1:
+        return None, None
+
+    amount = marked[0]
+    phrase = text.strip().lower()
+    if text[amount.end:].startswith("+") or phrase.endswith("+") or phrase.startswith(OPEN_UPPER_PREFIXES):
+        return amount.value, None
+    if phrase.startswith(OPEN_LOWER_PREFIXES):
+        return None, amount.value
+    return amount.value, amount.value
@@ -0,0 +1,44 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Hashable, Optional
+
+
+class SlidingWindowLimiter:
+    """Allow at most ``max_attempts`` per key within ``window`` seconds.
+
+    Keys are tracked in LRU order and capped at ``max_keys`` so a flood of
+    distinct usernames or addresses cannot grow memory without bound.
+    """
+
+    def __init__(self, max_attempts: int, window: float, max_keys: int = 10000):
+        self.max_attempts = max_attempts
+        self.window = window
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[Hashable, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def hit(self, key: Hashable) -> Optional[float]:
+        """Record an attempt; return seconds until retry if it is over the limit"""
+        if self.max_attempts <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque()
+            self._attempts.move_to_end(key)
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            if len(attempts) >= self.max_attempts:
+                self.rejected += 1
+                return attempts[0] + self.window - now
+            attempts.append(now)
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        return None
+
+    def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
@@ -0,0 +1,123 @@
+"""
+Minimal blocking Redis (RESP2) client for the shared catalog cache
+
+Speaks just enough of the protocol for the handful of commands the cache
+needs (GET, SET, MGET, INCR, ...), with pipelining, AUTH/SELECT from the
+URL and TLS for ``rediss://``. One connection per thread; a broken
+connection is dropped and reopened on the next command.
+"""
+
+import socket
+import ssl
+import threading
+from typing import Any, List, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+
+class RespError(Exception):
+    """An error reply from the server, or a connection that failed mid-reply"""
+
+
+def encode_command(args: Sequence[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif isinstance(arg, int):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def read_reply(stream) -> Any:
+    line = stream.readline()
+    if not line.endswith(b"\r\n"):
+        raise RespError("connection closed")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        size = int(payload)
+        if size < 0:
+            return None
+        data = stream.read(size + 2)
+        if len(data) != size + 2:
+            raise RespError("connection closed")
+        return data[:-2]
+    if kind == b"*":
+        size = int(payload)
+        return None if size < 0 else [read_reply(stream) for _ in range(size)]
+    raise RespError(f"unexpected reply {line!r}")
+
+
+class RedisClient:
+    """``redis://[[user]:password@]host[:port][/db]`` (``rediss://`` for TLS)"""
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"not a redis URL: {url!r}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.tls = parsed.scheme == "rediss"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        stream = sock.makefile("rwb")
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for command in setup:
+            stream.write(encode_command(command))
+        stream.flush()
+        for _ in setup:
+            reply = read_reply(stream)
+            if isinstance(reply, RespError):
+                sock.close()
+                raise reply
+        return sock, stream
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Send every command in one write and return their replies in order"""
+        connection = getattr(self._local, "connection", None)
+        try:
+            if connection is None:
+                connection = self._local.connection = self._connect()
+            sock, stream = connection
+            stream.write(b"".join(encode_command(command) for command in commands))
+            stream.flush()
+            replies = [read_reply(stream) for _ in commands]
+        except (OSError, RespError):
+            self.close()
+            raise
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *args: Any) -> Any:
+        return self.pipeline([args])[0]
+
+    def close(self) -> None:
+        """Drop this thread's connection"""
+        connection: Optional[tuple] = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection[0].close()
+            except OSError:
+                pass
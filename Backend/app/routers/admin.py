@@ -1,48 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app import crud, models, schemas
-from app.auth import get_current_admin
+from typing import List, Optional
+from app.database import get_db, get_pool_stats, run_db
+from app.pagination import set_next_cursor
+from app import crud, models, schemas, transfer
+from app.auth import get_current_admin, password_hasher
+from app.cache import catalog_cache
+from app.compression import compressed_body_cache
+from app.metrics import route_metrics
+from app.routers.auth import ip_limiter, username_limiter
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
 
 
+# Bulk endpoints (declared first so /{entity}/bulk is not taken for an id)
+@router.post("/{entity}/bulk", response_model=schemas.BulkResult)
+async def bulk_create(entity: schemas.BulkEntity, payload: schemas.BulkWrite, db: Session = Depends(get_db)):
+    return await run_db(db, crud.bulk_create, table=entity.name, items=payload.items, atomic=payload.atomic)
+
+
+@router.put("/{entity}/bulk", response_model=schemas.BulkResult)
+async def bulk_update(entity: schemas.BulkEntity, payload: schemas.BulkWrite, db: Session = Depends(get_db)):
+    return await run_db(db, crud.bulk_update, table=entity.name, items=payload.items, atomic=payload.atomic)
+
+
+@router.delete("/{entity}/bulk", response_model=schemas.BulkResult)
+async def bulk_delete(entity: schemas.BulkEntity, payload: schemas.BulkDelete, db: Session = Depends(get_db)):
+    return await run_db(db, crud.bulk_delete, table=entity.name, ids=payload.ids, atomic=payload.atomic)
+
+
+# Import / export endpoints
+@router.get("/export/{entity}")
+def export_entity(entity: schemas.BulkEntity, format: schemas.TransferFormat = schemas.TransferFormat.ndjson):
+    return StreamingResponse(
+        transfer.export_rows(entity.name, format),
+        media_type=transfer.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{format.value}"'},
+    )
+
+
+@router.post("/import/{entity}", response_model=schemas.ImportResult)
+async def import_entity(
+    entity: schemas.BulkEntity,
+    file: UploadFile = File(...),
+    format: Optional[schemas.TransferFormat] = None,
+):
+    format = format or transfer.detect_format(file.filename)
+    if format is None:
+        raise HTTPException(status_code=400, detail="Pass format=ndjson or format=csv")
+    return await run_in_threadpool(transfer.import_file, entity.name, file.file, format)
+
+
 # Category endpoints
 @router.get("/categories", response_model=List[schemas.Category])
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    categories = crud.get_categories(db, skip=skip, limit=limit)
+async def read_categories(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    categories = await run_db(db, crud.get_categories, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, categories)
     return categories
 
 
 @router.post("/categories", response_model=schemas.Category)
-def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
-    return crud.create_category(db=db, category=category)
+async def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
+    return await run_db(db, crud.create_category, category=category)
 
 
 @router.get("/categories/{category_id}", response_model=schemas.Category)
-def read_category(category_id: int, db: Session = Depends(get_db)):
-    db_category = crud.get_category(db, category_id=category_id)
+async def read_category(category_id: int, db: Session = Depends(get_db)):
+    db_category = await run_db(db, crud.get_category, category_id=category_id)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     return db_category
 
 
 @router.put("/categories/{category_id}", response_model=schemas.Category)
-def update_category(
+async def update_category(
     category_id: int, 
     category_update: schemas.CategoryUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_category = crud.update_category(db, category_id=category_id, category_update=category_update)
+    db_category = await run_db(db, crud.update_category, category_id=category_id, category_update=category_update)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     return db_category
 
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    db_category = crud.delete_category(db, category_id=category_id)
+async def delete_category(category_id: int, db: Session = Depends(get_db)):
+    db_category = await run_db(db, crud.delete_category, category_id=category_id)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     return {"message": "Category deleted successfully"}
@@ -50,39 +102,46 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
 
 # Product endpoints
 @router.get("/products", response_model=List[schemas.Product])
-def read_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    products = crud.get_products(db, skip=skip, limit=limit)
+async def read_products(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    products = await run_db(db, crud.get_products, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, products)
     return products
 
 
 @router.post("/products", response_model=schemas.Product)
-def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
-    return crud.create_product(db=db, product=product)
+async def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
+    return await run_db(db, crud.create_product, product=product)
 
 
 @router.get("/products/{product_id}", response_model=schemas.Product)
-def read_product(product_id: int, db: Session = Depends(get_db)):
-    db_product = crud.get_product(db, product_id=product_id)
+async def read_product(product_id: int, db: Session = Depends(get_db)):
+    db_product = await run_db(db, crud.get_product, product_id=product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
 
 
 @router.put("/products/{product_id}", response_model=schemas.Product)
-def update_product(
+async def update_product(
     product_id: int, 
     product_update: schemas.ProductUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_product = crud.update_product(db, product_id=product_id, product_update=product_update)
+    db_product = await run_db(db, crud.update_product, product_id=product_id, product_update=product_update)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
 
 
 @router.delete("/products/{product_id}")
-def delete_product(product_id: int, db: Session = Depends(get_db)):
-    db_product = crud.delete_product(db, product_id=product_id)
+async def delete_product(product_id: int, db: Session = Depends(get_db)):
+    db_product = await run_db(db, crud.delete_product, product_id=product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return {"message": "Product deleted successfully"}
@@ -90,83 +149,88 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
 
 # SubProduct endpoints
 @router.get("/sub-products", response_model=List[schemas.SubProduct])
-def read_sub_products(
+async def read_sub_products(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     product_id: int = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    sub_products = crud.get_sub_products(db, skip=skip, limit=limit, product_id=product_id)
+    sub_products = await run_db(
+        db, crud.get_sub_products, skip=skip, limit=limit, product_id=product_id, cursor=cursor
+    )
+    set_next_cursor(response, sub_products)
     return sub_products
 
 
 @router.get("/products/{product_id}/sub-products", response_model=List[schemas.SubProduct])
-def read_sub_products_by_product(product_id: int, db: Session = Depends(get_db)):
+async def read_sub_products_by_product(product_id: int, db: Session = Depends(get_db)):
     # Verify product exists
-    db_product = crud.get_product(db, product_id=product_id)
+    db_product = await run_db(db, crud.get_product, product_id=product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    sub_products = crud.get_sub_products_by_product(db, product_id=product_id)
+    sub_products = await run_db(db, crud.get_sub_products_by_product, product_id=product_id)
     return sub_products
 
 
 @router.get("/sub-products/featured", response_model=List[schemas.SubProduct])
-def read_featured_sub_products(limit: int = 10, db: Session = Depends(get_db)):
-    sub_products = crud.get_featured_sub_products(db, limit=limit)
+async def read_featured_sub_products(limit: int = 10, db: Session = Depends(get_db)):
+    sub_products = await run_db(db, crud.get_featured_sub_products, limit=limit)
     return sub_products
 
 
 @router.get("/sub-products/search", response_model=List[schemas.SubProduct])
-def search_sub_products(
+async def search_sub_products(
     q: str, 
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db)
 ):
-    sub_products = crud.search_sub_products(db, query=q, skip=skip, limit=limit)
+    sub_products = await run_db(db, crud.search_sub_products, query=q, skip=skip, limit=limit)
     return sub_products
 
 
 @router.post("/sub-products", response_model=schemas.SubProduct)
-def create_sub_product(sub_product: schemas.SubProductCreate, db: Session = Depends(get_db)):
+async def create_sub_product(sub_product: schemas.SubProductCreate, db: Session = Depends(get_db)):
     # Verify product exists
-    db_product = crud.get_product(db, product_id=sub_product.product_id)
+    db_product = await run_db(db, crud.get_product, product_id=sub_product.product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return crud.create_sub_product(db=db, sub_product=sub_product)
+    return await run_db(db, crud.create_sub_product, sub_product=sub_product)
 
 
 @router.get("/sub-products/{sub_product_id}", response_model=schemas.SubProduct)
-def read_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
-    db_sub_product = crud.get_sub_product(db, sub_product_id=sub_product_id)
+async def read_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
+    db_sub_product = await run_db(db, crud.get_sub_product, sub_product_id=sub_product_id)
     if db_sub_product is None:
         raise HTTPException(status_code=404, detail="SubProduct not found")
     return db_sub_product
 
 
 @router.put("/sub-products/{sub_product_id}", response_model=schemas.SubProduct)
-def update_sub_product(
+async def update_sub_product(
     sub_product_id: int, 
     sub_product_update: schemas.SubProductUpdate, 
     db: Session = Depends(get_db)
 ):
     # If product_id is being updated, verify the new product exists
     if sub_product_update.product_id is not None:
-        db_product = crud.get_product(db, product_id=sub_product_update.product_id)
+        db_product = await run_db(db, crud.get_product, product_id=sub_product_update.product_id)
         if db_product is None:
             raise HTTPException(status_code=404, detail="Product not found")
     
-    db_sub_product = crud.update_sub_product(db, sub_product_id=sub_product_id, sub_product_update=sub_product_update)
+    db_sub_product = await run_db(db, crud.update_sub_product, sub_product_id=sub_product_id, sub_product_update=sub_product_update)
     if db_sub_product is None:
         raise HTTPException(status_code=404, detail="SubProduct not found")
     return db_sub_product
 
 
 @router.delete("/sub-products/{sub_product_id}")
-def delete_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
-    db_sub_product = crud.delete_sub_product(db, sub_product_id=sub_product_id)
+async def delete_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
+    db_sub_product = await run_db(db, crud.delete_sub_product, sub_product_id=sub_product_id)
     if db_sub_product is None:
         raise HTTPException(status_code=404, detail="SubProduct not found")
     return {"message": "SubProduct deleted successfully"}
@@ -174,39 +238,46 @@ def delete_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
 
 # Service endpoints
 @router.get("/services", response_model=List[schemas.Service])
-def read_services(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    services = crud.get_services(db, skip=skip, limit=limit)
+async def read_services(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    services = await run_db(db, crud.get_services, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, services)
     return services
 
 
 @router.post("/services", response_model=schemas.Service)
-def create_service(service: schemas.ServiceCreate, db: Session = Depends(get_db)):
-    return crud.create_service(db=db, service=service)
+async def create_service(service: schemas.ServiceCreate, db: Session = Depends(get_db)):
+    return await run_db(db, crud.create_service, service=service)
 
 
 @router.get("/services/{service_id}", response_model=schemas.Service)
-def read_service(service_id: int, db: Session = Depends(get_db)):
-    db_service = crud.get_service(db, service_id=service_id)
+async def read_service(service_id: int, db: Session = Depends(get_db)):
+    db_service = await run_db(db, crud.get_service, service_id=service_id)
     if db_service is None:
         raise HTTPException(status_code=404, detail="Service not found")
     return db_service
 
 
 @router.put("/services/{service_id}", response_model=schemas.Service)
-def update_service(
+async def update_service(
     service_id: int, 
     service_update: schemas.ServiceUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_service = crud.update_service(db, service_id=service_id, service_update=service_update)
+    db_service = await run_db(db, crud.update_service, service_id=service_id, service_update=service_update)
     if db_service is None:
         raise HTTPException(status_code=404, detail="Service not found")
     return db_service
 
 
 @router.delete("/services/{service_id}")
-def delete_service(service_id: int, db: Session = Depends(get_db)):
-    db_service = crud.delete_service(db, service_id=service_id)
+async def delete_service(service_id: int, db: Session = Depends(get_db)):
+    db_service = await run_db(db, crud.delete_service, service_id=service_id)
     if db_service is None:
         raise HTTPException(status_code=404, detail="Service not found")
     return {"message": "Service deleted successfully"}
@@ -214,39 +285,46 @@ def delete_service(service_id: int, db: Session = Depends(get_db)):
 
 # Solution endpoints
 @router.get("/solutions", response_model=List[schemas.Solution])
-def read_solutions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    solutions = crud.get_solutions(db, skip=skip, limit=limit)
+async def read_solutions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    solutions = await run_db(db, crud.get_solutions, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, solutions)
     return solutions
 
 
 @router.post("/solutions", response_model=schemas.Solution)
-def create_solution(solution: schemas.SolutionCreate, db: Session = Depends(get_db)):
-    return crud.create_solution(db=db, solution=solution)
+async def create_solution(solution: schemas.SolutionCreate, db: Session = Depends(get_db)):
+    return await run_db(db, crud.create_solution, solution=solution)
 
 
 @router.get("/solutions/{solution_id}", response_model=schemas.Solution)
-def read_solution(solution_id: int, db: Session = Depends(get_db)):
-    db_solution = crud.get_solution(db, solution_id=solution_id)
+async def read_solution(solution_id: int, db: Session = Depends(get_db)):
+    db_solution = await run_db(db, crud.get_solution, solution_id=solution_id)
     if db_solution is None:
         raise HTTPException(status_code=404, detail="Solution not found")
     return db_solution
 
 
 @router.put("/solutions/{solution_id}", response_model=schemas.Solution)
-def update_solution(
+async def update_solution(
     solution_id: int, 
     solution_update: schemas.SolutionUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_solution = crud.update_solution(db, solution_id=solution_id, solution_update=solution_update)
+    db_solution = await run_db(db, crud.update_solution, solution_id=solution_id, solution_update=solution_update)
     if db_solution is None:
         raise HTTPException(status_code=404, detail="Solution not found")
     return db_solution
 
 
 @router.delete("/solutions/{solution_id}")
-def delete_solution(solution_id: int, db: Session = Depends(get_db)):
-    db_solution = crud.delete_solution(db, solution_id=solution_id)
+async def delete_solution(solution_id: int, db: Session = Depends(get_db)):
+    db_solution = await run_db(db, crud.delete_solution, solution_id=solution_id)
     if db_solution is None:
         raise HTTPException(status_code=404, detail="Solution not found")
     return {"message": "Solution deleted successfully"}
@@ -254,39 +332,46 @@ def delete_solution(solution_id: int, db: Session = Depends(get_db)):
 
 # Customer endpoints
 @router.get("/customers", response_model=List[schemas.Customer])
-def read_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    customers = crud.get_customers(db, skip=skip, limit=limit)
+async def read_customers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    customers = await run_db(db, crud.get_customers, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, customers)
     return customers
 
 
 @router.post("/customers", response_model=schemas.Customer)
-def create_customer(customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
-    return crud.create_customer(db=db, customer=customer)
+async def create_customer(customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
+    return await run_db(db, crud.create_customer, customer=customer)
 
 
 @router.get("/customers/{customer_id}", response_model=schemas.Customer)
-def read_customer(customer_id: int, db: Session = Depends(get_db)):
-    db_customer = crud.get_customer(db, customer_id=customer_id)
+async def read_customer(customer_id: int, db: Session = Depends(get_db)):
+    db_customer = await run_db(db, crud.get_customer, customer_id=customer_id)
     if db_customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     return db_customer
 
 
 @router.put("/customers/{customer_id}", response_model=schemas.Customer)
-def update_customer(
+async def update_customer(
     customer_id: int, 
     customer_update: schemas.CustomerUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_customer = crud.update_customer(db, customer_id=customer_id, customer_update=customer_update)
+    db_customer = await run_db(db, crud.update_customer, customer_id=customer_id, customer_update=customer_update)
     if db_customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     return db_customer
 
 
 @router.delete("/customers/{customer_id}")
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    db_customer = crud.delete_customer(db, customer_id=customer_id)
+async def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+    db_customer = await run_db(db, crud.delete_customer, customer_id=customer_id)
     if db_customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     return {"message": "Customer deleted successfully"}
@@ -294,19 +379,36 @@ def delete_customer(customer_id: int, db: Session = Depends(get_db)):
 
 # Company Info endpoints
 @router.get("/company-info", response_model=schemas.CompanyInfo)
-def read_company_info(db: Session = Depends(get_db)):
-    company_info = crud.get_company_info(db)
+async def read_company_info(db: Session = Depends(get_db)):
+    company_info = await run_db(db, crud.get_company_info)
     if company_info is None:
         raise HTTPException(status_code=404, detail="Company info not found")
     return company_info
 
 
 @router.put("/company-info", response_model=schemas.CompanyInfo)
-def update_company_info(
+async def update_company_info(
     company_info_update: schemas.CompanyInfoUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_company_info = crud.update_company_info(db, company_info_update=company_info_update)
+    db_company_info = await run_db(db, crud.update_company_info, company_info_update=company_info_update)
     if db_company_info is None:
         raise HTTPException(status_code=404, detail="Company info not found")
-    return db_company_info
\ No newline at end of file
+    return db_company_info
+
+
+# Monitoring endpoints
+@router.get("/metrics")
+async def read_metrics():
+    return {
+        "catalog_cache": catalog_cache.stats(),
+        "compression_cache": compressed_body_cache.stats(),
+        "db_pool": get_pool_stats(),
+        "login": {
+            "password_hash_pending": password_hasher.pending,
+            "password_hash_rejected": password_hasher.rejected,
+            "throttled_by_ip": ip_limiter.rejected,
+            "throttled_by_username": username_limiter.rejected,
+        },
+        "slow_queries": route_metrics.slow_query_log(),
+    }
@@ -1,27 +1,53 @@
+import math
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import schemas
-from app.auth import authenticate_admin, create_access_token
+from app.auth import PasswordHasherBusy, authenticate_admin, create_access_token
 from app.config import settings
+from app.ratelimit import SlidingWindowLimiter
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+ip_limiter = SlidingWindowLimiter(settings.login_attempts_per_ip, settings.login_attempt_window_seconds)
+username_limiter = SlidingWindowLimiter(settings.login_attempts_per_username, settings.login_attempt_window_seconds)
 
-@router.post("/login", response_model=schemas.Token)
-def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
-):
-    admin = authenticate_admin(db, form_data.username, form_data.password)
+
+def _too_many_attempts(retry_after: float):
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def _login(request: Request, db: Session, username: str, password: str):
+    # Throttle before any bcrypt work so floods cost almost nothing
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = ip_limiter.hit(client_ip)
+    if retry_after is not None:
+        raise _too_many_attempts(retry_after)
+    retry_after = username_limiter.hit(username.lower())
+    if retry_after is not None:
+        raise _too_many_attempts(retry_after)
+
+    try:
+        admin = await authenticate_admin(db, username, password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login is temporarily busy, try again shortly",
+            headers={"Retry-After": "1"},
+        )
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    username_limiter.reset(username.lower())
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": admin.username}, expires_delta=access_token_expires
@@ -29,20 +55,19 @@ def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/login", response_model=schemas.Token)
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
+    return await _login(request, db, form_data.username, form_data.password)
+
+
 @router.post("/login-json", response_model=schemas.Token)
-def login_with_json(
+async def login_with_json(
+    request: Request,
     login_data: schemas.LoginRequest,
     db: Session = Depends(get_db)
 ):
-    admin = authenticate_admin(db, login_data.username, login_data.password)
-    if not admin:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": admin.username}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return await _login(request, db, login_data.username, login_data.password)
@@ -1,95 +1,266 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app import crud, schemas
+from typing import List, Optional
+from app.database import get_db, run_db
+from app.catalog import parse_fields, parse_sections
+from app.pagination import set_next_cursor
+from app import crud, models, schemas
+from app.conditional import validators
+from app.fastjson import rows_response
 from app.config import settings
 
 router = APIRouter(prefix="/public", tags=["public"])
 
 
-@router.get("/categories", response_model=List[schemas.Category])
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    categories = crud.get_categories(db, skip=skip, limit=limit)
-    return [cat for cat in categories if cat.is_active]
+@router.get(
+    "/categories",
+    response_model=List[schemas.Category],
+    dependencies=[Depends(validators(models.Category))]
+)
+async def read_categories(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    if settings.fast_json_responses:
+        rows = await run_db(db, crud.get_public_rows, "categories", skip=skip, limit=limit, cursor=cursor)
+        return rows_response(response, rows)
+    categories = await run_db(db, crud.get_public_categories, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, categories)
+    return categories
 
 
-@router.get("/products", response_model=List[schemas.Product])
-def read_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    products = crud.get_products(db, skip=skip, limit=limit)
-    return [prod for prod in products if prod.is_active]
+@router.get(
+    "/products",
+    response_model=List[schemas.Product],
+    dependencies=[Depends(validators(models.Product, models.Category))]
+)
+async def read_products(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    if settings.fast_json_responses:
+        rows = await run_db(db, crud.get_public_rows, "products", skip=skip, limit=limit, cursor=cursor)
+        return rows_response(response, rows)
+    products = await run_db(db, crud.get_public_products, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, products)
+    return products
 
 
-@router.get("/sub-products", response_model=List[schemas.SubProduct])
-def read_sub_products(
+def sub_product_filters(
+    product_id: int = None,
+    tag: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    brand: Optional[str] = None,
+    availability_status: Optional[str] = None,
+    currency: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    category_id: Optional[int] = None,
+):
+    """Filter query parameters shared by the sub product list and its facets"""
+    return dict(
+        product_id=product_id, tag=tag, min_price=min_price, max_price=max_price, brand=brand,
+        availability_status=availability_status, currency=currency, is_featured=is_featured,
+        category_id=category_id,
+    )
+
+
+@router.get(
+    "/sub-products",
+    response_model=List[schemas.SubProduct],
+    dependencies=[Depends(validators(models.SubProduct, models.Product, models.Category))]
+)
+async def read_sub_products(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
-    product_id: int = None,
+    sort: Optional[schemas.SubProductSort] = None,
+    cursor: Optional[str] = None,
+    filters: dict = Depends(sub_product_filters),
     db: Session = Depends(get_db)
 ):
-    sub_products = crud.get_sub_products(db, skip=skip, limit=limit, product_id=product_id)
-    return [sub_prod for sub_prod in sub_products if sub_prod.is_active]
+    filters = dict(filters, sort=sort)
+    if settings.fast_json_responses:
+        rows = await run_db(
+            db, crud.get_public_rows, "sub_products", skip=skip, limit=limit, cursor=cursor, **filters
+        )
+        return rows_response(response, rows)
+    sub_products = await run_db(
+        db, crud.get_active_sub_products, skip=skip, limit=limit, cursor=cursor, **filters
+    )
+    set_next_cursor(response, sub_products)
+    return sub_products
 
 
-@router.get("/products/{product_id}/sub-products", response_model=List[schemas.SubProduct])
-def read_sub_products_by_product(product_id: int, db: Session = Depends(get_db)):
-    sub_products = crud.get_sub_products_by_product(db, product_id=product_id)
+@router.get(
+    "/products/{product_id}/sub-products",
+    response_model=List[schemas.SubProduct],
+    dependencies=[Depends(validators(models.SubProduct))]
+)
+async def read_sub_products_by_product(product_id: int, db: Session = Depends(get_db)):
+    sub_products = await run_db(db, crud.get_sub_products_by_product, product_id=product_id)
     return sub_products
 
 
-@router.get("/sub-products/featured", response_model=List[schemas.SubProduct])
-def read_featured_sub_products(limit: int = 10, db: Session = Depends(get_db)):
-    sub_products = crud.get_featured_sub_products(db, limit=limit)
+@router.get(
+    "/sub-products/featured",
+    response_model=List[schemas.SubProduct],
+    dependencies=[Depends(validators(models.SubProduct))]
+)
+async def read_featured_sub_products(limit: int = 10, db: Session = Depends(get_db)):
+    sub_products = await run_db(db, crud.get_public_featured_sub_products, limit=limit)
     return sub_products
 
 
-@router.get("/sub-products/search", response_model=List[schemas.SubProduct])
-def search_sub_products(
+@router.get(
+    "/sub-products/facets",
+    response_model=schemas.SubProductFacets,
+    dependencies=[Depends(validators(models.SubProduct, models.Product, models.Category))]
+)
+async def read_sub_product_facets(
+    filters: dict = Depends(sub_product_filters),
+    db: Session = Depends(get_db)
+):
+    return await run_db(db, crud.get_public_sub_product_facets, **filters)
+
+
+@router.get(
+    "/sub-products/search",
+    response_model=List[schemas.SubProduct],
+    dependencies=[Depends(validators(models.SubProduct))]
+)
+async def search_sub_products(
     q: str, 
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db)
 ):
-    sub_products = crud.search_sub_products(db, query=q, skip=skip, limit=limit)
+    sub_products = await run_db(db, crud.search_sub_products, query=q, skip=skip, limit=limit)
     return sub_products
 
 
-@router.get("/sub-products/{sub_product_id}", response_model=schemas.SubProduct)
-def read_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
-    db_sub_product = crud.get_sub_product(db, sub_product_id=sub_product_id)
+@router.get(
+    "/sub-products/{sub_product_id}",
+    response_model=schemas.SubProduct,
+    dependencies=[Depends(validators(models.SubProduct))]
+)
+async def read_sub_product(sub_product_id: int, db: Session = Depends(get_db)):
+    db_sub_product = await run_db(db, crud.get_sub_product, sub_product_id=sub_product_id)
     if db_sub_product is None or not db_sub_product.is_active:
         raise HTTPException(status_code=404, detail="SubProduct not found")
     return db_sub_product
 
 
-@router.get("/services", response_model=List[schemas.Service])
-def read_services(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    services = crud.get_services(db, skip=skip, limit=limit)
-    return [serv for serv in services if serv.is_active]
+@router.get(
+    "/services",
+    response_model=List[schemas.Service],
+    dependencies=[Depends(validators(models.Service, models.Category))]
+)
+async def read_services(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    if settings.fast_json_responses:
+        rows = await run_db(db, crud.get_public_rows, "services", skip=skip, limit=limit, cursor=cursor)
+        return rows_response(response, rows)
+    services = await run_db(db, crud.get_active_services, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, services)
+    return services
 
 
-@router.get("/solutions", response_model=List[schemas.Solution])
-def read_solutions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    solutions = crud.get_solutions(db, skip=skip, limit=limit)
-    return [sol for sol in solutions if sol.is_active]
+@router.get(
+    "/solutions",
+    response_model=List[schemas.Solution],
+    dependencies=[Depends(validators(models.Solution))]
+)
+async def read_solutions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    if settings.fast_json_responses:
+        rows = await run_db(db, crud.get_public_rows, "solutions", skip=skip, limit=limit, cursor=cursor)
+        return rows_response(response, rows)
+    solutions = await run_db(db, crud.get_active_solutions, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, solutions)
+    return solutions
 
 
-@router.get("/customers", response_model=List[schemas.Customer])
-def read_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    customers = crud.get_customers(db, skip=skip, limit=limit)
-    return [cust for cust in customers if cust.is_active]
+@router.get(
+    "/customers",
+    response_model=List[schemas.Customer],
+    dependencies=[Depends(validators(models.Customer))]
+)
+async def read_customers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    if settings.fast_json_responses:
+        rows = await run_db(db, crud.get_public_rows, "customers", skip=skip, limit=limit, cursor=cursor)
+        return rows_response(response, rows)
+    customers = await run_db(db, crud.get_active_customers, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, customers)
+    return customers
 
 
-@router.get("/company-info", response_model=schemas.CompanyInfo)
-def read_company_info(db: Session = Depends(get_db)):
-    company_info = crud.get_company_info(db)
+@router.get(
+    "/company-info",
+    response_model=schemas.CompanyInfo,
+    dependencies=[Depends(validators(models.CompanyInfo))]
+)
+async def read_company_info(db: Session = Depends(get_db)):
+    company_info = await run_db(db, crud.get_public_company_info)
     if company_info is None:
         raise HTTPException(status_code=404, detail="Company info not found")
     return company_info
 
 
+@router.get(
+    "/catalog",
+    response_model=schemas.Catalog,
+    dependencies=[Depends(validators(
+        models.Category, models.Product, models.SubProduct, models.Service,
+        models.Solution, models.Customer, models.CompanyInfo
+    ))]
+)
+async def read_catalog(
+    response: Response,
+    sections: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Whole storefront in one request.
+
+    `sections` limits the payload (categories, services, solutions, customers,
+    company_info) and `fields` trims entities, e.g.
+    `sub_products.name,sub_products.brand`.
+    """
+    try:
+        selected_sections = parse_sections(sections)
+        selected_fields = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    body = await run_db(db, crud.get_public_catalog, sections=selected_sections, fields=selected_fields)
+    # Already serialized (and cached that way), so skip response_model encoding
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
 @router.get("/default-images")
-def get_default_images():
+async def get_default_images():
     """Get default placeholder image URLs"""
     return {
         "product_image": settings.default_product_image,
@@ -1,8 +1,33 @@
-from pydantic import BaseModel
-from typing import Optional, List
+import json
+from enum import Enum
+from pydantic import BaseModel, validator
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 
+def parse_json_text(value):
+    """Accept JSON-encoded strings from clients written for the old text columns"""
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ValueError("must be valid JSON")
+    return value
+
+
+def reject_null(value):
+    """For partial updates of NOT NULL columns: the field may be left out, not nulled"""
+    if value is None:
+        raise ValueError("may be omitted but not null")
+    return value
+
+
+def null_as_zero(value):
+    return 0 if value is None else value
+
+
 # Admin Schemas
 class AdminBase(BaseModel):
     username: str
@@ -95,9 +120,9 @@ class SubProductBase(BaseModel):
     sku: Optional[str] = None
     brand: Optional[str] = None
     model: Optional[str] = None
-    specifications: Optional[str] = None
-    features: Optional[str] = None
-    images: Optional[str] = None
+    specifications: Optional[Dict[str, Any]] = None
+    features: Optional[List[str]] = None
+    images: Optional[List[str]] = None
     price_range: Optional[str] = None
     currency: Optional[str] = "USD"
     availability_status: Optional[str] = "Available"
@@ -105,11 +130,17 @@ class SubProductBase(BaseModel):
     support_info: Optional[str] = None
     documentation_url: Optional[str] = None
     datasheet_url: Optional[str] = None
-    tags: Optional[str] = None
+    tags: Optional[List[str]] = None
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
     is_featured: Optional[bool] = False
-    sort_order: Optional[int] = 0
+    # Part of the listing's keyset order, so never NULL; an empty CSV cell means 0
+    sort_order: int = 0
+
+    _parse_json_fields = validator(
+        "specifications", "features", "images", "tags", pre=True, allow_reuse=True
+    )(parse_json_text)
+    _default_sort_order = validator("sort_order", pre=True, allow_reuse=True)(null_as_zero)
 
 
 class SubProductCreate(SubProductBase):
@@ -123,9 +154,9 @@ class SubProductUpdate(BaseModel):
     sku: Optional[str] = None
     brand: Optional[str] = None
     model: Optional[str] = None
-    specifications: Optional[str] = None
-    features: Optional[str] = None
-    images: Optional[str] = None
+    specifications: Optional[Dict[str, Any]] = None
+    features: Optional[List[str]] = None
+    images: Optional[List[str]] = None
     price_range: Optional[str] = None
     currency: Optional[str] = None
     availability_status: Optional[str] = None
@@ -133,16 +164,24 @@ class SubProductUpdate(BaseModel):
     support_info: Optional[str] = None
     documentation_url: Optional[str] = None
     datasheet_url: Optional[str] = None
-    tags: Optional[str] = None
+    tags: Optional[List[str]] = None
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
     is_active: Optional[bool] = None
     is_featured: Optional[bool] = None
     sort_order: Optional[int] = None
 
+    _parse_json_fields = validator(
+        "specifications", "features", "images", "tags", pre=True, allow_reuse=True
+    )(parse_json_text)
+    _reject_null_sort_order = validator("sort_order", pre=True, allow_reuse=True)(reject_null)
+
 
 class SubProduct(SubProductBase):
     id: int
+    # Derived from price_range by crud on every write; clients cannot set them
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -151,12 +190,30 @@ class SubProduct(SubProductBase):
         orm_mode = True
 
 
+class SubProductSort(str, Enum):
+    price = "price"
+
+
+class FacetCount(BaseModel):
+    value: Any
+    label: Optional[str] = None
+    count: int
+
+
+class SubProductFacets(BaseModel):
+    total: int
+    # filter parameter name -> its values, most frequent first
+    facets: Dict[str, List[FacetCount]]
+
+
 # Service Schemas
 class ServiceBase(BaseModel):
     name: str
     description: Optional[str] = None
     category_id: Optional[int] = None
-    features: Optional[str] = None
+    features: Optional[List[str]] = None
+
+    _parse_features = validator("features", pre=True, allow_reuse=True)(parse_json_text)
 
 
 class ServiceCreate(ServiceBase):
@@ -167,9 +224,11 @@ class ServiceUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     category_id: Optional[int] = None
-    features: Optional[str] = None
+    features: Optional[List[str]] = None
     is_active: Optional[bool] = None
 
+    _parse_features = validator("features", pre=True, allow_reuse=True)(parse_json_text)
+
 
 class Service(ServiceBase):
     id: int
@@ -186,7 +245,9 @@ class Service(ServiceBase):
 class SolutionBase(BaseModel):
     name: str
     description: Optional[str] = None
-    features: Optional[str] = None
+    features: Optional[List[str]] = None
+
+    _parse_features = validator("features", pre=True, allow_reuse=True)(parse_json_text)
 
 
 class SolutionCreate(SolutionBase):
@@ -196,9 +257,11 @@ class SolutionCreate(SolutionBase):
 class SolutionUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    features: Optional[str] = None
+    features: Optional[List[str]] = None
     is_active: Optional[bool] = None
 
+    _parse_features = validator("features", pre=True, allow_reuse=True)(parse_json_text)
+
 
 class Solution(SolutionBase):
     id: int
@@ -282,6 +345,77 @@ class CompanyInfo(CompanyInfoBase):
         orm_mode = True
 
 
+# Bulk Schemas
+class BulkEntity(str, Enum):
+    categories = "categories"
+    products = "products"
+    sub_products = "sub-products"
+    services = "services"
+    solutions = "solutions"
+    customers = "customers"
+
+
+class BulkWrite(BaseModel):
+    # Rows are validated one by one against the entity's create/update schema
+    # so a bad row is reported instead of rejecting the whole request
+    items: List[Dict[str, Any]]
+    atomic: bool = False
+
+
+class BulkDelete(BaseModel):
+    ids: List[int]
+    atomic: bool = False
+
+
+class BulkError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: str
+
+
+class BulkResult(BaseModel):
+    processed: int
+    ids: Optional[List[int]] = None
+    errors: List[BulkError] = []
+
+
+class TransferFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ImportResult(BaseModel):
+    processed: int
+    failed: int
+    # First errors only, ``index`` is the 1-based record number in the file
+    errors: List[BulkError] = []
+
+
+# Catalog Schemas
+class CatalogProduct(ProductBase):
+    id: int
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    sub_products: List[SubProduct] = []
+
+    class Config:
+        orm_mode = True
+
+
+class CatalogCategory(Category):
+    products: List[CatalogProduct] = []
+
+
+class Catalog(BaseModel):
+    categories: Optional[List[CatalogCategory]] = None
+    uncategorized_products: Optional[List[CatalogProduct]] = None
+    services: Optional[List[Service]] = None
+    solutions: Optional[List[Solution]] = None
+    customers: Optional[List[Customer]] = None
+    company_info: Optional[CompanyInfo] = None
+
+
 # Auth Schemas
 class Token(BaseModel):
     access_token: str
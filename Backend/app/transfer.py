@@ -0,0 +1,99 @@
+import codecs
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from app import crud, schemas
+from app.database import SessionLocal
+from app.fastjson import dumps
+
+MEDIA_TYPES = {
+    schemas.TransferFormat.ndjson: "application/x-ndjson",
+    schemas.TransferFormat.csv: "text/csv",
+}
+
+
+def detect_format(filename: Optional[str]) -> Optional[schemas.TransferFormat]:
+    """Format implied by an uploaded file's extension (``.ndjson``/``.jsonl``/``.csv``)"""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension in ("ndjson", "jsonl"):
+        return schemas.TransferFormat.ndjson
+    if extension == "csv":
+        return schemas.TransferFormat.csv
+    return None
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_rows(table: str, format: schemas.TransferFormat) -> Iterator[bytes]:
+    """Encoded export of ``table``, one batch of rows per chunk.
+
+    Opens its own session: the response body is produced after the request's
+    session has been closed. Starlette iterates a sync generator in the
+    threadpool, so the event loop is never blocked by the cursor.
+    """
+    db = SessionLocal()
+    try:
+        if format == schemas.TransferFormat.ndjson:
+            for batch in crud.iter_export_rows(db, table):
+                yield b"".join(dumps(row) + b"\n" for row in batch)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        columns = [column.key for column in crud.export_columns(table)]
+        writer.writerow(columns)
+        for batch in crud.iter_export_rows(db, table):
+            writer.writerows([_csv_value(row[column]) for column in columns] for row in batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+def read_records(file: BinaryIO, format: schemas.TransferFormat) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """``(record number, dict)`` pairs decoded from ``file`` one line at a time.
+
+    Empty CSV cells become ``None``; an NDJSON line that is not a JSON object
+    is yielded as ``None`` for the importer to report.
+    """
+    lines = codecs.iterdecode(file, "utf-8-sig")
+    if format == schemas.TransferFormat.csv:
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, {key: (value if value != "" else None) for key, value in row.items() if key}
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+def import_file(table: str, file: BinaryIO, format: schemas.TransferFormat) -> schemas.ImportResult:
+    """Upsert the records of an uploaded file in chunks with a dedicated session"""
+    db = SessionLocal()
+    try:
+        return crud.import_records(db, table, read_records(file, format))
+    finally:
+        db.close()
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app import auth, crud
+from app.auth import password_hasher
+from app.cache import catalog_cache
+from app.config import settings
+from app.database import SessionLocal, async_engine, engine, get_pool_stats
+
+logger = logging.getLogger("app.warmup")
+
+# Outcome of the last warm-up in this worker: step timings and failed steps
+_timings: Optional[Dict[str, float]] = None
+_failed: List[str] = []
+_lock = asyncio.Lock()
+
+
+def _fill_pool(target_engine, connections: int) -> None:
+    # Hold the connections at the same time so the pool really opens that many
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = target_engine.connect()
+            connection.execute(text("SELECT 1"))
+            opened.append(connection)
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+def _warm_auth() -> None:
+    # The first login or admin request would otherwise pay for these imports
+    auth.password_context()
+    auth.jwt_module()
+
+
+def _warm_catalog() -> None:
+    db = SessionLocal()
+    try:
+        crud.get_public_categories(db)
+        crud.get_public_products(db)
+        crud.get_public_featured_sub_products(db)
+        crud.get_public_company_info(db)
+        crud.get_public_catalog(db)
+        if settings.fast_json_responses:
+            for source in crud.PUBLIC_ROW_SOURCES:
+                crud.get_public_rows(db, source)
+    finally:
+        db.close()
+
+
+async def warm_up() -> Dict[str, float]:
+    """Open pool connections and fill the catalog cache before serving traffic.
+
+    Runs in every worker (pools and caches are per process). Failures are
+    logged, not raised: a cold worker is better than one that will not start,
+    and ``/ready`` retries the warm-up until it succeeds.
+    """
+    global _timings, _failed
+    async with _lock:
+        if _timings is not None and not _failed:
+            return _timings
+        _timings, _failed = await _run_steps()
+        return _timings
+
+
+async def _run_steps():
+    timings = {}
+    failed = []
+    connections = settings.warmup_pool_connections or settings.db_pool_size
+    steps = [
+        ("pool", lambda: _fill_pool(engine, connections)),
+        ("auth", _warm_auth),
+        ("catalog", _warm_catalog),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(step)
+        except Exception:
+            logger.exception("warm-up step %s failed", name)
+            failed.append(name)
+        timings[name] = round(time.perf_counter() - started, 3)
+
+    if async_engine is not None:
+        started = time.perf_counter()
+        opened = []
+        try:
+            for _ in range(connections):
+                connection = await async_engine.connect()
+                opened.append(connection)
+                await connection.execute(text("SELECT 1"))
+        except Exception:
+            logger.exception("warm-up step async_pool failed")
+            failed.append("async_pool")
+        finally:
+            for connection in opened:
+                await connection.close()
+        timings["async_pool"] = round(time.perf_counter() - started, 3)
+
+    logger.info("worker warmed up: %s", timings)
+    return timings, failed
+
+
+def readiness() -> Dict[str, Any]:
+    """Whether this worker has finished warming up, with its pools and cache"""
+    return {
+        "ready": _timings is not None and not _failed,
+        "warm_up": _timings,
+        "failed": list(_failed),
+        "pools": get_pool_stats(),
+        "catalog_cache_entries": catalog_cache.stats()["size"],
+    }
+
+
+async def shut_down() -> None:
+    """Release pooled connections and the bcrypt threads when a worker stops"""
+    password_hasher.shutdown()
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
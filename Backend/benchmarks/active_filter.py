@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filtering inactive rows in Python vs in SQL
+
+Compares the old public listing path (load a page with crud.get_*, then
+drop inactive rows in Python) with the crud.get_active_* queries, and
+reports rows fetched from the database vs rows returned to the client.
+
+    python -m benchmarks.active_filter --sub-products 20000 --inactive 0.6
+"""
+
+import argparse
+import statistics
+
+from benchmarks.common import SessionLocal, measure, print_table, reset_database, seed_catalog
+from app import crud
+
+ENTITIES = ["categories", "products", "sub_products", "services", "solutions", "customers"]
+
+
+def python_filtered(db, entity, skip, limit):
+    rows = getattr(crud, f"get_{entity}")(db, skip=skip, limit=limit)
+    return len(rows), [row for row in rows if row.is_active]
+
+
+def sql_filtered(db, entity, skip, limit):
+    rows = getattr(crud, f"get_active_{entity}")(db, skip=skip, limit=limit)
+    return len(rows), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=500)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--sub-products", type=int, default=20000)
+    parser.add_argument("--inactive", type=float, default=0.6, help="fraction of rows marked inactive")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=5, help="pages to walk per entity")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(args.categories, args.products, args.sub_products, inactive_ratio=args.inactive)
+
+    rows = []
+    db = SessionLocal()
+    try:
+        for entity in ENTITIES:
+            for label, fn in (("python filter", python_filtered), ("sql filter", sql_filtered)):
+                fetched = returned = 0
+                short_pages = 0
+                timings = []
+                for page in range(args.pages):
+                    skip = page * args.limit
+                    n_fetched, result = fn(db, entity, skip, args.limit)
+                    fetched += n_fetched
+                    returned += len(result)
+                    if len(result) < args.limit and n_fetched == args.limit:
+                        short_pages += 1
+                    timings.extend(measure(lambda: fn(db, entity, skip, args.limit), args.repeat))
+                    db.expunge_all()
+                rows.append([
+                    entity,
+                    label,
+                    fetched,
+                    returned,
+                    short_pages,
+                    f"{statistics.median(timings) * 1000:.2f}",
+                ])
+    finally:
+        db.close()
+
+    print(f"\n{args.pages} pages of {args.limit} rows, {args.inactive:.0%} inactive\n")
+    print_table(["entity", "path", "rows fetched", "rows returned", "short pages", "median ms/page"], rows)
+
+
+if __name__ == "__main__":
+    main()
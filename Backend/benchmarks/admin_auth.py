@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request overhead of get_current_admin
+
+Calls the admin authentication dependency the way every /admin/* request
+does, with the verified-token cache disabled and enabled, and reports the
+time and database queries spent per call.
+
+    python -m benchmarks.admin_auth --calls 2000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from benchmarks.common import SessionLocal, engine, print_table, reset_database
+from app import auth, crud, schemas
+from app.cache import catalog_cache
+
+
+async def authenticate_many(token: str, calls: int) -> float:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await auth.get_current_admin(credentials, db)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    crud.create_admin(db, schemas.AdminCreate(username="bench", email="bench@example.com", password="bench-password"))
+    db.close()
+    token = auth.create_access_token({"sub": "bench"}, expires_delta=timedelta(minutes=30))
+
+    queries = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*_):
+        queries[0] += 1
+
+    rows = []
+    for enabled in (False, True):
+        auth.admin_auth_cache_enabled = enabled
+        auth.admin_auth_cache.clear()
+        queries[0] = 0
+        elapsed = asyncio.run(authenticate_many(token, args.calls))
+        rows.append([
+            "cache on" if enabled else "cache off",
+            args.calls,
+            f"{elapsed / args.calls * 1e6:.1f}",
+            f"{queries[0] / args.calls:.3f}",
+        ])
+
+    print(f"\n{engine.dialect.name}, {catalog_cache.backend.name} generations, {args.calls} authenticated calls\n")
+    print_table(["mode", "calls", "us per call", "queries per call"], rows)
+
+
+if __name__ == "__main__":
+    main()
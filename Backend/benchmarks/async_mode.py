@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Load test: threadpool (sync) sessions vs ASYNC_DATABASE=True
+
+Boots the API twice against the same seeded database, once per mode, and
+drives public catalog reads with many concurrent keep-alive clients. The
+catalog cache is disabled so every request reaches the database.
+
+    python -m benchmarks.async_mode --clients 500 --duration 20
+"""
+
+import argparse
+import itertools
+
+from benchmarks.common import print_table, reset_database, seed_catalog
+from benchmarks.loadgen import REPORT_HEADERS, report_rows, run_load, serve, write_json
+
+PATHS = [
+    ("categories", "/public/categories"),
+    ("products", "/public/products?limit=50"),
+    ("sub-products", "/public/sub-products?limit=50"),
+    ("featured", "/public/sub-products/featured"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=20, products=200, sub_products=5000)
+
+    results = {}
+    rows = []
+    for mode in ("sync", "async"):
+        cycle = itertools.cycle(PATHS)
+
+        def next_request():
+            label, path = next(cycle)
+            return label, "GET", path, {}, b""
+
+        env = {"ASYNC_DATABASE": str(mode == "async"), "CATALOG_CACHE_ENABLED": "False"}
+        with serve(env) as port:
+            results[mode] = run_load(port, next_request, args.clients, args.duration)
+        rows.extend(report_rows(mode, results[mode]))
+
+    print(f"\n{args.clients} concurrent clients, {args.duration:.0f}s per mode\n")
+    print_table(REPORT_HEADERS, rows)
+    if args.json:
+        write_json(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
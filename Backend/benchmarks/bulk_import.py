@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: importing sub-products one request at a time vs /bulk
+
+Creates the same rows through ``POST /admin/sub-products`` per item and
+through ``POST /admin/sub-products/bulk`` in batches, in-process, and
+reports rows per second and database round-trips per row.
+
+    python -m benchmarks.bulk_import --rows 5000 --batch 1000
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from benchmarks.common import SessionLocal, engine, print_table, reset_database, seed_catalog
+from app import auth, crud, schemas
+import main as app_main
+
+
+def make_rows(prefix: str, count: int, products: int):
+    return [
+        {
+            "name": f"Imported {prefix} {i}",
+            "product_id": i % products + 1,
+            "sku": f"{prefix}-{i:07d}",
+            "brand": "Cisco",
+            "specifications": {"ports": "48"},
+            "features": ["PoE+", "Layer 3"],
+            "tags": ["switch", "import"],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=10, products=100, sub_products=1000)
+    db = SessionLocal()
+    crud.create_admin(db, schemas.AdminCreate(username="bench", email="bench@example.com", password="bench-password"))
+    db.close()
+    token = auth.create_access_token({"sub": "bench"}, expires_delta=timedelta(minutes=60))
+    client = TestClient(app_main.app)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    queries = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*_):
+        queries[0] += 1
+
+    results = []
+
+    queries[0] = 0
+    start = time.perf_counter()
+    for row in make_rows("SINGLE", args.rows, 100):
+        client.post("/admin/sub-products", json=row, headers=headers).raise_for_status()
+    results.append(("one per request", time.perf_counter() - start, queries[0]))
+
+    queries[0] = 0
+    start = time.perf_counter()
+    rows = make_rows("BULK", args.rows, 100)
+    for offset in range(0, len(rows), args.batch):
+        response = client.post(
+            "/admin/sub-products/bulk", json={"items": rows[offset:offset + args.batch]}, headers=headers
+        )
+        response.raise_for_status()
+        assert not response.json()["errors"], response.json()["errors"][:3]
+    results.append((f"bulk x{args.batch}", time.perf_counter() - start, queries[0]))
+
+    print(f"\n{engine.dialect.name}, {args.rows} sub-products\n")
+    print_table(
+        ["mode", "seconds", "rows/s", "queries per row"],
+        [
+            [mode, f"{elapsed:.2f}", f"{args.rows / elapsed:.0f}", f"{count / args.rows:.2f}"]
+            for mode, elapsed, count in results
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Check: catalog cache backends keep workers consistent
+
+Runs against each CATALOG_CACHE_BACKEND (memory, disk and redis, the last
+one against an in-process fake Redis server speaking RESP):
+
+1. Two ``CatalogCache`` instances stand in for two workers. An entry loaded
+   by one must be served to the other without reloading, and an
+   ``invalidate()`` or ``clear()`` in one must make the other reload. A
+   memory backend is per worker, so there the second worker is expected to
+   reload, and to keep serving its stale entry after the other one's write.
+2. Hit latency: a local LRU hit, and a hit fetched from the shared store.
+3. A shared backend that is down must not fail reads.
+4. ``run.py`` with two uvicorn workers: after an admin renames a category,
+   no worker may answer with the old name. The memory backend passes by
+   bypassing the cache once more than one worker runs.
+
+Exits with status 1 when a backend breaks any of these.
+
+    python -m benchmarks.cache_backends
+    python -m benchmarks.cache_backends --skip-workers
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.common import SessionLocal, print_table, reset_database, seed_catalog
+from benchmarks.loadgen import free_port, serve
+from app import auth, crud, models, schemas
+from app.cache import CatalogCache, DiskBackend, MemoryBackend, RedisBackend
+from app.pagination import Page
+
+BENCH_USER = "cache-check-admin"
+REDIS_PASSWORD = "fake-redis-password"
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        from app.resp import read_reply
+
+        server = self.server
+        authenticated = False
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except Exception:
+                return
+            name, args = command[0].upper(), command[1:]
+            server.commands += 1
+            if name == b"AUTH":
+                authenticated = args[-1].decode() == REDIS_PASSWORD
+                reply = b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n"
+            elif not authenticated:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            else:
+                with server.lock:
+                    reply = server.run(name, args)
+            self.wfile.write(reply)
+            self.wfile.flush()
+
+
+class FakeRedis(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """GET/SET PX/MGET/INCR/DEL/SELECT/PING over RESP, with a password"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.lock = threading.Lock()
+        self.data = {}
+        self.commands = 0
+
+    @property
+    def url(self):
+        return f"redis://:{REDIS_PASSWORD}@127.0.0.1:{self.server_address[1]}/1"
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def run(self, name, args):
+        def bulk(value):
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+        if name in (b"PING", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            return bulk(self._get(args[0]))
+        if name == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(bulk(self._get(key)) for key in args)
+        if name == b"SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if name == b"INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        if name == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+        return b"-ERR unknown command '%s'\r\n" % name
+
+
+def worker_pair(name, redis_url, disk_path):
+    """Two caches that share a store the way two workers would"""
+    def backend():
+        if name == "memory":
+            return MemoryBackend()
+        if name == "disk":
+            return DiskBackend(disk_path, ttl=300, max_entries=1000)
+        return RedisBackend(redis_url, ttl=300, prefix="sns:check:")
+
+    return [CatalogCache(max_entries=100, ttl=300, backend=backend()) for _ in range(2)]
+
+
+def check_consistency(name, redis_url, disk_path):
+    """[(check, expected, observed)] for one backend"""
+    first, second = worker_pair(name, redis_url, disk_path)
+    shared = first.backend.shared
+    loads = []
+
+    def loader(value):
+        def load():
+            loads.append(value)
+            page = Page([{"id": 1, "name": value}])
+            page.next_cursor = "cursor"
+            return page
+        return load
+
+    results = []
+    first.get_or_load(("categories",), "page", loader("v1"))
+    loads.clear()
+    page = second.get_or_load(("categories",), "page", loader("v1"))
+    results.append(("second worker reuses the first one's entry", shared, not loads))
+    results.append(("page keeps its cursor", True, getattr(page, "next_cursor", None) == "cursor"))
+
+    second.get_or_load(("categories",), "page", loader("v1"))
+    first.invalidate("categories")
+    loads.clear()
+    page = second.get_or_load(("categories",), "page", loader("v2"))
+    results.append(("write in one worker invalidates the other", shared, page[0]["name"] == "v2"))
+
+    first.get_or_load(("products",), "other", loader("p1"))
+    second.get_or_load(("products",), "other", loader("p1"))
+    first.clear()
+    loads.clear()
+    second.get_or_load(("products",), "other", loader("p2"))
+    results.append(("clear() reaches the other worker", shared, loads == ["p2"]))
+    return results
+
+
+def hit_latency(name, redis_url, disk_path, rounds):
+    """(local hit µs, shared hit µs or None)"""
+    writer, reader = worker_pair(name, redis_url, disk_path)
+    value = [{"id": index, "name": f"Category {index}", "description": "x" * 200} for index in range(50)]
+    writer.get_or_load(("categories",), "latency", lambda: value)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        writer.get_or_load(("categories",), "latency", lambda: value)
+    local = (time.perf_counter() - started) / rounds * 1e6
+
+    if not reader.backend.shared:
+        return local, None
+    started = time.perf_counter()
+    for _ in range(rounds):
+        reader._entries.clear()
+        reader.get_or_load(("categories",), "latency", lambda: value)
+    return local, (time.perf_counter() - started) / rounds * 1e6
+
+
+def check_backend_down():
+    """A read through an unreachable Redis still answers from the loader"""
+    cache = CatalogCache(100, 300, backend=RedisBackend(f"redis://127.0.0.1:{free_port()}/0", 300, "x:", timeout=0.2))
+    value = cache.get_or_load(("categories",), "down", lambda: "loaded")
+    cache.invalidate("categories")
+    return value == "loaded" and cache.stats()["errors"] >= 2
+
+
+def check_workers(name, env):
+    """Responses that still carry the old category name after an admin rename"""
+    db = SessionLocal()
+    try:
+        category = db.query(models.Category).filter(models.Category.is_active == True).order_by(models.Category.id).first()
+        category_id = category.id
+    finally:
+        db.close()
+    token = auth.create_access_token({"sub": BENCH_USER})
+    new_name = f"Renamed on {name} {time.time():.0f}"
+
+    command = [sys.executable, "run.py", "--server", "uvicorn", "--workers", "2"]
+    with serve({"WEB_RELOAD": "False", "WARMUP_ON_STARTUP": "False", **env}, args=command, timeout=60) as port:
+        base = f"http://127.0.0.1:{port}"
+
+        def names():
+            # A new connection per request, so both workers answer some
+            with urllib.request.urlopen(f"{base}/public/categories?limit=100", timeout=10) as response:
+                return {row["name"] for row in json.loads(response.read())}
+
+        for _ in range(40):
+            names()
+        request = urllib.request.Request(
+            f"{base}/admin/categories/{category_id}",
+            data=json.dumps({"name": new_name}).encode(),
+            method="PUT",
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        )
+        urllib.request.urlopen(request, timeout=10).read()
+        return sum(new_name not in names() for _ in range(40))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="lookups per latency measurement")
+    parser.add_argument("--skip-workers", action="store_true", help="skip the run.py multi-worker check")
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=20, products=100, sub_products=500)
+    db = SessionLocal()
+    try:
+        crud.create_admin(db, schemas.AdminCreate(username=BENCH_USER, email="cache@example.com", password="benchmark"))
+    finally:
+        db.close()
+
+    fake_redis = FakeRedis()
+    threading.Thread(target=fake_redis.serve_forever, daemon=True).start()
+    disk_path = os.path.join(tempfile.mkdtemp(prefix="sns-cache-check-"), "catalog.sqlite3")
+    backends = {
+        "memory": {"CATALOG_CACHE_BACKEND": "memory"},
+        "disk": {"CATALOG_CACHE_BACKEND": "disk", "CATALOG_CACHE_PATH": disk_path},
+        "redis": {"CATALOG_CACHE_BACKEND": "redis", "CATALOG_CACHE_REDIS_URL": fake_redis.url},
+    }
+
+    failures = 0
+    check_rows = []
+    latency_rows = []
+    for name, env in backends.items():
+        for check, expected, observed in check_consistency(name, fake_redis.url, disk_path):
+            ok = observed == expected
+            failures += not ok
+            check_rows.append([name, check, "yes" if observed else "no", "ok" if ok else "FAIL"])
+        if not args.skip_workers:
+            stale = check_workers(name, env)
+            ok = stale == 0
+            failures += not ok
+            check_rows.append([name, "no stale answers after an admin write (2 workers)",
+                               f"{stale}/40 stale", "ok" if ok else "FAIL"])
+        local, remote = hit_latency(name, fake_redis.url, disk_path, args.rounds)
+        latency_rows.append([name, f"{local:.1f}", "-" if remote is None else f"{remote:.1f}"])
+
+    down_ok = check_backend_down()
+    failures += not down_ok
+    check_rows.append(["redis", "reads still answered while the backend is down", "yes" if down_ok else "no",
+                       "ok" if down_ok else "FAIL"])
+
+    print()
+    print_table(["backend", "check", "observed", "result"], check_rows)
+    print(f"\nLookup latency, {args.rounds} rounds (fake Redis: {fake_redis.commands} commands served)\n")
+    print_table(["backend", "local hit µs", "shared hit µs"], latency_rows)
+    fake_redis.shutdown()
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
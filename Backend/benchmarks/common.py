@@ -0,0 +1,125 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run from the Backend directory (``python -m benchmarks.<name>``)
+against a throwaway SQLite database unless DATABASE_URL points somewhere
+else, e.g. a local PostgreSQL that mirrors production.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "sns_benchmark.db")
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+# The scripts call the app in-process; run.py sets its own count for the servers they start
+os.environ.setdefault("WEB_WORKERS", "1")
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app import crud, models  # noqa: E402
+from app.cache import catalog_cache  # noqa: E402
+
+
+def reset_database():
+    """Drop and recreate every table, and forget what a shared catalog cache holds"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    catalog_cache.clear()
+
+
+def seed_catalog(
+    categories: int = 10,
+    products: int = 100,
+    sub_products: int = 1000,
+    inactive_ratio: float = 0.0,
+    seed: int = 42,
+):
+    """Bulk insert a synthetic catalog and return the row counts per table"""
+    rng = random.Random(seed)
+
+    def active():
+        return rng.random() >= inactive_ratio
+
+    brands = ["Cisco", "Fortinet", "Sophos", "Hikvision", "Dahua", "Dell", "HPE", "ZKTeco"]
+    statuses = ["Available"] * 6 + ["Out of Stock", "Discontinued"]
+
+    def price_range():
+        if rng.random() < 0.2:
+            return "Contact us"
+        low = rng.randrange(50, 5000, 50)
+        return f"${low:,} - ${low * rng.randint(1, 3):,}"
+
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(models.Category, [
+            {"id": i, "name": f"Category {i}", "description": f"Synthetic category {i}", "is_active": active()}
+            for i in range(1, categories + 1)
+        ])
+        db.bulk_insert_mappings(models.Product, [
+            {
+                "id": i,
+                "name": f"Product {i}",
+                "description": f"Synthetic product {i}",
+                "category_id": rng.randint(1, categories),
+                "is_active": active(),
+            }
+            for i in range(1, products + 1)
+        ])
+        db.bulk_insert_mappings(models.SubProduct, [
+            crud.with_derived_columns(models.SubProduct, {
+                "id": i,
+                "name": f"{rng.choice(brands)} Device {i}",
+                "description": "Synthetic sub-product " * 8,
+                "product_id": rng.randint(1, products),
+                "sku": f"SKU-{i:07d}",
+                "brand": rng.choice(brands),
+                "model": f"M-{i}",
+                "tags": ["network", "security"],
+                "is_active": active(),
+                "is_featured": rng.random() < 0.05,
+                "sort_order": rng.randint(0, 10),
+                "price_range": price_range(),
+                "currency": "BDT" if rng.random() < 0.3 else "USD",
+                "availability_status": rng.choice(statuses),
+            })
+            for i in range(1, sub_products + 1)
+        ])
+        for model in (models.Service, models.Solution, models.Customer):
+            db.bulk_insert_mappings(model, [
+                {"id": i, "name": f"{model.__name__} {i}", "is_active": active()}
+                for i in range(1, categories + 1)
+            ])
+        db.commit()
+    finally:
+        db.close()
+    return {"categories": categories, "products": products, "sub_products": sub_products}
+
+
+def measure(fn, repeat: int = 20):
+    """Call fn repeatedly and return the elapsed seconds of each call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response size and CPU per request with gzip/brotli compression
+
+Serves the large public list pages in-process and reports, per encoding,
+the bytes on the wire and the process CPU time per request, once with the
+compressed body cache emptied before every request (each hit compresses)
+and once with it warm (repeated hits reuse the stored bytes), plus the time
+the compressor alone takes for the page.
+
+    python -m benchmarks.compression --requests 300 --limit 100
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import print_table, reset_database, seed_catalog
+from app import compression
+from app.compression import compressed_body_cache
+from app.config import settings
+import main as app_main
+
+
+def cpu_per_request(client, path, headers, requests, before_each=None):
+    start = time.process_time()
+    for _ in range(requests):
+        if before_each is not None:
+            before_each()
+        client.get(path, headers=headers)
+    return (time.process_time() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=50, products=500, sub_products=5000)
+    client = TestClient(app_main.app)
+
+    middleware = compression.CompressionMiddleware(
+        None, gzip_level=settings.compression_gzip_level, brotli_quality=settings.compression_brotli_quality
+    )
+    encodings = ["identity", "gzip"] + (["br"] if compression.brotli is not None else [])
+    rows = []
+    for label, path in [
+        ("sub-products", f"/public/sub-products?limit={args.limit}"),
+        ("products", f"/public/products?limit={args.limit}"),
+    ]:
+        for encoding in encodings:
+            headers = {"Accept-Encoding": encoding}
+            response = client.get(path, headers=headers, stream=True)
+            size = len(response.raw.read(decode_content=False))
+            cold = cpu_per_request(client, path, headers, args.requests, before_each=compressed_body_cache.clear)
+            warm = cpu_per_request(client, path, headers, args.requests)
+            body = client.get(path, headers={"Accept-Encoding": "identity"}).content
+            if encoding == "identity":
+                compress_ms = 0.0
+            else:
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    middleware.compress(encoding, body)
+                compress_ms = (time.perf_counter() - start) / args.requests * 1000
+            rows.append([label, encoding, size, f"{compress_ms:.3f}", f"{cold:.2f}", f"{warm:.2f}"])
+
+    print(f"\n{args.requests} requests per row, limit={args.limit}, catalog cache on\n")
+    print_table(
+        ["route", "encoding", "bytes", "compress ms", "ms cpu/req compressing", "ms cpu/req cached"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
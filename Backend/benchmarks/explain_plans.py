@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Regression check: no public endpoint may sequentially scan a large table
+
+Seeds a large catalog, calls every public read endpoint in-process, captures
+the SQL each one runs and explains it (``EXPLAIN (ANALYZE, FORMAT JSON)`` on
+PostgreSQL, ``EXPLAIN QUERY PLAN`` on SQLite). The script exits with status 1
+if any plan reads a table with at least ``--min-rows`` rows through a
+sequential scan (on SQLite: a full scan, or an index search that still has to
+sort every match), or if an endpoint stops using the index it was built for
+(the price indexes for ``sort=price``, the facet indexes for the sub product
+filters and ``/public/sub-products/facets``), so it can gate CI or a
+migration review.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.explain_plans
+
+Not checked, by design: ``/public/catalog`` (reads whole tables), the
+ETag signature aggregate (a full-table count/max that is cached until the
+next write) and, on SQLite, search and ``?tag=`` which have no index there.
+"""
+
+import argparse
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+
+from benchmarks.common import SessionLocal, engine, print_table, reset_database, seed_catalog
+from app.cache import catalog_cache
+from app import models
+import main as app_main
+
+TABLES = [
+    models.Category, models.Product, models.SubProduct, models.Service,
+    models.Solution, models.Customer, models.CompanyInfo,
+]
+
+
+PRICE_INDEX = "ix_sub_products_active_price"
+FACET_INDEXES = (
+    "ix_sub_products_active_brand", "ix_sub_products_active_availability",
+    "ix_sub_products_active_currency", "ix_sub_products_active_featured",
+)
+
+
+def endpoints(product_id: int, sub_product_id: int, category_id: int, is_postgresql: bool):
+    """[(path, indexes its plans must use)]"""
+    paths = [
+        ("/public/categories", ()),
+        ("/public/products", ()),
+        ("/public/products?cursor=", ()),
+        ("/public/sub-products", ()),
+        ("/public/sub-products?cursor=", ()),
+        (f"/public/sub-products?product_id={product_id}", ()),
+        (f"/public/products/{product_id}/sub-products", ()),
+        ("/public/sub-products/featured", ()),
+        (f"/public/sub-products/{sub_product_id}", ()),
+        ("/public/sub-products?min_price=500&max_price=2000", ()),
+        ("/public/sub-products?min_price=500&max_price=2000&sort=price", (PRICE_INDEX,)),
+        ("/public/sub-products?max_price=300&sort=price", (PRICE_INDEX,)),
+        ("/public/sub-products?sort=price", (PRICE_INDEX,)),
+        ("/public/sub-products?sort=price&cursor=", (PRICE_INDEX,)),
+        ("/public/sub-products?brand=Cisco", ("ix_sub_products_active_brand",)),
+        ("/public/sub-products?availability_status=Discontinued", ("ix_sub_products_active_availability",)),
+        (f"/public/sub-products?category_id={category_id}", ()),
+        ("/public/sub-products?brand=Cisco&availability_status=Available&sort=price", ()),
+        ("/public/sub-products/facets", FACET_INDEXES),
+        ("/public/sub-products/facets?brand=Cisco&min_price=500", ("ix_sub_products_active_brand",)),
+        (f"/public/sub-products/facets?category_id={category_id}&availability_status=Discontinued", ()),
+        ("/public/services", ()),
+        ("/public/solutions", ()),
+        ("/public/customers", ()),
+        ("/public/company-info", ()),
+    ]
+    if is_postgresql:
+        paths += [
+            ("/public/sub-products/search?q=cisco", ()),
+            ("/public/sub-products?tag=network", ("ix_sub_products_tags",)),
+            ("/public/sub-products?tag=network&sort=price", ()),
+            ("/public/sub-products/facets?tag=network", ()),
+        ]
+    return paths
+
+
+def is_signature_query(statement: str) -> bool:
+    return "count(" in statement.lower() and "coalesce(" in statement.lower()
+
+
+def explain(connection, statement, parameters):
+    """(tables the statement reads with a sequential scan, indexes its plan uses)"""
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(
+            "EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters
+        ).scalar()
+        found = []
+        indexes = set()
+
+        def walk(node):
+            if node.get("Node Type") == "Seq Scan":
+                found.append(node["Relation Name"])
+            if "Index Name" in node:
+                indexes.add(node["Index Name"])
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan[0]["Plan"])
+        return found, indexes
+
+    # SQLite has no cost-based plan output. SCAN walks a whole table (or a
+    # whole index, unless it is a partial one); a SEARCH followed by a temp
+    # B-tree sort means the index only narrowed on a low-selectivity column
+    # such as is_active and every match is read and sorted before LIMIT
+    # applies. Both count as a full read. Grouped counts (the facets) read
+    # every match by nature and only sort the groups, so for them a SEARCH
+    # through an index is enough.
+    details = [row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+    grouped = "group by" in statement.lower()
+    sorts = not grouped and any(detail.startswith("USE TEMP B-TREE FOR ORDER BY") for detail in details)
+    found = []
+    indexes = set()
+    for detail in details:
+        words = detail.split()
+        if detail.startswith("SCAN ") and not (set(words) & partial_indexes(connection)):
+            found.append(words[1])
+        elif sorts and detail.startswith("SEARCH "):
+            found.append(words[1])
+        if "INDEX" in words and not detail.startswith("USE TEMP"):
+            indexes.add(words[words.index("INDEX") + 1])
+    return found, indexes
+
+
+def partial_indexes(connection):
+    return {
+        name for name, in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'"
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sub-products", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--min-rows", type=int, default=1000, help="tables smaller than this are not checked")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the catalog from a previous run")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        reset_database()
+        seed_catalog(categories=50, products=args.products, sub_products=args.sub_products, inactive_ratio=0.1)
+    is_postgresql = engine.dialect.name == "postgresql"
+    # VACUUM as well on PostgreSQL: index-only scans (the facet counts) need
+    # the visibility map autovacuum keeps current in production
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM ANALYZE" if is_postgresql else "ANALYZE")
+
+    db = SessionLocal()
+    try:
+        if db.query(models.CompanyInfo).first() is None:
+            db.add(models.CompanyInfo(company_name="Benchmark"))
+            db.commit()
+        row_counts = {model.__tablename__: db.query(func.count(model.id)).scalar() for model in TABLES}
+        product_id, = db.query(models.SubProduct.product_id).group_by(models.SubProduct.product_id).order_by(
+            func.count(models.SubProduct.id).desc()
+        ).first()
+        sub_product_id = db.query(func.max(models.SubProduct.id)).filter(models.SubProduct.is_active == True).scalar()
+        category_id = db.query(func.min(models.Category.id)).filter(models.Category.is_active == True).scalar()
+    finally:
+        db.close()
+    large_tables = {table for table, count in row_counts.items() if count >= args.min_rows}
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    catalog_cache.enabled = False
+    client = TestClient(app_main.app)
+    rows = []
+    failures = 0
+    for path, expected in endpoints(product_id, sub_product_id, category_id, is_postgresql):
+        captured.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            client.get(path).raise_for_status()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        scanned = set()
+        used = set()
+        with engine.connect() as connection:
+            for statement, parameters in captured:
+                if is_signature_query(statement):
+                    continue
+                found, indexes = explain(connection, statement, parameters)
+                scanned.update(found)
+                used.update(indexes)
+        offending = sorted(scanned & large_tables)
+        unused = [index for index in expected if index not in used]
+        failures += bool(offending or unused)
+        rows.append([
+            path, len(captured), ", ".join(offending) or "-", ", ".join(unused) or "-",
+            "FAIL" if offending or unused else "ok",
+        ])
+
+    print(f"\n{engine.dialect.name}, large tables (>= {args.min_rows} rows): {', '.join(sorted(large_tables))}\n")
+    print_table(["endpoint", "queries", "seq scans on large tables", "expected indexes not used", "result"], rows)
+    if failures:
+        print(f"\n{failures} endpoint(s) regressed to a sequential scan or lost an index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start, from ``import main`` to the first answered request
+
+Imports the application in fresh interpreters under ``python -X importtime``
+and reports the median total plus the packages that cost the most (self
+time summed per top-level package, per module for the app itself). Then
+boots ``run.py`` (one uvicorn worker) without warm-up, with the blocking
+warm-up and with the background one, and times process start to the first
+``/health`` answer and the first and second catalog request.
+
+    python -m benchmarks.import_time --runs 5 --json import_time.json
+    python -m benchmarks.import_time --budget-ms 900   # exit 1 when slower
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+from benchmarks.common import print_table, reset_database, seed_catalog
+from benchmarks.loadgen import BACKEND_DIR, free_port, write_json
+
+
+def import_profile():
+    """{package: self microseconds} for one cold ``import main``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    profile = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        package = name if name == "main" or name.startswith("app.") else name.split(".")[0]
+        profile[package] += int(own)
+    return profile
+
+
+def wait_for(url: str, process, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("server did not start")
+            time.sleep(0.01)
+
+
+def timed_get(url: str) -> float:
+    started = time.perf_counter()
+    urllib.request.urlopen(url, timeout=30).read()
+    return (time.perf_counter() - started) * 1000
+
+
+STARTUP_MODES = {
+    "no warm-up": {"WARMUP_ON_STARTUP": "False"},
+    "warm-up": {"WARMUP_ON_STARTUP": "True", "WARMUP_IN_BACKGROUND": "False"},
+    "background warm-up": {"WARMUP_ON_STARTUP": "True", "WARMUP_IN_BACKGROUND": "True"},
+}
+
+
+def boot(mode_env):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {**os.environ, **mode_env}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "run.py", "--server", "uvicorn", "--workers", "1", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"{base}/health", process, timeout=60)
+        boot_ms = (time.perf_counter() - started) * 1000
+        first = timed_get(f"{base}/public/products?limit=50")
+        second = timed_get(f"{base}/public/products?limit=50")
+    finally:
+        process.terminate()
+        process.wait(timeout=15)
+    return boot_ms, first, second
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median import of main takes longer")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=20, products=200, sub_products=2000)
+
+    samples = defaultdict(list)
+    totals = []
+    for _ in range(args.runs):
+        profile = import_profile()
+        totals.append(sum(profile.values()) / 1000)
+        for name, own in profile.items():
+            samples[name].append(own / 1000)
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    total = statistics.median(totals)
+    heaviest = sorted(medians.items(), key=lambda item: -item[1])[:args.top]
+
+    print(f"\nimport main: {total:.0f} ms (median of {args.runs})\n")
+    print_table(["package / module", "ms", "share"], [
+        [name, f"{ms:.1f}", f"{ms / total:.0%}"] for name, ms in heaviest
+    ])
+
+    boots = {label: boot(mode_env) for label, mode_env in STARTUP_MODES.items()}
+    print()
+    print_table(["startup", "boot to /health ms", "first /public/products ms", "second ms"], [
+        [label, f"{boot_ms:.0f}", f"{first:.1f}", f"{second:.1f}"]
+        for label, (boot_ms, first, second) in boots.items()
+    ])
+
+    if args.json:
+        write_json(args.json, {
+            "import_main_ms": total,
+            "imports_ms": dict(heaviest),
+            "boot": {
+                label: {"boot_ms": boot_ms, "first_request_ms": first, "second_request_ms": second}
+                for label, (boot_ms, first, second) in boots.items()
+            },
+        })
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\nimport main takes {total:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
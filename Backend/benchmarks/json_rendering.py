@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU per request for public list pages, ORM + Pydantic vs fast path
+
+Serves each list route in-process (no network) with FAST_JSON_RESPONSES off
+and on, and reports the process CPU time spent per request. The catalog
+cache is disabled so every request queries, hydrates and renders the page.
+
+    python -m benchmarks.json_rendering --requests 300 --limit 100
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import print_table, reset_database, seed_catalog
+from app.cache import catalog_cache
+from app.config import settings
+from app import fastjson
+import main as app_main
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=50, products=500, sub_products=5000)
+    catalog_cache.enabled = False
+    client = TestClient(app_main.app)
+
+    paths = [
+        ("sub-products", f"/public/sub-products?limit={args.limit}"),
+        ("products", f"/public/products?limit={args.limit}"),
+        ("categories", f"/public/categories?limit={args.limit}"),
+    ]
+    rows = []
+    for label, path in paths:
+        results = {}
+        for fast in (False, True):
+            settings.fast_json_responses = fast
+            client.get(path).raise_for_status()
+            start = time.process_time()
+            for _ in range(args.requests):
+                client.get(path)
+            results[fast] = (time.process_time() - start) / args.requests * 1000
+        rows.append([
+            label,
+            f"{results[False]:.2f}",
+            f"{results[True]:.2f}",
+            f"{results[False] / results[True]:.1f}x",
+        ])
+
+    encoder = "orjson" if fastjson.orjson is not None else "json"
+    print(f"\n{args.requests} requests per route, limit={args.limit}, fast path encoder: {encoder}\n")
+    print_table(["route", "model path ms cpu/req", "fast path ms cpu/req", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
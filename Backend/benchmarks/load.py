@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Load test: configurable route mixes against a local server
+
+Seeds a catalog, boots ``uvicorn main:app`` against it (SQLite by default,
+set DATABASE_URL for a local PostgreSQL) and drives a weighted mix of route
+groups with many concurrent keep-alive clients, then reports requests,
+errors, RPS and p50/p95/p99 per route.
+
+Route groups: ``catalog`` (public listings, detail pages, /public/catalog),
+``search``, ``admin`` (authenticated reads and writes) and ``login``.
+Pick a preset mix (``read``, ``mixed``, ``write``, ``login``) or give the
+weights directly, e.g. ``--mix catalog=60,search=30,admin=10``.
+
+Results go to ``--json`` with the commit, database and settings they were
+measured with; ``--compare`` prints the change against an earlier file and
+``--fail-over`` makes a p95 regression beyond that percentage exit 1:
+
+    python -m benchmarks.load --mix mixed --clients 200 --json before.json
+    python -m benchmarks.load --mix mixed --clients 200 --compare before.json --fail-over 20
+
+Server settings are passed with ``--env``, e.g. ``--env ASYNC_DATABASE=True``.
+Login throttling is switched off unless ``--env`` sets it, so the login
+group measures bcrypt rather than 429 responses.
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import SessionLocal, engine, print_table, reset_database, seed_catalog
+from benchmarks.loadgen import BACKEND_DIR, REPORT_HEADERS, report_rows, run_load, serve, write_json
+from app import auth, crud, schemas
+
+BENCH_USER = "loadtest"
+BENCH_PASSWORD = "loadtest-password"
+
+SEARCH_TERMS = ["cisco", "fortinet", "device", "hikvision", "dell", "switch", "zkteco 1"]
+
+MIXES = {
+    "read": {"catalog": 100},
+    "mixed": {"catalog": 70, "search": 20, "admin": 7, "login": 3},
+    "write": {"admin": 80, "catalog": 20},
+    "login": {"login": 100},
+}
+
+
+def route_groups(sizes, token: str):
+    """Route group -> [(route label, request factory)]; a factory takes an RNG"""
+    admin = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    json_headers = {"Content-Type": "application/json"}
+    sub_products, products = sizes["sub_products"], sizes["products"]
+
+    def get(path_for):
+        return lambda rng: ("GET", path_for(rng), {}, b"")
+
+    def sub_product_update(rng):
+        body = json.dumps({"sort_order": rng.randint(0, 10)}).encode()
+        return "PUT", f"/admin/sub-products/{rng.randint(1, sub_products)}", admin, body
+
+    def customer_create(rng):
+        body = json.dumps({"name": f"Load test customer {rng.random():.12f}"}).encode()
+        return "POST", "/admin/customers", admin, body
+
+    def login(rng):
+        body = json.dumps({"username": BENCH_USER, "password": BENCH_PASSWORD}).encode()
+        return "POST", "/auth/login-json", json_headers, body
+
+    return {
+        "catalog": [
+            ("GET /public/categories", get(lambda rng: "/public/categories")),
+            ("GET /public/products", get(lambda rng: "/public/products?limit=50")),
+            ("GET /public/sub-products", get(lambda rng: f"/public/sub-products?limit=50&skip={rng.randint(0, 20) * 50}")),
+            ("GET /public/sub-products/{id}", get(lambda rng: f"/public/sub-products/{rng.randint(1, sub_products)}")),
+            ("GET /public/products/{id}/sub-products", get(lambda rng: f"/public/products/{rng.randint(1, products)}/sub-products")),
+            ("GET /public/sub-products/featured", get(lambda rng: "/public/sub-products/featured")),
+            ("GET /public/catalog", get(lambda rng: "/public/catalog?sections=services,solutions,customers,company_info")),
+        ],
+        "search": [
+            ("GET /public/sub-products/search", get(lambda rng: f"/public/sub-products/search?q={rng.choice(SEARCH_TERMS).replace(' ', '+')}")),
+        ],
+        "admin": [
+            ("GET /admin/sub-products", lambda rng: ("GET", "/admin/sub-products?limit=50", admin, b"")),
+            ("PUT /admin/sub-products/{id}", sub_product_update),
+            ("POST /admin/customers", customer_create),
+        ],
+        "login": [("POST /auth/login-json", login)],
+    }
+
+
+def parse_mix(value: str):
+    if value in MIXES:
+        return MIXES[value]
+    weights = {}
+    for part in value.split(","):
+        group, _, weight = part.partition("=")
+        weights[group.strip()] = float(weight or 1)
+    return weights
+
+
+def make_request_source(groups, weights, seed: int = 7):
+    unknown = set(weights) - set(groups)
+    if unknown:
+        raise SystemExit(f"unknown route groups: {', '.join(sorted(unknown))} (choose from {', '.join(groups)})")
+    rng = random.Random(seed)
+    names = [group for group, weight in weights.items() if weight > 0]
+    group_weights = [weights[group] for group in names]
+
+    def next_request():
+        group = rng.choices(names, weights=group_weights)[0]
+        label, factory = rng.choice(groups[group])
+        method, path, headers, body = factory(rng)
+        return label, method, path, headers, body
+
+    return next_request
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous, report, fail_over):
+    """Print per-route RPS / p95 changes; returns the routes over ``fail_over`` percent"""
+    rows = []
+    regressed = []
+    for route, stats in report.items():
+        before = previous.get(route)
+        if not before:
+            continue
+        rps_change = (stats["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+        p95_change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        flagged = fail_over is not None and p95_change > fail_over
+        if flagged:
+            regressed.append(route)
+        rows.append([
+            route, before["rps"], stats["rps"], f"{rps_change:+.1f}%",
+            before["p95_ms"], stats["p95_ms"], f"{p95_change:+.1f}%", "REGRESSED" if flagged else "",
+        ])
+    print_table(["route", "rps before", "rps", "change", "p95 before", "p95", "change", ""], rows)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", default="mixed", help=f"preset ({', '.join(MIXES)}) or group=weight,...")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of load discarded before measuring")
+    parser.add_argument("--sub-products", type=int, default=20000)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the catalog from a previous run")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="server setting, repeatable")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file of an earlier run")
+    parser.add_argument("--fail-over", type=float, help="exit 1 if a route's p95 grew by more than this percent")
+    args = parser.parse_args()
+
+    sizes = {"categories": 50, "products": max(1, args.sub_products // 20), "sub_products": args.sub_products}
+    if not args.skip_seed:
+        reset_database()
+        seed_catalog(**sizes)
+    db = SessionLocal()
+    try:
+        if crud.get_admin_by_username(db, BENCH_USER) is None:
+            crud.create_admin(db, schemas.AdminCreate(
+                username=BENCH_USER, email="loadtest@example.com", password=BENCH_PASSWORD
+            ))
+    finally:
+        db.close()
+    token = auth.create_access_token({"sub": BENCH_USER}, expires_delta=timedelta(hours=6))
+
+    env = {"LOGIN_ATTEMPTS_PER_IP": "0", "LOGIN_ATTEMPTS_PER_USERNAME": "0"}
+    env.update(dict(setting.split("=", 1) for setting in args.env))
+    weights = parse_mix(args.mix)
+    next_request = make_request_source(route_groups(sizes, token), weights)
+
+    with serve(env) as port:
+        if args.warmup > 0:
+            run_load(port, next_request, args.clients, args.warmup)
+        report = run_load(port, next_request, args.clients, args.duration)
+
+    print(f"\n{engine.dialect.name}, {args.clients} clients, {args.duration:.0f}s, mix {weights}\n")
+    print_table(REPORT_HEADERS, report_rows(args.mix, report))
+
+    if args.json:
+        payload = {
+            "meta": {
+                "commit": git_commit(),
+                "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "database": engine.dialect.name,
+                "python": platform.python_version(),
+                "clients": args.clients,
+                "duration": args.duration,
+                "mix": weights,
+                "sizes": sizes,
+                "env": env,
+            },
+            "results": report,
+        }
+        write_json(args.json, payload)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            previous = json.load(handle)
+        print(f"\nAgainst {args.compare} (commit {previous.get('meta', {}).get('commit', '?')})\n")
+        regressed = compare(previous.get("results", previous), report, args.fail_over)
+        if regressed:
+            print(f"\np95 regressed by more than {args.fail_over:g}% on: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
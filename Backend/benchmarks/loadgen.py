@@ -0,0 +1,177 @@
+"""
+Dependency-free HTTP load generator used by the server benchmarks.
+
+Each simulated client keeps one HTTP/1.1 keep-alive connection open and
+fires requests back to back, so a few hundred clients fit comfortably in a
+single asyncio loop.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(env: Optional[Dict[str, str]] = None, args: Optional[List[str]] = None, port: Optional[int] = None, timeout: float = 30):
+    """Run ``uvicorn main:app`` in a subprocess until the block exits"""
+    port = port or free_port()
+    command = args or [sys.executable, "-m", "uvicorn", "main:app", "--log-level", "warning"]
+    command = command + ["--host", "127.0.0.1", "--port", str(port)]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **(env or {})})
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.2)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class Connection:
+    """A single keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None, body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            await self.close()
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            content = b"".join(chunks)
+        else:
+            content = await self.reader.readexactly(int(response_headers.get("content-length", 0)))
+        if response_headers.get("connection") == "close":
+            await self.close()
+        return status, response_headers, content
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(Exception):
+                await self.writer.wait_closed()
+        self.reader = self.writer = None
+
+
+# A request is (route label, method, path, headers, body)
+Request = Tuple[str, str, str, Dict[str, str], bytes]
+
+
+async def _client(port: int, next_request: Callable[[], Request], stop_at: float, samples: list):
+    connection = Connection("127.0.0.1", port)
+    try:
+        while time.monotonic() < stop_at:
+            label, method, path, headers, body = next_request()
+            start = time.perf_counter()
+            try:
+                status, _, _ = await connection.request(method, path, headers, body)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+                status = 0
+                await connection.close()
+            samples.append((label, time.perf_counter() - start, status))
+    finally:
+        await connection.close()
+
+
+async def _run(port: int, next_request: Callable[[], Request], concurrency: int, duration: float):
+    samples: list = []
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(*(_client(port, next_request, stop_at, samples) for _ in range(concurrency)))
+    return samples
+
+
+def run_load(port: int, next_request: Callable[[], Request], concurrency: int = 50, duration: float = 10.0):
+    """Drive the server with ``concurrency`` clients for ``duration`` seconds"""
+    started = time.perf_counter()
+    samples = asyncio.run(_run(port, next_request, concurrency, duration))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def summarize(samples, elapsed: float) -> Dict[str, dict]:
+    """Per-route and overall RPS / latency percentiles (milliseconds)"""
+    by_route = defaultdict(list)
+    for label, latency, status in samples:
+        by_route[label].append((latency, status))
+        by_route["ALL"].append((latency, status))
+    report = {}
+    for label, entries in sorted(by_route.items()):
+        latencies = [latency for latency, _ in entries]
+        report[label] = {
+            "requests": len(entries),
+            "errors": sum(1 for _, status in entries if status == 0 or status >= 500),
+            "rps": round(len(entries) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return report
+
+
+def report_rows(name: str, report: Dict[str, dict]):
+    return [
+        [name, label, stats["requests"], stats["errors"], stats["rps"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]]
+        for label, stats in report.items()
+    ]
+
+
+REPORT_HEADERS = ["run", "route", "requests", "errors", "rps", "p50 ms", "p95 ms", "p99 ms"]
+
+
+def write_json(path: str, payload) -> None:
+    with open(path, "w") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming sub-product export and chunked import
+
+Exports the seeded sub-products to a temporary NDJSON and CSV file with
+``app.transfer.export_rows`` (what ``GET /admin/export/sub-products``
+streams), deletes them, re-imports each file with ``app.transfer.import_file``
+(what ``POST /admin/import/sub-products`` runs) and reports rows per second
+and the peak Python heap of each step. The peak should not grow with
+``--rows``: run it at two sizes to confirm the round trip is streaming.
+
+    python -m benchmarks.transfer --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import func
+
+from benchmarks.common import SessionLocal, engine, print_table, reset_database, seed_catalog
+from app import models, schemas, transfer
+from app.cache import catalog_cache
+
+
+def timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def sub_product_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.count(models.SubProduct.id)).scalar()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=50, products=2000, sub_products=args.rows)
+    catalog_cache.enabled = False
+
+    results = []
+    for format in schemas.TransferFormat:
+        path = os.path.join(tempfile.gettempdir(), f"sns_transfer_benchmark.{format.value}")
+
+        def export():
+            with open(path, "wb") as output:
+                for chunk in transfer.export_rows("sub_products", format):
+                    output.write(chunk)
+
+        _, elapsed, peak = timed(export)
+        size = os.path.getsize(path)
+        results.append([f"export {format.value}", f"{elapsed:.2f}", f"{args.rows / elapsed:.0f}", f"{peak / 2**20:.1f}"])
+
+        with engine.begin() as connection:
+            connection.execute(models.SubProduct.__table__.delete())
+
+        def load():
+            with open(path, "rb") as source:
+                return transfer.import_file("sub_products", source, format)
+
+        result, elapsed, peak = timed(load)
+        results.append([f"import {format.value}", f"{elapsed:.2f}", f"{args.rows / elapsed:.0f}", f"{peak / 2**20:.1f}"])
+        if result.failed or sub_product_count() != args.rows:
+            raise SystemExit(f"{format.value} round trip lost rows: {result.failed} failed, {result.errors[:3]}")
+        print(f"{format.value}: {size / 2**20:.1f} MiB file")
+        os.remove(path)
+
+    print(f"\n{engine.dialect.name}, {args.rows} sub-products\n")
+    print_table(["step", "seconds", "rows/s", "peak heap MiB"], results)
+
+
+if __name__ == "__main__":
+    main()
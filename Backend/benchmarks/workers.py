@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Load test: throughput as the number of workers grows
+
+Boots ``run.py`` (gunicorn with uvicorn workers, or ``--server uvicorn``)
+once per worker count against the same seeded database and drives public
+catalog reads with many concurrent keep-alive clients. Reports RPS, p50/p99
+and the speedup over one worker; past the number of CPUs it flattens out.
+
+    python -m benchmarks.workers --workers 1,2,4,8 --clients 200
+"""
+
+import argparse
+import itertools
+import os
+import sys
+
+from benchmarks.common import print_table, reset_database, seed_catalog
+from benchmarks.loadgen import run_load, serve, write_json
+
+PATHS = [
+    ("categories", "/public/categories"),
+    ("products", "/public/products?limit=50"),
+    ("sub-products", "/public/sub-products?limit=50"),
+    ("featured", "/public/sub-products/featured"),
+    ("services", "/public/services"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], default="gunicorn")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    reset_database()
+    seed_catalog(categories=20, products=200, sub_products=5000)
+
+    results = {}
+    rows = []
+    for workers in [int(count) for count in args.workers.split(",")]:
+        cycle = itertools.cycle(PATHS)
+
+        def next_request():
+            label, path = next(cycle)
+            return label, "GET", path, {}, b""
+
+        command = [sys.executable, "run.py", "--server", args.server, "--workers", str(workers)]
+        with serve({"WEB_RELOAD": "False"}, args=command, timeout=60) as port:
+            # Warm every worker's pool and cache before measuring
+            run_load(port, next_request, args.clients, 2.0)
+            report = run_load(port, next_request, args.clients, args.duration)
+        results[workers] = report["ALL"]
+        baseline = results[min(results)]["rps"]
+        stats = report["ALL"]
+        rows.append([
+            workers, stats["requests"], stats["errors"], stats["rps"], f"{stats['rps'] / baseline:.2f}x",
+            stats["p50_ms"], stats["p99_ms"],
+        ])
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"\n{args.server}, {args.clients} concurrent clients, {args.duration:.0f}s per run, {cpus} CPUs\n")
+    print_table(["workers", "requests", "errors", "rps", "speedup", "p50 ms", "p99 ms"], rows)
+    if args.json:
+        write_json(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
-from fastapi import FastAPI
+import asyncio
+import secrets
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
-from app import models
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.database import get_pool_stats
+from app.cache import catalog_cache
+from app.compression import CompressionMiddleware, compressed_body_cache
+from app.metrics import MetricsMiddleware, render_prometheus, route_metrics
 from app.routers import auth, admin, public
 from app.config import settings
+from app.conditional import NotModified, not_modified_handler
+from app.pagination import InvalidCursor, NEXT_CURSOR_HEADER
+from app.warmup import readiness, shut_down, warm_up
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
+# The schema is managed by Alembic (python -m app.migrate), never at import
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
@@ -40,8 +47,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        cache=compressed_body_cache,
+    )
+
+# Outermost, so the timing covers CORS, compression and error handling too
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, metrics=route_metrics, server_timing=settings.server_timing_header)
+
+
+app.add_exception_handler(NotModified, not_modified_handler)
+
+
+@app.exception_handler(InvalidCursor)
+def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": "Invalid cursor"})
+
+
+@app.on_event("startup")
+async def startup():
+    # Workers only start accepting connections once this returns, unless the
+    # warm-up runs in the background (then /ready answers 503 until it is done)
+    if not settings.warmup_on_startup:
+        return
+    if settings.warmup_in_background:
+        app.state.warmup_task = asyncio.create_task(warm_up())
+    else:
+        await warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await shut_down()
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(admin.router)
@@ -59,4 +105,39 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """200 once this worker's pools and caches are warm, 503 until then.
+
+    A worker that is not warm and not already warming up in the background
+    (warm-up disabled, or it failed) tries now, so the platform's readiness
+    probe is what warms it.
+    """
+    status = readiness()
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if not status["ready"] and (warmup_task is None or warmup_task.done()):
+        await warm_up()
+        status = readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint
+
+    Off in production until METRICS_TOKEN is set: the route latencies and pool
+    counters are not for the public.
+    """
+    if not settings.metrics_enabled or (settings.is_production and not settings.metrics_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.metrics_token and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.metrics_token}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(
+        render_prometheus(route_metrics, get_pool_stats(), catalog_cache.stats(), compressed_body_cache.stats()),
+        media_type="text/plain; version=0.0.4",
+    )
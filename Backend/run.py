@@ -1,16 +1,125 @@
 #!/usr/bin/env python3
 """
 Run script for the SNS FastAPI application
+
+Production (default): WEB_WORKERS processes (one per CPU when 0) under
+gunicorn with uvicorn workers, or ``uvicorn --workers`` when gunicorn is
+not installed (e.g. on Windows) or WEB_SERVER=uvicorn. uvicorn picks
+uvloop and httptools automatically when they are installed. Each worker
+warms its connection pool and catalog cache before accepting connections
+and finishes in-flight requests on SIGTERM (up to WEB_GRACEFUL_TIMEOUT
+seconds under gunicorn).
+
+Development: ``python run.py --reload`` (or WEB_RELOAD=True) runs a single
+auto-reloading process.
+
+``--migrate`` (or MIGRATE_ON_STARTUP=True) applies the Alembic migrations
+once, before any worker starts; otherwise run ``python -m app.migrate`` as a
+deploy step.
 """
 
+import argparse
+import os
+
 import uvicorn
 from app.config import settings
 
-if __name__ == "__main__":
+
+def run_development(host: str, port: int) -> None:
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.debug,
-        log_level="info"
-    )
\ No newline at end of file
+        host=host,
+        port=port,
+        reload=True,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        log_level="info",
+    )
+
+
+def run_uvicorn(host: str, port: int, workers: int) -> None:
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        timeout_keep_alive=settings.web_keepalive,
+        limit_max_requests=settings.web_max_requests or None,
+        log_level="info",
+    )
+
+
+def run_gunicorn(host: str, port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "graceful_timeout": settings.web_graceful_timeout,
+        # A worker busy warming up or serving must not be killed as stuck
+        "timeout": max(settings.web_graceful_timeout, 60),
+        "keepalive": settings.web_keepalive,
+        # UvicornWorker passes this on, with proxy headers enabled
+        "forwarded_allow_ips": settings.forwarded_allow_ips,
+        "max_requests": settings.web_max_requests,
+        "max_requests_jitter": settings.web_max_requests // 10,
+        "accesslog": "-",
+        "loglevel": "info",
+    }
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Imported in each worker after the fork, so no worker shares
+            # database connections with the master
+            from main import app
+            return app
+
+    Application().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.web_worker_count)
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], default=settings.web_server)
+    parser.add_argument("--reload", action="store_true", default=settings.web_reload)
+    parser.add_argument("--migrate", action="store_true", default=settings.migrate_on_startup)
+    args = parser.parse_args()
+
+    # Workers read the count too (the admin auth cache needs to know whether
+    # it is alone); spawned workers get it from the environment, forked ones
+    # from the settings object
+    workers = 1 if args.reload else args.workers
+    os.environ["WEB_WORKERS"] = str(workers)
+    settings.web_workers = workers
+
+    if args.migrate:
+        from app.migrate import migrate
+        migrate()
+
+    if args.reload:
+        run_development(args.host, args.port)
+        return
+    if args.server == "gunicorn":
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            args.server = "uvicorn"
+    if args.server == "gunicorn":
+        run_gunicorn(args.host, args.port, args.workers)
+    else:
+        run_uvicorn(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,7 +41,7 @@ echo "1. Make sure PostgreSQL is running"
 echo "2. Create database: CREATE DATABASE sns_db;"
 echo "3. Update .env file with your database credentials"
 echo "4. Run migration: python migration_script.py"
-echo "5. Start server: python run.py"
+echo "5. Start server: python run.py --reload"
 echo ""
 echo "📚 API Documentation will be available at: http://localhost:8000/docs"
 echo "🔐 Default admin credentials: admin / admin123"
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Fixtures for the test suite
+
+Every test gets freshly created tables in a throwaway SQLite database and an
+empty catalog cache. Run from the Backend directory:
+
+    python -m pytest
+"""
+
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sns-tests-"), "test.db")
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["ASYNC_DATABASE"] = "False"
+os.environ["WARMUP_ON_STARTUP"] = "False"
+os.environ["CATALOG_CACHE_BACKEND"] = "memory"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["WEB_WORKERS"] = "1"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import auth, crud, schemas  # noqa: E402
+from app.cache import catalog_cache  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+import main  # noqa: E402
+
+ADMIN_USERNAME = "test-admin"
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    catalog_cache.clear()
+    auth.admin_auth_cache.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(db):
+    crud.create_admin(db, schemas.AdminCreate(username=ADMIN_USERNAME, email="admin@example.com", password="secret"))
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': ADMIN_USERNAME})}"}
+
+
+@pytest.fixture
+def product(db):
+    category = crud.create_category(db, schemas.CategoryCreate(name="Networking"))
+    return crud.create_product(db, schemas.ProductCreate(name="Switches", category_id=category.id))
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import auth, crud, models, schemas
+from app.cache import CatalogCache, DiskBackend
+from tests.conftest import ADMIN_USERNAME
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    """Two catalog caches on one disk backend, standing in for two workers"""
+    path = os.path.join(tmp_path, "catalog.sqlite3")
+    this, other = [CatalogCache(100, 300, backend=DiskBackend(path, ttl=300, max_entries=100)) for _ in range(2)]
+    monkeypatch.setattr(auth, "catalog_cache", this)
+    return this, other
+
+
+def authenticate(db, headers):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=headers["Authorization"].split()[1])
+    return asyncio.run(auth.get_current_admin(credentials, db))
+
+
+def test_cached_authentication_skips_the_admin_query(db, admin_headers, workers):
+    authenticate(db, admin_headers)
+    db.query(models.Admin).update({models.Admin.email: "changed@example.com"})
+    db.commit()
+
+    assert authenticate(db, admin_headers).email == "admin@example.com"
+
+
+def test_admin_write_in_another_worker_drops_the_cached_authentication(db, admin_headers, workers):
+    this, other = workers
+    authenticate(db, admin_headers)
+    db.query(models.Admin).update({models.Admin.is_active: False})
+    db.commit()
+
+    other.invalidate(f"admin:{ADMIN_USERNAME}")
+
+    with pytest.raises(HTTPException) as exc_info:
+        authenticate(db, admin_headers)
+    assert exc_info.value.status_code == 401
+
+
+def test_update_admin_invalidates_through_the_backend(db, admin_headers, workers):
+    this, other = workers
+    authenticate(db, admin_headers)
+    admin_id = db.query(models.Admin.id).scalar()
+
+    crud.update_admin(db, admin_id, schemas.AdminUpdate(username="renamed"))
+
+    assert other.generation(f"admin:{ADMIN_USERNAME}") == 1
+    assert other.generation("admin:renamed") == 1
+    with pytest.raises(HTTPException):
+        authenticate(db, admin_headers)
+
+
+def test_unreachable_backend_skips_the_cache(db, admin_headers, tmp_path, monkeypatch):
+    broken = CatalogCache(100, 300, backend=DiskBackend(os.path.join(tmp_path, "cache.sqlite3"), 300, 100))
+    broken.backend.path = os.path.join(tmp_path, "missing", "cache.sqlite3")
+    broken.backend._local.connection = None
+    monkeypatch.setattr(auth, "catalog_cache", broken)
+
+    authenticate(db, admin_headers)
+
+    assert len(auth.admin_auth_cache) == 0
+    assert broken.errors == 1
+
+
+def test_shared_generation_lookups_stay_off_the_event_loop(db, admin_headers, workers, monkeypatch):
+    this, _ = workers
+    threads = []
+    generations = this.backend.generations
+
+    def record(entities):
+        threads.append(threading.current_thread())
+        return generations(entities)
+
+    monkeypatch.setattr(this.backend, "generations", record)
+    authenticate(db, admin_headers)
+    authenticate(db, admin_headers)
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,125 @@
+from app import models
+
+
+def names(db, model):
+    return [name for name, in db.query(model.name).order_by(model.name)]
+
+
+def test_bulk_create_reports_bad_rows_and_writes_the_rest(client, db, admin_headers, product):
+    response = client.post("/admin/sub-products/bulk", headers=admin_headers, json={"items": [
+        {"name": "A", "product_id": product.id, "sku": "SKU-1"},
+        {"product_id": product.id},
+        {"name": "C", "product_id": 999},
+        {"name": "D", "product_id": product.id, "sku": "SKU-1"},
+        {"name": "E", "product_id": product.id},
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 2
+    assert [(error["index"], error["error"]) for error in body["errors"]] == [
+        (1, "name: field required"),
+        (2, "product_id: products 999 does not exist"),
+        (3, "sku: 'SKU-1' is already used"),
+    ]
+    assert names(db, models.SubProduct) == ["A", "E"]
+
+
+def test_atomic_bulk_create_writes_nothing_when_a_row_fails(client, db, admin_headers):
+    db.add(models.Category(name="Networking"))
+    db.commit()
+
+    response = client.post("/admin/categories/bulk", headers=admin_headers, json={"atomic": True, "items": [
+        {"name": "Security"},
+        {"name": "Networking"},
+    ]})
+
+    body = response.json()
+    assert body["processed"] == 0
+    assert [(error["index"], error["error"]) for error in body["errors"]] == [(1, "name: 'Networking' is already used")]
+    assert names(db, models.Category) == ["Networking"]
+
+
+def test_bulk_update_checks_ids_and_applies_partial_updates(client, db, admin_headers, product):
+    first = models.SubProduct(name="A", product_id=product.id)
+    second = models.SubProduct(name="B", product_id=product.id)
+    db.add_all([first, second])
+    db.commit()
+
+    response = client.put("/admin/sub-products/bulk", headers=admin_headers, json={"items": [
+        {"id": first.id, "name": "A2"},
+        {"name": "no id"},
+        {"id": first.id, "name": "again"},
+        {"id": 999, "name": "missing"},
+        {"id": second.id, "product_id": 999},
+    ]})
+
+    body = response.json()
+    assert (body["processed"], body["ids"]) == (1, [first.id])
+    assert [(error["index"], error["id"], error["error"]) for error in body["errors"]] == [
+        (1, None, "id: field required"),
+        (2, first.id, "id: repeated in this request"),
+        (3, 999, "sub_products 999 does not exist"),
+        (4, second.id, "product_id: products 999 does not exist"),
+    ]
+    db.expire_all()
+    assert names(db, models.SubProduct) == ["A2", "B"]
+    assert second.product_id == product.id
+
+
+def test_atomic_bulk_update_keeps_every_row_when_one_fails(client, db, admin_headers, product):
+    sub_product = models.SubProduct(name="A", product_id=product.id)
+    db.add(sub_product)
+    db.commit()
+
+    response = client.put("/admin/sub-products/bulk", headers=admin_headers, json={"atomic": True, "items": [
+        {"id": sub_product.id, "name": "A2"},
+        {"id": 999, "name": "missing"},
+    ]})
+
+    assert response.json()["processed"] == 0
+    assert names(db, models.SubProduct) == ["A"]
+
+
+def test_bulk_delete_applies_the_cascades(client, db, admin_headers, product):
+    db.add(models.SubProduct(name="A", product_id=product.id))
+    db.commit()
+    category_id, product_id = product.category_id, product.id
+    assert [row["name"] for row in client.get("/public/sub-products").json()] == ["A"]
+
+    response = client.request("DELETE", "/admin/products/bulk", headers=admin_headers, json={
+        "ids": [product_id, product_id, 999],
+    })
+
+    body = response.json()
+    assert (body["processed"], body["ids"]) == (1, [product_id])
+    assert [(error["index"], error["error"]) for error in body["errors"]] == [
+        (1, "id: repeated in this request"),
+        (2, "products 999 does not exist"),
+    ]
+    assert db.query(models.SubProduct).count() == 0
+    assert client.get("/public/sub-products").json() == []
+
+    db.add(models.Product(name="Routers", category_id=category_id))
+    db.commit()
+    response = client.request("DELETE", "/admin/categories/bulk", headers=admin_headers, json={"ids": [category_id]})
+
+    assert response.json()["processed"] == 1
+    assert [row.category_id for row in db.query(models.Product)] == [None]
+    assert [row["category_id"] for row in client.get("/public/products").json()] == [None]
+
+
+def test_atomic_bulk_delete_keeps_every_row_when_one_fails(client, db, admin_headers, product):
+    response = client.request("DELETE", "/admin/products/bulk", headers=admin_headers, json={
+        "atomic": True, "ids": [product.id, 999],
+    })
+
+    assert response.json()["processed"] == 0
+    assert names(db, models.Product) == ["Switches"]
+
+
+def test_bulk_endpoints_need_an_admin(client, db):
+    response = client.post("/admin/categories/bulk", json={"items": [{"name": "Security"}]})
+
+    assert response.status_code == 403
+    assert names(db, models.Category) == []
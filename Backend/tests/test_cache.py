@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+from app.cache import DiskBackend, MemoryBackend, shared_across_workers
+from app.config import settings
+
+
+@pytest.mark.parametrize("workers, shared_backend, expected", [
+    (1, False, True),
+    (4, False, False),
+    (4, True, True),
+])
+def test_shared_across_workers(tmp_path, monkeypatch, workers, shared_backend, expected):
+    monkeypatch.setattr(settings, "web_workers", workers)
+    backend = DiskBackend(os.path.join(tmp_path, "cache.sqlite3"), 300, 100) if shared_backend else MemoryBackend()
+
+    assert shared_across_workers(backend) is expected
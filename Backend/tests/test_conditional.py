@@ -0,0 +1,52 @@
+from sqlalchemy import insert, update
+
+from app import conditional, crud, models
+
+
+def test_matching_etag_is_not_modified(client, db):
+    db.add(models.Category(name="Networking"))
+    db.commit()
+
+    first = client.get("/public/categories")
+    second = client.get("/public/categories", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+
+
+def test_write_within_the_same_second_changes_the_etag(client, db, admin_headers):
+    category = models.Category(name="Networking")
+    db.add(category)
+    db.commit()
+    first = client.get("/public/categories")
+    created_at, updated_at = category.created_at, category.updated_at
+
+    response = client.put(f"/admin/categories/{category.id}", headers=admin_headers, json={"name": "Security"})
+    assert response.status_code == 200
+    # Same row count and timestamps, as two writes within one second leave them
+    db.execute(update(models.Category).values(created_at=created_at, updated_at=updated_at))
+    db.commit()
+
+    second = client.get("/public/categories", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert [row["name"] for row in second.json()] == ["Security"]
+
+
+def test_write_in_another_worker_changes_the_etag(client, db, monkeypatch):
+    # Several workers on the per-process memory backend: this one never
+    # hears of the other workers' writes
+    monkeypatch.setattr(crud, "CACHE_SIGNATURES", False)
+    monkeypatch.setattr(conditional, "VERSIONED_ETAGS", False)
+    db.add(models.Category(name="Networking"))
+    db.commit()
+    first = client.get("/public/categories")
+    assert client.get("/public/categories", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    # Written straight to the database, so this process' cache is not invalidated
+    db.execute(insert(models.Category).values(name="Security", is_active=True))
+    db.commit()
+    second = client.get("/public/categories", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
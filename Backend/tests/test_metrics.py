@@ -0,0 +1,21 @@
+import pytest
+
+from app.config import settings
+
+
+@pytest.mark.parametrize("environment, token, authorization, status", [
+    ("development", "", None, 200),
+    ("production", "", None, 404),
+    ("production", "scrape", None, 401),
+    ("production", "scrape", "Bearer scrape", 200),
+])
+def test_metrics_endpoint_needs_a_token_in_production(client, monkeypatch, environment, token, authorization, status):
+    monkeypatch.setattr(settings, "environment", environment)
+    monkeypatch.setattr(settings, "metrics_token", token)
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == status
+    if status == 200:
+        assert "sns_http_requests_total" in response.text
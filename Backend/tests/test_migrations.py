@@ -0,0 +1,52 @@
+import importlib.util
+import os
+
+import pytest
+
+VERSIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions")
+
+
+def load_revision(filename):
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(VERSIONS, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+json_columns = load_revision("0004_json_columns.py")
+price_bounds = load_revision("0006_sub_product_price_bounds.py")
+
+
+@pytest.mark.parametrize("raw, kind, expected", [
+    (None, "array", None),
+    ("", "array", None),
+    ("  ", "object", None),
+    ("null", "array", None),
+    (" null ", "object", None),
+    ("PoE, Gigabit,\nFanless", "array", ["PoE", "Gigabit", "Fanless"]),
+    ('["PoE", null, 24]', "array", ["PoE", "24"]),
+    ('"PoE, Gigabit"', "array", ["PoE", "Gigabit"]),
+    ("24", "array", ["24"]),
+    ("true", "array", ["true"]),
+    ("[]", "array", []),
+    ('{"ports": "24"}', "object", {"ports": "24"}),
+    ("24 ports, 4 SFP", "object", {"details": "24 ports, 4 SFP"}),
+    ('"24 ports"', "object", {"details": "24 ports"}),
+    ("48", "object", {"details": "48"}),
+    ('["a"]', "object", {"details": '["a"]'}),
+])
+def test_json_columns_parse(raw, kind, expected):
+    assert json_columns._parse(raw, kind) == expected
+
+
+@pytest.mark.parametrize("text, bounds", [
+    ("$1,000 - $2,000", (1000, 2000)),
+    ("৳1,00,000", (100000, 100000)),
+    ("from $500", (500, None)),
+    ("24 ports, 2 x $50 - 4 x $80", (None, None)),
+    ("Contact us", (None, None)),
+    ("$10,000,000,000", (None, None)),
+    (None, (None, None)),
+])
+def test_price_bounds_backfill(text, bounds):
+    assert price_bounds._parse_price_range(text) == bounds
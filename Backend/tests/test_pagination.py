@@ -0,0 +1,87 @@
+import pytest
+
+from app import models
+from app.pagination import InvalidCursor, NullsLast, decode_cursor, encode_cursor
+
+ORDER = (models.SubProduct.sort_order, models.SubProduct.id)
+PRICE_ORDER = (NullsLast(models.SubProduct.price_min), models.SubProduct.id)
+CREATED_ORDER = (models.SubProduct.created_at, models.SubProduct.id)
+
+
+@pytest.mark.parametrize("order_by, values", [
+    (ORDER, [0, 12]),
+    (PRICE_ORDER, [99.5, 3]),
+    (PRICE_ORDER, [100, 3]),
+    (PRICE_ORDER, [None, 3]),
+    (CREATED_ORDER, ["2026-10-18T09:30:00", 3]),
+])
+def test_decode_cursor_round_trips(order_by, values):
+    decoded = decode_cursor(encode_cursor(values), order_by)
+
+    assert encode_cursor(decoded) == encode_cursor(values)
+
+
+@pytest.mark.parametrize("order_by, values", [
+    (ORDER, [0, "12"]),
+    (ORDER, ["0", 12]),
+    (ORDER, [0, 1.5]),
+    (ORDER, [True, 12]),
+    (ORDER, [None, 12]),
+    (ORDER, [[0], 12]),
+    (ORDER, [0]),
+    (PRICE_ORDER, ["cheap", 3]),
+    (PRICE_ORDER, [100, None]),
+    (CREATED_ORDER, ["yesterday", 3]),
+    (CREATED_ORDER, [1760000000, 3]),
+])
+def test_decode_cursor_rejects_wrong_types(order_by, values):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor(values), order_by)
+
+
+def test_wrong_typed_cursor_is_a_bad_request(client, db, product):
+    response = client.get("/public/sub-products", params={"cursor": encode_cursor(["0", {"id": 1}])})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+    response = client.get("/public/sub-products", params={"cursor": encode_cursor([0, 1]), "sort": "price"})
+    assert response.status_code == 200
+
+
+def test_no_next_cursor_when_the_last_page_is_full(client, db, product):
+    for index in range(4):
+        db.add(models.SubProduct(name=f"Item {index}", product_id=product.id, sort_order=index))
+    db.commit()
+
+    first = client.get("/public/sub-products", params={"cursor": "", "limit": 2})
+    assert [row["name"] for row in first.json()] == ["Item 0", "Item 1"]
+    second = client.get("/public/sub-products", params={"cursor": first.headers["X-Next-Cursor"], "limit": 2})
+
+    assert [row["name"] for row in second.json()] == ["Item 2", "Item 3"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_null_sort_order_is_stored_as_zero_and_pages_across(client, db, admin_headers, product):
+    ids = []
+    for index, sort_order in enumerate([None, 1, None, 2]):
+        response = client.post("/admin/sub-products", headers=admin_headers, json={
+            "name": f"Item {index}", "product_id": product.id, "sort_order": sort_order,
+        })
+        ids.append(response.json()["id"])
+    assert response.json()["sort_order"] == 2
+
+    rejected = client.put(f"/admin/sub-products/{ids[1]}", headers=admin_headers, json={"sort_order": None})
+    assert rejected.status_code == 422
+    bulk = client.put("/admin/sub-products/bulk", headers=admin_headers, json={"items": [
+        {"id": ids[3], "sort_order": None},
+    ]})
+    assert bulk.json()["processed"] == 0
+
+    # Page 1 ends on a row created with a null sort_order
+    first = client.get("/public/sub-products", params={"cursor": "", "limit": 2})
+    assert [row["id"] for row in first.json()] == [ids[0], ids[2]]
+    second = client.get("/public/sub-products", params={"cursor": first.headers["X-Next-Cursor"], "limit": 2})
+
+    assert second.status_code == 200
+    assert [row["id"] for row in second.json()] == [ids[1], ids[3]]
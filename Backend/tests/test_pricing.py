@@ -0,0 +1,44 @@
+import pytest
+
+from app.pricing import parse_price_range
+
+
+@pytest.mark.parametrize("text, bounds", [
+    ("$1,000 - $2,000", (1000, 2000)),
+    ("$100 to $200", (100, 200)),
+    ("1,000 USD - 2,000 USD", (1000, 2000)),
+    ("1000 - 2000", (1000, 2000)),
+    ("$300", (300, 300)),
+    ("BDT 500", (500, 500)),
+    ("$1.5k", (1500, 1500)),
+    ("from $500", (500, None)),
+    ("Starting at ৳1,500", (1500, None)),
+    ("$500+", (500, None)),
+    ("up to 1.5k USD", (None, 1500)),
+    ("$0 - $50", (0, 50)),
+    # Lakh grouping in a BDT catalog
+    ("৳1,00,000 - ৳2,50,000", (100000, 250000)),
+    ("Tk 12,34,567", (1234567, 1234567)),
+    # Space thousands separators, including the no-break ones
+    ("USD 1 000 - 2 000", (1000, 2000)),
+    ("USD 1 000 - 2 000", (1000, 2000)),
+    # Quantities, percentages and model numbers are not prices
+    ("$2,000 (4 units)", (2000, 2000)),
+    ("$300 + VAT 15%", (300, 300)),
+    ("Model X200: $300", (300, 300)),
+    ("10-20%", (None, None)),
+    ("X200-300", (None, None)),
+    # Ambiguous or missing amounts get no bounds
+    ("$100 or $200", (None, None)),
+    ("$1,000 - $2,000 (save $200)", (None, None)),
+    ("Contact us", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+    # NUMERIC(12, 2) holds at most 9,999,999,999.99
+    ("$9,999,999,999.99", (9999999999.99, 9999999999.99)),
+    ("$10,000,000,000", (None, None)),
+    ("$100 - $99999999999999", (None, None)),
+    ("$" + "9" * 400, (None, None)),
+])
+def test_parse_price_range(text, bounds):
+    assert parse_price_range(text) == bounds
@@ -0,0 +1,73 @@
+"""
+List endpoints run a fixed number of queries per request
+
+A page of 50 rows must cost exactly as many queries as a page of 5; anything
+more means a relationship is loaded once per row while the response is
+serialized (an N+1). Such a lazy load normally raises (see
+``crud.RESPONSE_LOADS``), which shows up here as a failed request.
+"""
+
+import typing
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import event, func
+
+from app import models, schemas
+from app.cache import catalog_cache
+from app.config import settings
+from app.database import engine
+from benchmarks.common import seed_catalog
+import main
+
+EXTRA_PARAMS = {"/search": "q=device"}
+
+
+def list_paths():
+    """GET endpoints answering with a list (and the catalog tree)"""
+    paths = []
+    for route in main.app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if typing.get_origin(route.response_model) is not list and route.response_model is not schemas.Catalog:
+            continue
+        query = next((params for suffix, params in EXTRA_PARAMS.items() if route.path.endswith(suffix)), "")
+        paths.append((route.path, query))
+    return paths
+
+
+def count_queries(client, url, headers):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+@pytest.mark.parametrize("fast_json", [False, True], ids=["orm", "rows"])
+@pytest.mark.parametrize("path, query", list_paths(), ids=[path for path, _ in list_paths()])
+def test_queries_do_not_grow_with_the_page(client, db, admin_headers, monkeypatch, path, query, fast_json):
+    seed_catalog(categories=10, products=20, sub_products=200)
+    product_id, = db.query(models.SubProduct.product_id).group_by(models.SubProduct.product_id).order_by(
+        func.count(models.SubProduct.id).desc()
+    ).first()
+    monkeypatch.setattr(catalog_cache, "enabled", False)
+    monkeypatch.setattr(settings, "fast_json_responses", fast_json)
+    headers = admin_headers if path.startswith("/admin") else {}
+    # The first authenticated request also looks the admin up; keep it out of the counts
+    client.get("/admin/categories", headers=admin_headers)
+    path = path.replace("{product_id}", str(product_id))
+
+    small, large = (
+        count_queries(client, f"{path}?{'&'.join(filter(None, [query, f'limit={size}']))}", headers)
+        for size in (5, 50)
+    )
+
+    assert small == large
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+import main
+import run
+from app.config import settings
+from app.ratelimit import SlidingWindowLimiter
+from app.routers import auth as auth_router
+
+
+@pytest.fixture
+def launch_options(monkeypatch):
+    """Server options run.py would start with, trusting any proxy"""
+    monkeypatch.setattr(settings, "forwarded_allow_ips", "*")
+    captured = {}
+    monkeypatch.setattr(run.uvicorn, "run", lambda app, **options: captured.update(options))
+    run.run_uvicorn("127.0.0.1", 8000, 2)
+    return captured
+
+
+def test_login_throttle_keys_on_the_forwarded_client_ip(db, launch_options, monkeypatch):
+    monkeypatch.setattr(auth_router, "ip_limiter", SlidingWindowLimiter(1, 60))
+    monkeypatch.setattr(auth_router, "username_limiter", SlidingWindowLimiter(0, 60))
+    assert launch_options["proxy_headers"]
+    # What uvicorn wraps the app in when proxy_headers is on
+    app = ProxyHeadersMiddleware(main.app, trusted_hosts=launch_options["forwarded_allow_ips"])
+
+    def login(client_ip):
+        with TestClient(app) as client:
+            return client.post(
+                "/auth/login-json",
+                json={"username": "nobody", "password": "wrong"},
+                headers={"X-Forwarded-For": client_ip},
+            ).status_code
+
+    assert login("203.0.113.7") == 401
+    assert login("198.51.100.23") == 401
+    assert login("203.0.113.7") == 429
+
+
+def test_gunicorn_trusts_the_configured_proxies(monkeypatch):
+    # Not installed on Windows, where run.py falls back to uvicorn
+    BaseApplication = pytest.importorskip("gunicorn.app.base").BaseApplication
+    monkeypatch.setattr(settings, "forwarded_allow_ips", "10.0.0.1,10.0.0.2")
+    applications = []
+    monkeypatch.setattr(BaseApplication, "run", lambda self: applications.append(self))
+
+    run.run_gunicorn("127.0.0.1", 8000, 2)
+
+    (application,) = applications
+    assert application.cfg.forwarded_allow_ips == ["10.0.0.1", "10.0.0.2"]
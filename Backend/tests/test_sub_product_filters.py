@@ -0,0 +1,57 @@
+import pytest
+
+from app import crud, schemas
+from app.config import settings
+
+
+def add_sub_products(db, product, price_ranges):
+    for index, price_range in enumerate(price_ranges):
+        crud.create_sub_product(db, schemas.SubProductCreate(
+            name=f"Item {index}", product_id=product.id, price_range=price_range
+        ))
+
+
+def test_sort_by_price_lists_unpriced_last(client, db, product):
+    add_sub_products(db, product, ["Contact us", "$300", None, "$100 - $200", "from $250"])
+
+    response = client.get("/public/sub-products", params={"sort": "price"})
+
+    assert response.status_code == 200
+    assert [row["price_min"] for row in response.json()] == [100, 250, 300, None, None]
+
+
+def test_sort_by_price_pages_through_unpriced_rows_with_a_cursor(client, db, product):
+    add_sub_products(db, product, ["Contact us", "$300", None, "$100 - $200", "from $250", "TBA"])
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/public/sub-products", params={"sort": "price", "limit": 2, "cursor": cursor})
+        assert response.status_code == 200
+        seen += [row["name"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert seen == ["Item 3", "Item 4", "Item 1", "Item 0", "Item 2", "Item 5"]
+
+
+def test_price_bounds_filter_on_the_whole_range(client, db, product):
+    add_sub_products(db, product, ["$800 - $1,200", "$400 - $900", "from $1,000", "$1,500"])
+
+    response = client.get("/public/sub-products", params={"min_price": 500, "max_price": 2000})
+
+    assert [row["name"] for row in response.json()] == ["Item 0", "Item 3"]
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_category_filter_forgets_a_deleted_category(client, db, admin_headers, product, monkeypatch, fast_json):
+    monkeypatch.setattr(settings, "fast_json_responses", fast_json)
+    add_sub_products(db, product, ["$100"])
+    params = {"category_id": product.category_id}
+
+    before = client.get("/public/sub-products", params=params)
+    assert [row["name"] for row in before.json()] == ["Item 0"]
+
+    assert client.delete(f"/admin/categories/{product.category_id}", headers=admin_headers).status_code == 200
+    after = client.get("/public/sub-products", params=params, headers={"If-None-Match": before.headers["ETag"]})
+
+    assert after.status_code == 200
+    assert after.json() == []
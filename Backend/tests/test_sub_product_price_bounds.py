@@ -0,0 +1,98 @@
+import io
+import json
+
+from sqlalchemy import update
+
+from app import models
+
+
+def bounds(db, sub_product_id):
+    db.expire_all()
+    row = db.get(models.SubProduct, sub_product_id)
+    return row.price_min, row.price_max
+
+
+def create(client, admin_headers, product, **fields):
+    response = client.post(
+        "/admin/sub-products", headers=admin_headers, json={"name": "Switch", "product_id": product.id, **fields}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_create_derives_bounds_from_price_range(client, db, admin_headers, product):
+    created = create(client, admin_headers, product, price_range="$500 - $600")
+
+    assert (created["price_min"], created["price_max"]) == (500, 600)
+    assert bounds(db, created["id"]) == (500, 600)
+
+
+def test_client_supplied_bounds_are_ignored(client, db, admin_headers, product):
+    created = create(client, admin_headers, product, price_min=1, price_max=2)
+
+    assert created["price_range"] is None
+    assert bounds(db, created["id"]) == (None, None)
+
+
+def test_put_without_price_range_keeps_bounds_in_sync(client, db, admin_headers, product):
+    created = create(client, admin_headers, product, price_range="$500 - $600")
+
+    response = client.put(f"/admin/sub-products/{created['id']}", headers=admin_headers, json={"price_min": 3})
+    assert response.status_code == 200
+    assert bounds(db, created["id"]) == (500, 600)
+
+    response = client.put(f"/admin/sub-products/{created['id']}", headers=admin_headers, json={"name": "Renamed"})
+    assert (response.json()["price_min"], response.json()["price_max"]) == (500, 600)
+
+
+def test_put_recomputes_bounds_from_the_final_price_range(client, db, admin_headers, product):
+    created = create(client, admin_headers, product, price_range="$500 - $600")
+    # Bounds that drifted away from the text, e.g. written before they were derived
+    db.execute(update(models.SubProduct).values(price_min=1, price_max=2))
+    db.commit()
+
+    client.put(f"/admin/sub-products/{created['id']}", headers=admin_headers, json={"name": "Renamed"})
+    assert bounds(db, created["id"]) == (500, 600)
+
+    client.put(f"/admin/sub-products/{created['id']}", headers=admin_headers, json={"price_range": "Contact us"})
+    assert bounds(db, created["id"]) == (None, None)
+
+
+def test_bulk_writes_derive_bounds(client, db, admin_headers, product):
+    response = client.post("/admin/sub-products/bulk", headers=admin_headers, json={"items": [
+        {"name": "A", "product_id": product.id, "price_range": "$100", "price_min": 7},
+        {"name": "B", "product_id": product.id, "price_range": "from $250"},
+    ]})
+    assert response.json()["processed"] == 2
+    first, second = [row.id for row in db.query(models.SubProduct.id).order_by(models.SubProduct.name)]
+    assert bounds(db, first) == (100, 100)
+    assert bounds(db, second) == (250, None)
+
+    db.execute(update(models.SubProduct).where(models.SubProduct.id == first).values(price_min=1))
+    db.commit()
+    response = client.put("/admin/sub-products/bulk", headers=admin_headers, json={"items": [
+        {"id": first, "name": "A2", "price_max": 9},
+        {"id": second, "price_range": "$300 - $400"},
+    ]})
+    assert response.json()["processed"] == 2
+    assert bounds(db, first) == (100, 100)
+    assert bounds(db, second) == (300, 400)
+
+
+def test_import_derives_bounds(client, db, admin_headers, product):
+    records = [
+        {"id": 50, "name": "A", "product_id": product.id, "price_range": "$100 - $200", "price_min": 1},
+        {"name": "B", "product_id": product.id, "price_range": "৳1,00,000"},
+    ]
+    body = "\n".join(json.dumps(record) for record in records).encode()
+
+    response = client.post(
+        "/admin/import/sub-products?format=ndjson", headers=admin_headers,
+        files={"file": ("sub-products.ndjson", io.BytesIO(body))},
+    )
+
+    assert response.json()["processed"] == 2
+    rows = db.query(models.SubProduct.name, models.SubProduct.price_min, models.SubProduct.price_max).order_by(
+        models.SubProduct.name
+    ).all()
+    assert [tuple(row) for row in rows] == [("A", 100, 200), ("B", 100000, 100000)]
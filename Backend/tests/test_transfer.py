@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+
+from app import crud, models, schemas, transfer
+
+
+@pytest.fixture
+def sub_products(db, product):
+    db.add_all([
+        models.SubProduct(**crud.with_derived_columns(models.SubProduct, {
+            "name": f"Switch {number}", "product_id": product.id, "sku": f"SKU-{number}",
+            "price_range": f"${number}00", "tags": ["network", "poe"], "specifications": {"ports": number * 8},
+            "is_featured": number == 1,
+        }))
+        for number in (1, 2, 3)
+    ])
+    db.add(models.SubProduct(name="Old switch", product_id=product.id, is_active=False, description="Line one\nTwo"))
+    db.commit()
+
+
+def export(client, admin_headers, entity, format):
+    response = client.get(f"/admin/export/{entity}?format={format}", headers=admin_headers)
+    assert response.status_code == 200
+    return response
+
+
+def upload(client, admin_headers, entity, filename, body, format=None):
+    url = f"/admin/import/{entity}" + (f"?format={format}" if format else "")
+    return client.post(url, headers=admin_headers, files={"file": (filename, io.BytesIO(body))})
+
+
+def test_export_is_streamed_one_batch_per_chunk(db, sub_products, monkeypatch):
+    monkeypatch.setattr(crud, "EXPORT_BATCH_SIZE", 3)
+
+    ndjson = list(transfer.export_rows("sub_products", schemas.TransferFormat.ndjson))
+    csv = list(transfer.export_rows("sub_products", schemas.TransferFormat.csv))
+
+    assert [chunk.count(b"\n") for chunk in ndjson] == [3, 1]
+    assert csv[0].startswith(b"name,description,")
+    assert len(csv) == 2
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+def test_export_reimports_as_is(client, db, admin_headers, sub_products, format):
+    exported = export(client, admin_headers, "sub-products", format)
+    assert exported.headers["content-type"].startswith(transfer.MEDIA_TYPES[schemas.TransferFormat(format)])
+    assert exported.headers["content-disposition"] == f'attachment; filename="sub-products.{format}"'
+    db.query(models.SubProduct).delete()
+    db.commit()
+
+    response = upload(client, admin_headers, "sub-products", f"export.{format}", exported.content)
+
+    assert response.json() == {"processed": 4, "failed": 0, "errors": []}
+    assert export(client, admin_headers, "sub-products", format).content == exported.content
+
+
+def test_import_replaces_rows_by_id_and_inserts_the_rest(client, db, admin_headers, product, monkeypatch):
+    monkeypatch.setattr(crud, "IMPORT_CHUNK_SIZE", 2)
+    db.add(models.SubProduct(id=7, name="Switch", product_id=product.id))
+    db.commit()
+    assert [row["name"] for row in client.get("/public/sub-products").json()] == ["Switch"]
+    body = "id,name,product_id,is_active\n7,Switch 24,{0},\n,Router,{0},false\n,Firewall,{0},true\n".format(product.id)
+
+    response = upload(client, admin_headers, "sub-products", "rows.csv", body.encode())
+
+    assert response.json()["processed"] == 3
+    rows = db.query(models.SubProduct.name, models.SubProduct.is_active).order_by(models.SubProduct.name)
+    assert [tuple(row) for row in rows] == [("Firewall", True), ("Router", False), ("Switch 24", True)]
+    assert [row["name"] for row in client.get("/public/sub-products").json()] == ["Switch 24", "Firewall"]
+
+
+def test_import_reports_bad_records_by_number(client, db, admin_headers, product):
+    lines = [
+        json.dumps({"name": "Switch", "product_id": product.id}),
+        "",
+        "{not json",
+        json.dumps(["a list"]),
+        json.dumps({"product_id": product.id}),
+        json.dumps({"name": "Orphan", "product_id": 999}),
+        json.dumps({"id": "seven", "name": "Router", "product_id": product.id}),
+    ]
+
+    response = upload(client, admin_headers, "sub-products", "rows.ndjson", "\n".join(lines).encode())
+
+    body = response.json()
+    assert (body["processed"], body["failed"]) == (1, 5)
+    assert [(error["index"], error["error"]) for error in body["errors"]] == [
+        (2, "not a JSON object"),
+        (3, "not a JSON object"),
+        (4, "name: field required"),
+        (5, "product_id: products 999 does not exist"),
+        (6, "id: value is not a valid integer"),
+    ]
+    assert [name for name, in db.query(models.SubProduct.name)] == ["Switch"]
+
+
+def test_import_keeps_only_the_first_errors(client, db, admin_headers, monkeypatch):
+    monkeypatch.setattr(crud, "IMPORT_MAX_ERRORS", 2)
+
+    response = upload(client, admin_headers, "categories", "rows.ndjson", b"1\n2\n3\n")
+
+    body = response.json()
+    assert (body["processed"], body["failed"]) == (0, 3)
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+
+
+def test_import_needs_a_known_format(client, db, admin_headers):
+    response = upload(client, admin_headers, "categories", "rows.txt", b'{"name": "Networking"}\n')
+    assert response.status_code == 400
+
+    response = upload(client, admin_headers, "categories", "rows.txt", b'{"name": "Networking"}\n', format="ndjson")
+    assert response.json()["processed"] == 1
@@ -62,7 +62,7 @@ export default function Services() {
       name: service.name,
       description: service.description,
       category_id: service.category_id,
-      features: service.features,
+      features: service.features ? JSON.stringify(service.features) : '',
     });
     setShowModal(true);
   };
@@ -94,9 +94,9 @@ export default function Services() {
     return category ? category.name : 'No Category';
   };
 
-  const parseFeatures = (featuresString: string): string[] => {
+  const parseFeatures = (features: string | string[] | null): string[] => {
     try {
-      return JSON.parse(featuresString);
+      return typeof features === 'string' ? JSON.parse(features) : features ?? [];
     } catch {
       return [];
     }
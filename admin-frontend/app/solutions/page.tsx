@@ -51,7 +51,7 @@ export default function Solutions() {
     reset({
       name: solution.name,
       description: solution.description,
-      features: solution.features,
+      features: solution.features ? JSON.stringify(solution.features) : '',
     });
     setShowModal(true);
   };
@@ -78,9 +78,9 @@ export default function Solutions() {
     }
   };
 
-  const parseFeatures = (featuresString: string): string[] => {
+  const parseFeatures = (features: string | string[] | null): string[] => {
     try {
-      return JSON.parse(featuresString);
+      return typeof features === 'string' ? JSON.parse(features) : features ?? [];
     } catch {
       return [];
     }
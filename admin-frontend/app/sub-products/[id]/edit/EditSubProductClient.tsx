@@ -26,9 +26,9 @@ interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
   currency: string;
   availability_status: string;
@@ -36,7 +36,7 @@ interface SubProduct {
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -131,9 +131,9 @@ export default function EditSubProductClient() {
         sku: subProduct.sku,
         brand: subProduct.brand,
         model: subProduct.model,
-        specifications: subProduct.specifications,
-        features: subProduct.features,
-        images: subProduct.images,
+        specifications: JSON.stringify(subProduct.specifications ?? {}),
+        features: JSON.stringify(subProduct.features ?? []),
+        images: JSON.stringify(subProduct.images ?? []),
         price_range: subProduct.price_range,
         currency: subProduct.currency,
         availability_status: subProduct.availability_status,
@@ -141,7 +141,7 @@ export default function EditSubProductClient() {
         support_info: subProduct.support_info,
         documentation_url: subProduct.documentation_url,
         datasheet_url: subProduct.datasheet_url,
-        tags: subProduct.tags,
+        tags: JSON.stringify(subProduct.tags ?? []),
         meta_title: subProduct.meta_title,
         meta_description: subProduct.meta_description,
         is_active: subProduct.is_active,
@@ -151,28 +151,28 @@ export default function EditSubProductClient() {
 
       // Parse JSON fields
       try {
-        const specs = JSON.parse(subProduct.specifications);
+        const specs = subProduct.specifications ?? {};
         setSpecificationsList(Object.entries(specs).map(([key, value]) => ({ key, value: value as string })));
       } catch {
         setSpecificationsList([]);
       }
 
       try {
-        const features = JSON.parse(subProduct.features);
+        const features = subProduct.features ?? [];
         setFeaturesList(features.length > 0 ? features : ['']);
       } catch {
         setFeaturesList(['']);
       }
 
       try {
-        const images = JSON.parse(subProduct.images);
+        const images = subProduct.images ?? [];
         setImagesList(images.length > 0 ? images : ['']);
       } catch {
         setImagesList(['']);
       }
 
       try {
-        const tags = JSON.parse(subProduct.tags);
+        const tags = subProduct.tags ?? [];
         setTagsList(tags.length > 0 ? tags : ['']);
       } catch {
         setTagsList(['']);
@@ -19,9 +19,9 @@ interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
   currency: string;
   availability_status: string;
@@ -29,7 +29,7 @@ interface SubProduct {
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -125,16 +125,16 @@ export default function SubProductsPage() {
     }
   };
 
-  const parseJSON = (jsonString: string) => {
+  const parseJSON = (value: unknown) => {
     try {
-      return JSON.parse(jsonString);
+      return typeof value === 'string' ? JSON.parse(value) : value ?? [];
     } catch {
       return [];
     }
   };
 
-  const getFirstImage = (imagesJson: string) => {
-    const images = parseJSON(imagesJson);
+  const getFirstImage = (imagesValue: unknown) => {
+    const images = parseJSON(imagesValue);
     return images.length > 0 ? images[0] : (defaultImages?.product_image || 'https://picsum.photos/400/300?random=1');
   };
 
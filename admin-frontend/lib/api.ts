@@ -89,6 +89,23 @@ export const adminAPI = {
   updateCustomer: (id: number, data: CustomerUpdate) => api.put(`/admin/customers/${id}`, data),
   deleteCustomer: (id: number) => api.delete(`/admin/customers/${id}`),
 
+  // Bulk operations (entity: categories, products, sub-products, services, solutions, customers)
+  bulkCreate: (entity: string, items: object[], atomic?: boolean) => api.post(`/admin/${entity}/bulk`, { items, atomic }),
+  bulkUpdate: (entity: string, items: object[], atomic?: boolean) => api.put(`/admin/${entity}/bulk`, { items, atomic }),
+  bulkDelete: (entity: string, ids: number[], atomic?: boolean) => api.delete(`/admin/${entity}/bulk`, { data: { ids, atomic } }),
+
+  // Import / export (format: ndjson or csv)
+  exportEntity: (entity: string, format: 'ndjson' | 'csv' = 'ndjson') =>
+    api.get(`/admin/export/${entity}`, { params: { format }, responseType: 'blob' }),
+  importEntity: (entity: string, file: File, format?: 'ndjson' | 'csv') => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post(`/admin/import/${entity}`, formData, {
+      params: { format },
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+
   // Company Info
   getCompanyInfo: () => api.get('/admin/company-info'),
   updateCompanyInfo: (data: CompanyInfoUpdate) => api.put('/admin/company-info', data),
@@ -153,9 +170,9 @@ export interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
   currency: string;
   availability_status: string;
@@ -163,7 +180,7 @@ export interface SubProduct {
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -228,7 +245,7 @@ export interface Service {
   name: string;
   description: string;
   category_id: number;
-  features: string;
+  features: string[] | null;
   is_active: boolean;
   created_at: string;
   updated_at: string | null;
@@ -254,7 +271,7 @@ export interface Solution {
   id: number;
   name: string;
   description: string;
-  features: string;
+  features: string[] | null;
   is_active: boolean;
   created_at: string;
   updated_at: string | null;
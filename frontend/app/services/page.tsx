@@ -22,9 +22,9 @@ export default function Services() {
     fetchServices();
   }, []);
 
-  const parseFeatures = (featuresString: string): string[] => {
+  const parseFeatures = (features: string | string[] | null): string[] => {
     try {
-      return JSON.parse(featuresString);
+      return typeof features === 'string' ? JSON.parse(features) : features ?? [];
     } catch {
       return [];
     }
@@ -27,9 +27,9 @@ interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
   currency: string;
   availability_status: string;
@@ -37,7 +37,7 @@ interface SubProduct {
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -76,9 +76,9 @@ export default function SubProductDetailClient() {
     }
   }, [params.id]);
 
-  const parseJSON = (jsonString: string) => {
+  const parseJSON = (value: unknown) => {
     try {
-      return JSON.parse(jsonString);
+      return typeof value === 'string' ? JSON.parse(value) : value ?? [];
     } catch {
       return [];
     }
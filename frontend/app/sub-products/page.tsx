@@ -22,9 +22,9 @@ interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
   currency: string;
   availability_status: string;
@@ -32,7 +32,7 @@ interface SubProduct {
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -84,9 +84,9 @@ export default function SubProductsPage() {
     fetchData();
   }, []);
 
-  const parseJSON = (jsonString: string) => {
+  const parseJSON = (value: unknown) => {
     try {
-      return JSON.parse(jsonString);
+      return typeof value === 'string' ? JSON.parse(value) : value ?? [];
     } catch {
       return [];
     }
@@ -108,8 +108,8 @@ export default function SubProductsPage() {
     return product ? product.name : 'Unknown Product';
   };
 
-  const getFirstImage = (imagesJson: string) => {
-    const images = parseJSON(imagesJson);
+  const getFirstImage = (imagesValue: unknown) => {
+    const images = parseJSON(imagesValue);
     return images.length > 0 ? images[0] : (defaultImages?.product_image || 'https://via.placeholder.com/400x300/0066CC/FFFFFF?text=Product+Image');
   };
 
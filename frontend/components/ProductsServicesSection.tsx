@@ -19,9 +19,9 @@ export default function ProductsServicesSection() {
     fetchSolutions();
   }, []);
 
-  const parseFeatures = (featuresString: string): string[] => {
+  const parseFeatures = (features: string | string[] | null): string[] => {
     try {
-      return JSON.parse(featuresString);
+      return typeof features === 'string' ? JSON.parse(features) : features ?? [];
     } catch {
       return [];
     }
@@ -19,7 +19,9 @@ export const apiEndpoints = {
   getCompanyInfo: () => api.get('/public/company-info'),
   getCategories: () => api.get('/public/categories'),
   getProducts: () => api.get('/public/products'),
-  getSubProducts: (productId?: number) => api.get('/public/sub-products', { params: { product_id: productId } }),
+  getSubProducts: (productId?: number, filters?: SubProductFilters) =>
+    api.get('/public/sub-products', { params: { product_id: productId, ...filters } }),
+  getSubProductFacets: (filters?: SubProductFilters) => api.get('/public/sub-products/facets', { params: filters }),
   getSubProduct: (id: number) => api.get(`/public/sub-products/${id}`),
   getSubProductsByProduct: (productId: number) => api.get(`/public/products/${productId}/sub-products`),
   getFeaturedSubProducts: (limit?: number) => api.get('/public/sub-products/featured', { params: { limit } }),
@@ -28,6 +30,7 @@ export const apiEndpoints = {
   getSolutions: () => api.get('/public/solutions'),
   getCustomers: () => api.get('/public/customers'),
   getDefaultImages: () => api.get('/public/default-images'),
+  getCatalog: (sections?: string, fields?: string) => api.get('/public/catalog', { params: { sections, fields } }),
 };
 
 // Types
@@ -70,6 +73,28 @@ export interface Product {
   category?: Category;
 }
 
+export interface SubProductFilters {
+  min_price?: number;
+  max_price?: number;
+  brand?: string;
+  availability_status?: string;
+  currency?: string;
+  is_featured?: boolean;
+  category_id?: number;
+  sort?: 'price';
+}
+
+export interface FacetCount {
+  value: string | number | boolean;
+  label: string | null;
+  count: number;
+}
+
+export interface SubProductFacets {
+  total: number;
+  facets: Record<'brand' | 'availability_status' | 'currency' | 'is_featured' | 'category_id', FacetCount[]>;
+}
+
 export interface SubProduct {
   id: number;
   name: string;
@@ -78,17 +103,19 @@ export interface SubProduct {
   sku: string;
   brand: string;
   model: string;
-  specifications: string;
-  features: string;
-  images: string;
+  specifications: Record<string, string> | null;
+  features: string[] | null;
+  images: string[] | null;
   price_range: string;
+  price_min: number | null;
+  price_max: number | null;
   currency: string;
   availability_status: string;
   warranty_info: string;
   support_info: string;
   documentation_url: string;
   datasheet_url: string;
-  tags: string;
+  tags: string[] | null;
   meta_title: string;
   meta_description: string;
   is_active: boolean;
@@ -104,7 +131,7 @@ export interface Service {
   name: string;
   description: string;
   category_id: number;
-  features: string;
+  features: string[] | null;
   is_active: boolean;
   created_at: string;
   updated_at: string | null;
@@ -115,7 +142,7 @@ export interface Solution {
   id: number;
   name: string;
   description: string;
-  features: string;
+  features: string[] | null;
   is_active: boolean;
   created_at: string;
   updated_at: string | null;